@@ -1,25 +1,72 @@
 import streamlit as st
 import requests
-from config import API_BASE_URL
-from state import get_cache, sync_cache_from_session
+import http_client
+from auth import AuthTokens, authed_request
+import timeline_model
+import stats_rollup
+from config import MULTI_STORE_MAX_WORKERS, MUTATION_WAIT_SEC, TIMELINE_DELTA_SINCE, TIMEOUTS, get_api_base_url
+from response_cache import get_response_cache, get_validator_store, invalidate_store
+from snapshot_store import get_snapshot_store
+from single_flight import get_single_flight
+from circuit_breaker import get_breaker
+from mutation_queue import get_mutation_queue
+from state import get_cache, get_session_id, sync_cache_from_session, token_writer
+from metrics import instrumented
 
+class AccessDenied(Exception):
+    """백엔드가 4xx로 거절함 (인증/권한/없는 가게). 장애가 아니므로 저장본으로 대신하지 않습니다."""
+
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+def _allowed(fn, *args):
+    """fn(*args)를 실행하되 AccessDenied는 None으로 (실패를 칸마다 비워 두는 여러 가게 요약용)"""
+    try:
+        return fn(*args)
+    except AccessDenied:
+        return None
+
+@instrumented
 def api_login(email, password):
     """[실제] 백엔드에 로그인(POST)을 요청하고, 성공 시 토큰을 저장합니다."""
-    API_URL = f"{API_BASE_URL}/accounts/login/owner/"
+    API_URL = f"{get_api_base_url()}/accounts/login/owner/"
     try:
-        response = requests.post(API_URL, json={"owner_email": email, "owner_password": password})
+        response = http_client.request("POST", API_URL, "auth", json={"owner_email": email, "owner_password": password})
         if response.status_code == 200:
-            data = response.json()
+            data = http_client.decode_json(response)
             st.session_state['access_token'] = data.get("access_token")
             st.session_state['refresh_token'] = data.get("refresh_token")
+            st.session_state.pop("_auth", None)   # 이전 로그인의 토큰 묶음은 버림
             return True
         else:
-            st.error(f"로그인 실패: {response.json().get('message', '서버 응답 오류')}")
+            st.error(f"로그인 실패: {_error_message(response) or '서버 응답 오류'}")
             return False
     except requests.exceptions.RequestException as e:
         st.error(f"API 연결 오류: {e}")
         return False
-def get_auth_headers():
+    except ValueError:
+        st.error("로그인 실패: 서버 응답을 읽을 수 없습니다.")
+        return False
+
+def _error_message(response):
+    """오류 응답 본문의 message (JSON이 아니면 None, 예: 프록시의 502 HTML 페이지)"""
+    try:
+        data = http_client.decode_json(response)
+    except ValueError:
+        return None
+    return data.get("message") if isinstance(data, dict) else None
+def get_auth():
+    """세션의 AuthTokens를 돌려줍니다. (없으면 세션/캐시의 토큰으로 만들어 세션에 보관)
+
+    렌더와 백그라운드 작업(감시 스레드, 대기열, 통계 예열)이 같은 객체를 씁니다.
+    다른 스레드에서 재발급된 토큰은 그 자리에서 세션 저장소에 쓰이고, 여기서 세션 상태에도 반영됩니다.
+    """
+    auth = st.session_state.get("_auth")
+    if auth is not None:
+        save_auth(auth)
+        return auth
+
     token = st.session_state.get("access_token")
 
     # 세션에 없으면 캐시에서 복구
@@ -28,7 +75,7 @@ def get_auth_headers():
         token = cache.get("access_token")
         if token:
             st.session_state["access_token"] = token
-            for k in ("refresh_token", "store_id", "store_name", "headers"):
+            for k in ("refresh_token", "store_id", "store_name", "stores", "headers"):
                 v = cache.get(k)
                 if v is not None:
                     st.session_state[k] = v
@@ -36,36 +83,163 @@ def get_auth_headers():
     if not token:
         return None
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
-
-    st.session_state["headers"] = headers
+    sid = get_session_id()
+    auth = AuthTokens(token, st.session_state.get("refresh_token"), on_refresh=token_writer(sid) if sid else None)
+    st.session_state["_auth"] = auth
+    st.session_state["headers"] = auth.headers
     sync_cache_from_session()   # 캐시 동기화
-    return headers
+    return auth
+
+def save_auth(auth):
+    """재발급된 토큰이 있으면 세션과 캐시에 반영합니다."""
+    tokens = auth.pop_refreshed() if auth else None
+    if not tokens:
+        return
+    st.session_state["access_token"], st.session_state["refresh_token"] = tokens
+    st.session_state["headers"] = auth.headers
+    sync_cache_from_session()
+
+def parse_stores(user_data):
+    """/stores/me/owner/ 응답 → [{"store_id", "store_name"}]
 
+    단일 가게 응답(dict), 가게 목록(list), {"stores": [...]} 형태를 모두 목록으로 맞춥니다.
+    """
+    if isinstance(user_data, list):
+        items = user_data
+    elif isinstance(user_data, dict) and isinstance(user_data.get("stores"), list):
+        items = user_data["stores"]
+    else:
+        items = [user_data]
+    return [
+        {"store_id": item.get("store_id"), "store_name": item.get("store_name")}
+        for item in items
+        if isinstance(item, dict) and item.get("store_id") is not None
+    ]
+
+@instrumented
 def fetch_user_info():
     """[실제] '내 정보 조회' API를 호출하여 가게 ID와 이름을 가져옵니다."""
-    API_URL = f"{API_BASE_URL}/stores/me/owner/"
-    headers = get_auth_headers()
-    if not headers: return False
+    API_URL = f"{get_api_base_url()}/stores/me/owner/"
+    auth = get_auth()
+    if not auth: return False
     try:
-        response = requests.get(API_URL, headers=headers)
+        response = authed_request("GET", API_URL, "stores", auth)
+        save_auth(auth)
         if response.status_code == 200:
-            user_data = response.json()
-            st.session_state['store_id'] = user_data.get("store_id")
-            st.session_state['store_name'] = user_data.get("store_name")
+            stores = parse_stores(http_client.decode_json(response))
+            if not stores: return False
+            # 여러 가게를 가진 점주는 첫 가게로 시작하고, 대시보드에서 다른 가게로 바꿀 수 있음
+            st.session_state['stores'] = stores
+            st.session_state['store_id'] = stores[0]["store_id"]
+            st.session_state['store_name'] = stores[0]["store_name"]
             return True
         else: return False
-    except requests.exceptions.RequestException: 
+    except (requests.exceptions.RequestException, ValueError): 
         return False
 
+@instrumented
+def get_timeline_conditional(store_id, auth):
+    """타임라인 조건부 GET. 변경이 없으면(304) 마지막으로 파싱한 트리를 그대로 돌려줍니다.
+
+    마지막 ETag/Last-Modified를 가게별로 기억해 If-None-Match/If-Modified-Since로 보냅니다.
+    TIMELINE_DELTA_SINCE가 켜져 있고 응답에 cursor가 있었으면 ?since=cursor로 바뀐 슬롯만 받아 병합합니다.
+    같은 가게, 같은 토큰으로 동시에 들어온 호출(감시 스레드와 렌더)은 요청 하나를 같이 씁니다.
+    백엔드가 4xx로 거절하면 AccessDenied를 냅니다.
+    """
+    return get_single_flight().do(
+        ("timeline", store_id, auth.principal), _timeline_conditional, store_id, auth,
+        timeout=sum(TIMEOUTS["reservations"]),
+    )
+
+def _timeline_conditional(store_id, auth):
+    API_URL = f"{get_api_base_url()}/reservations/me/owner/{store_id}"
+    validators = get_validator_store()
+    last = validators.get(store_id, auth.principal, "timeline")
+    headers, params = {}, {}
+    if last:
+        etag, last_modified, cursor, _ = last
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        if TIMELINE_DELTA_SINCE and cursor is not None:
+            params["since"] = cursor
+
+    try:
+        response = authed_request("GET", API_URL, "reservations", auth, extra_headers=headers, params=params or None)
+        if response.status_code == 304 and last:
+            return last[3]
+        if 400 <= response.status_code < 500:
+            raise AccessDenied(response.status_code)
+        if response.status_code != 200:
+            return None
+        data = http_client.decode_json(response)
+    except (requests.exceptions.RequestException, ValueError): 
+        return None
+
+    if params and isinstance(data.get("slots"), list):
+        # 델타 응답: {"cursor": ..., "slots": [바뀐 슬롯]}
+        data_cursor = data.get("cursor")
+        data = timeline_model.merge_slots(last[3], {slot.get("slot_id"): slot for slot in data["slots"]})
+    else:
+        data_cursor = data.get("cursor")
+    validators.set(
+        store_id, auth.principal, "timeline",
+        response.headers.get("ETag"), response.headers.get("Last-Modified"), data_cursor, data,
+    )
+    return data
+
+def _get_timeline(store_id, auth):
+    """타임라인 GET (캐시 우선). st 요소를 그리지 않으므로 스레드 풀에서 호출해도 됩니다."""
+    cache = get_response_cache()
+    cached = cache.get(store_id, auth.principal, "timeline")
+    if cached is not None:
+        return cached
+
+    data = get_timeline_conditional(store_id, auth)
+    if data is not None:
+        cache.set(store_id, auth.principal, "timeline", data)
+        get_snapshot_store().set(store_id, auth.principal, "timeline", data)
+    return data
+
+def _get_stats(store_id, day, auth):
+    """통계 GET (캐시 우선). st 요소를 그리지 않으므로 스레드 풀에서 호출해도 됩니다.
+
+    캐시가 비어 있을 때 같은 (가게, 기간, 토큰)으로 동시에 들어온 호출은 요청 하나를 같이 씁니다.
+    백엔드가 4xx로 거절하면 AccessDenied를 냅니다.
+    """
+    cached = get_response_cache().get(store_id, auth.principal, "stats", day)
+    if cached is not None:
+        return cached
+    return get_single_flight().do(
+        ("stats", store_id, day, auth.principal), _fetch_stats, store_id, day, auth,
+        timeout=sum(TIMEOUTS["stats"]),
+    )
+
+def _fetch_stats(store_id, day, auth):
+    API_URL = f"{get_api_base_url()}/stores/{store_id}/{day}/stats"
+    cache = get_response_cache()
+    try:
+        response = authed_request("GET", API_URL, "stats", auth)
+        if response.status_code == 200: 
+            data = http_client.decode_json(response)
+            cache.set(store_id, auth.principal, "stats", data, period=day)
+            get_snapshot_store().set(store_id, auth.principal, "stats", data, period=day)
+            return data
+    except (requests.exceptions.RequestException, ValueError): 
+        return None
+    if 400 <= response.status_code < 500:
+        raise AccessDenied(response.status_code)
+    return None
+
+@instrumented
 def fetch_timeline_data(store_id):
-    """[실제] 백엔드에 시간 인덱스 목록(POST)을 보내 타임라인 데이터를 요청합니다."""
-    API_URL = f"{API_BASE_URL}/reservations/me/owner/{store_id}"
-    headers = get_auth_headers()
-    if not headers: 
+    """[실제] 백엔드에 시간 인덱스 목록(POST)을 보내 타임라인 데이터를 요청합니다.
+
+    장애로 실패하면 None, 백엔드가 4xx로 거절하면 AccessDenied를 냅니다. (저장본으로 대신하지 않도록)
+    """
+    auth = get_auth()
+    if not auth: 
         st.error("헤더가 없습니다. 헤더 연결을 확인하세요.")
         return None
     
@@ -74,49 +248,230 @@ def fetch_timeline_data(store_id):
         return None
     
     try:
-        response = requests.get(API_URL, headers=headers)
-        if response.status_code == 200: 
-            return response.json()
-        else: 
-            return None
-    except requests.exceptions.RequestException: 
-        return None
+        return _get_timeline(store_id, auth)
+    finally:
+        save_auth(auth)
+
+@instrumented
+def fetch_stats_data(store_id, day, warm_start=False):
+    """[실제] 백엔드에 기간(GET)을 보내 성과 통계 데이터를 요청합니다.
+
+    warm_start=True면 이 세션에서 처음 보는 기간에 한해, 메모리 캐시가 비어 있을 때
+    디스크 스냅샷을 바로 돌려주고 최신 통계는 백그라운드에서 받습니다.
+    그 경우 st.session_state["stats_warm"]에 (store_id, day, 저장 시각)을 남깁니다.
+    """
+    auth = get_auth()
+    if not auth: return None
+
+    key = ("stats", store_id, day)
+    warmed = st.session_state.setdefault("_stats_warmed", set())
+    if warm_start and key not in warmed and get_response_cache().get(store_id, auth.principal, "stats", day) is None:
+        warmed.add(key)
+        snapshot = get_snapshot_store().get(store_id, auth.principal, "stats", day)
+        if snapshot is not None:
+            http_client.submit_once(key, _get_stats, store_id, day, auth)
+            st.session_state["stats_warm"] = (store_id, day, snapshot[1])
+            return snapshot[0]
 
-def fetch_stats_data(store_id, day):
-    """[실제] 백엔드에 기간(GET)을 보내 성과 통계 데이터를 요청합니다."""
-    API_URL = f"{API_BASE_URL}/stores/{store_id}/{day}/stats"
-    headers = get_auth_headers()
-    if not headers: return None
     try:
-        response = requests.get(API_URL, headers=headers)
-        if response.status_code == 200: 
+        stats = _get_stats(store_id, day, auth)
+    except AccessDenied:
+        # 거절은 장애가 아니므로 저장본을 보여주지 않음
+        _mark_fresh(key)
+        return None
+    finally:
+        save_auth(auth)
+    if stats is None:
+        return _serve_stale(key, store_id, auth, "stats", day)
+    _mark_fresh(key)
+    return stats
 
-            return response.json()
-        else: 
-            return None
-    except requests.exceptions.RequestException: 
+def _serve_stale(key, store_id, auth, endpoint, period):
+    """요청이 장애(5xx/연결 오류/타임아웃)로 실패했을 때 이 토큰으로 받아 둔 마지막 응답을 디스크에서 돌려주고
+    stale_since(key)에 저장 시각을 남깁니다. (4xx 거절에는 쓰지 않음)
+    """
+    snapshot = get_snapshot_store().get(store_id, auth.principal, endpoint, period)
+    if snapshot is None:
+        return None
+    st.session_state.setdefault("stale_since", {})[key] = snapshot[1]
+    return snapshot[0]
+
+def _mark_fresh(key):
+    st.session_state.get("stale_since", {}).pop(key, None)
+
+def stale_since(key):
+    """[실제] key의 데이터가 백엔드 장애로 저장본을 보여주는 중이면 그 저장 시각(time.time()), 아니면 None
+
+    key는 통계면 ("stats", store_id, day), 임의 기간이면 ("stats_range", store_id, start, end)입니다.
+    """
+    return st.session_state.get("stale_since", {}).get(key)
+
+def backend_degraded(family):
+    """[실제] family 엔드포인트 묶음의 서킷이 열려 있어 요청을 바로 실패시키는 중인지"""
+    return get_breaker(family).state != "closed"
+
+def stats_refreshing(store_id, day):
+    """warm_start로 시작한 백그라운드 통계 갱신이 아직 진행 중인지"""
+    return http_client.is_running(("stats", store_id, day))
+
+def load_snapshot(store_id, endpoint, period=None):
+    """[실제] 이 세션의 토큰으로 받아 디스크에 저장된 마지막 응답 (data, 저장 시각) 또는 None"""
+    auth = get_auth()
+    if not auth:
+        return None
+    return get_snapshot_store().get(store_id, auth.principal, endpoint, period)
+
+@instrumented
+def fetch_stats_range(store_id, start, end, today, compare=None):
+    """[실제] 임의 기간 [start, end] 통계를 '최근 N일' 응답들의 차이로 계산합니다.
+
+    필요한 N만 동시에 요청하고, 이미 받은 N은 응답 캐시에서 재사용합니다.
+    compare=(start, end)를 주면 그 기간 대비, 없으면 직전 같은 길이 기간 대비 증감률을 채웁니다.
+    """
+    auth = get_auth()
+    if not auth or not store_id:
+        return None
+
+    compare = compare or stats_rollup.previous_range(start, end)
+    period = (start.isoformat(), end.isoformat(), compare[0].isoformat(), compare[1].isoformat())
+    key = ("stats_range", store_id, start, end)
+    # 오늘이 빠진 기간은 하루 동안 바뀌지 않으므로 더 오래 캐시
+    endpoint = "stats_range" if max(end, compare[1]) < today else "stats"
+    cache = get_response_cache()
+    cached = cache.get(store_id, auth.principal, endpoint, period)
+    if cached is not None:
+        _mark_fresh(key)
+        return cached
+
+    current_n = stats_rollup.range_windows(start, end, today)
+    compare_n = stats_rollup.range_windows(*compare, today)
+    windows = sorted({n for n in current_n + compare_n if n > 0})
+    try:
+        results = dict(zip(windows, http_client.run_parallel(*[(_get_stats, store_id, n, auth) for n in windows])))
+    except AccessDenied:
+        _mark_fresh(key)
         return None
+    finally:
+        save_auth(auth)
+    if any(v is None for v in results.values()):
+        return _serve_stale(key, store_id, auth, "stats_range", period)
+
+    def rollup(outer_n, inner_n):
+        return stats_rollup.subtract_stats(results[outer_n], results.get(inner_n) if inner_n else None)
+
+    data = stats_rollup.with_deltas(rollup(*current_n), rollup(*compare_n))
+    cache.set(store_id, auth.principal, endpoint, data, period=period)
+    get_snapshot_store().set(store_id, auth.principal, "stats_range", data, period=period)
+    _mark_fresh(key)
+    return data
+
+@instrumented
+def iter_stores_overview(store_ids, day):
+    """[실제] 여러 가게의 타임라인과 통계를 동시에 요청하고, 가게별로 둘 다 도착하는 순서대로
+    (store_id, timeline, stats)를 내놓습니다.
 
-def api_update_slot_status(slot_id, action):
-    """[실제] 슬롯 상태를 변경(PATCH)합니다. (마감/열기)"""
+    동시에 보내는 요청은 MULTI_STORE_MAX_WORKERS개로 제한합니다.
+    결과는 가게별 응답 캐시에 남으므로 한 가게로 들어가도 나머지를 다시 받지 않습니다.
+    """
+    auth = get_auth()
+    if not auth or not store_ids:
+        return
+
+    calls = []
+    for store_id in store_ids:
+        calls.append((_allowed, _get_timeline, store_id, auth))
+        calls.append((_allowed, _get_stats, store_id, day, auth))
+    partial = {}
+    for idx, result in http_client.iter_bounded(calls, MULTI_STORE_MAX_WORKERS):
+        store_id = store_ids[idx // 2]
+        pair = partial.setdefault(store_id, [None, None, 0])
+        pair[idx % 2] = result
+        pair[2] += 1
+        if pair[2] == 2:
+            yield store_id, pair[0], pair[1]
+    save_auth(auth)
+
+def _patch_slot(slot_id, action, auth, extra_headers=None):
+    """슬롯 마감/열기 PATCH. 성공 여부만 돌려줍니다."""
     endpoint = "sold_out" if action == "close" else "restock"
-    API_URL = f"{API_BASE_URL}/reservations/{slot_id}/{endpoint}/"
-    headers = get_auth_headers()
-    if not headers: 
-        return False
+    API_URL = f"{get_api_base_url()}/reservations/{slot_id}/{endpoint}/"
     try:
-        response = requests.patch(API_URL, headers=headers)
+        response = authed_request("PATCH", API_URL, "reservations", auth, extra_headers=extra_headers)
         return response.status_code == 200
     except requests.exceptions.RequestException: 
         return False
 
-def api_cancel_reservation(slot_id, reservation_id):
-    """[실제] 예약을 취소(DELETE)합니다."""
-    API_URL = f"{API_BASE_URL}/reservations/{slot_id}/{reservation_id}/cancel/"
-    headers = get_auth_headers()
-    if not headers: return False
+def _delete_reservation(slot_id, reservation_id, auth, extra_headers=None):
+    """예약 취소 DELETE. 성공 여부만 돌려줍니다."""
+    API_URL = f"{get_api_base_url()}/reservations/{slot_id}/{reservation_id}/cancel/"
     try:
-        response = requests.delete(API_URL, headers=headers)
+        response = authed_request("DELETE", API_URL, "reservations", auth, extra_headers=extra_headers)
         return response.status_code == 200
     except requests.exceptions.RequestException: 
         return False
+
+def _mutation_sender(action, reservation_id, auth):
+    """대기열 작업이 스레드 풀에서 실행할 요청. 작업 id를 Idempotency-Key로 보내 재시도가 중복 처리되지 않게 합니다."""
+    def send(job):
+        headers = {"Idempotency-Key": job.job_id}
+        if action == "cancel":
+            ok = _delete_reservation(job.slot_id, reservation_id, auth, extra_headers=headers)
+        else:
+            ok = _patch_slot(job.slot_id, action, auth, extra_headers=headers)
+        if ok:
+            invalidate_store(job.store_id)
+        return ok
+    return send
+
+def _enqueue_mutations(action, targets):
+    """targets를 가게 대기열에 넣고 MUTATION_WAIT_SEC까지만 기다립니다.
+
+    {slot_id: 작업 상태}를 돌려줍니다. (MutationJob.status)
+    - done / failed: 처리 끝, queued / running: 아직 대기열에서 처리 중
+    - busy: 가게 대기열이 가득 차 접수하지 않음, conflict: 같은 슬롯에 다른 작업이 처리 중이라 접수하지 않음
+    처리 중인 작업은 st.session_state["mutation_jobs"]에 남겨 pop_finished_mutations로 거둡니다.
+    """
+    auth = get_auth()
+    if not auth or not targets:
+        return {slot_id: "failed" for slot_id, _ in targets}
+
+    store_id = st.session_state.get("store_id")
+    queue = get_mutation_queue()
+    jobs = {
+        slot_id: queue.submit(store_id, slot_id, action, _mutation_sender(action, reservation_id, auth))
+        for slot_id, reservation_id in targets
+    }
+    queue.wait(list(jobs.values()), MUTATION_WAIT_SEC)
+    save_auth(auth)
+
+    results = {}
+    pending = st.session_state.setdefault("mutation_jobs", {})
+    for slot_id, job in jobs.items():
+        results[slot_id] = job.status
+        if not job.finished:
+            pending[job.job_id] = job
+    return results
+
+@instrumented
+def api_bulk_slot_action(action, targets):
+    """[실제] 여러 슬롯에 같은 작업(close/open/cancel)을 보냅니다.
+
+    targets는 (slot_id, reservation_id) 튜플 목록이며, {slot_id: 작업 상태}를 돌려줍니다. (_enqueue_mutations 참고)
+    백엔드에 일괄 처리 엔드포인트가 없어서 슬롯별 요청을 뮤테이션 대기열에 넣고,
+    대기열이 가게별 속도 제한과 동시 요청 수 상한을 지키며 백그라운드에서 보냅니다.
+    """
+    return _enqueue_mutations(action, targets)
+
+def pop_finished_mutations():
+    """[실제] 이 세션이 넣은 대기열 작업 중 끝난 것들을 세션에서 꺼내 돌려줍니다."""
+    pending = st.session_state.get("mutation_jobs")
+    if not pending:
+        return []
+    finished = [job for job in pending.values() if job.finished]
+    for job in finished:
+        del pending[job.job_id]
+    return finished
+
+def pending_mutations(store_id):
+    """[실제] 이 가게에서 대기열에 남아 있는 작업 {slot_id: action} (다른 세션이 넣은 작업 포함)"""
+    return get_mutation_queue().pending_slots(store_id)
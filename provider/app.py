@@ -1,23 +1,32 @@
 import streamlit as st
 from ui_components import render_login_page, render_dashboard
-from state import sync_session_from_cache
+from state import persist_session_cookie, sync_session_from_cache
+from metrics import begin_run, end_run
 
 
-#  앱 시작 시 캐시 → 세션 복원
-sync_session_from_cache()
+# rerun 단위 계측 (구간별 소요 시간/요소 수를 모아 끝에서 JSON 로그 한 줄로 남김)
+begin_run()
+try:
+    #  앱 시작 시 캐시 → 세션 복원
+    sync_session_from_cache()
 
-if 'logged_in' not in st.session_state: 
-    st.session_state['logged_in'] = False
+    if 'logged_in' not in st.session_state: 
+        st.session_state['logged_in'] = False
 
-if st.session_state.get('logged_in'):
-    if 'store_id' in st.session_state and st.session_state.get('store_id') is not None:
-        render_dashboard()
-    else:
-        st.error("가게 정보를 불러올 수 없습니다. 다시 로그인해주세요.")
-        if st.button("로그인 페이지로 돌아가기"): 
-            st.session_state.clear()
-            from state import sync_cache_from_session
-            sync_cache_from_session()  # 로그아웃 시 캐시도 정리
-            st.rerun()  
-else: 
-    render_login_page()
+    if st.session_state.get('logged_in'):
+        if 'store_id' in st.session_state and st.session_state.get('store_id') is not None:
+            render_dashboard()
+        else:
+            st.error("가게 정보를 불러올 수 없습니다. 다시 로그인해주세요.")
+            if st.button("로그인 페이지로 돌아가기"): 
+                from state import clear_cache
+                clear_cache()  # 로그아웃 시 캐시도 정리
+                st.session_state.clear()
+                st.session_state["_sid"] = None   # 쿠키의 지난 세션 ID로 다시 복원하지 않도록
+                st.rerun()  
+    else: 
+        render_login_page()
+    # 로그인/로그아웃으로 세션 ID가 바뀌었으면 쿠키에 반영
+    persist_session_cookie()
+finally:
+    end_run()
@@ -0,0 +1,155 @@
+# auth.py
+import base64
+import hashlib
+import json
+import threading
+import time
+import requests
+import streamlit as st
+import http_client
+from config import TIMEOUTS, TOKEN_REFRESH_LEEWAY_SEC, get_api_base_url
+
+def _jwt_exp(token):
+    """JWT payload의 exp(초)를 읽습니다. 서명 검증은 하지 않으며, 읽을 수 없으면 None"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+class AuthTokens:
+    """세션 하나가 렌더와 백그라운드 작업(감시 스레드, 대기열, 예열)에서 함께 쓰는 토큰 묶음
+
+    어느 스레드에서 재발급하든 제자리에서 바뀌고 refreshed가 True가 되어,
+    다음 렌더에서 pop_refreshed로 꺼내 세션에 반영합니다.
+    on_refresh를 주면 렌더를 기다리지 않고 재발급 즉시 저장소에도 씁니다. (탭을 닫아도 새 토큰이 남도록)
+    """
+
+    def __init__(self, access_token, refresh_token, on_refresh=None):
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.refreshed = False
+        self._on_refresh = on_refresh   # on_refresh(tokens): 재발급 직후 그 스레드에서 호출 (st 요소 금지)
+        self._lock = threading.Lock()
+
+    def replace(self, stale_refresh_token, access_token, refresh_token):
+        """stale_refresh_token으로 재발급한 결과를 반영합니다. 그새 다른 스레드가 이미 바꿨으면 그대로 둠"""
+        with self._lock:
+            if self.refresh_token != stale_refresh_token:
+                return
+            self.access_token, self.refresh_token = access_token, refresh_token
+            self.refreshed = True
+        if self._on_refresh is not None:
+            self._on_refresh(self)
+
+    def pop_refreshed(self):
+        """재발급된 적이 있으면 (access_token, refresh_token)을 돌려주고 표시를 지웁니다."""
+        with self._lock:
+            if not self.refreshed:
+                return None
+            self.refreshed = False
+            return self.access_token, self.refresh_token
+
+    @property
+    def principal(self):
+        """요청 주체 구분용 키 (액세스 토큰 해시). 서명을 검증할 수 없으므로 JWT 클레임 대신 토큰 전체를 씀"""
+        return hashlib.blake2b(self.access_token.encode(), digest_size=16).hexdigest()
+
+    @property
+    def headers(self):
+        return {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
+        }
+
+    def expires_soon(self):
+        exp = _jwt_exp(self.access_token)
+        return exp is not None and exp - time.time() < TOKEN_REFRESH_LEEWAY_SEC
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+class TokenRefresher:
+    """refresh_token 하나당 재발급 요청을 한 번만 보내는 single-flight
+
+    동시에 들어온 호출은 먼저 온 호출의 결과를 기다렸다가 같이 씁니다.
+    직후에 도착한 호출도 방금 받은 결과를 재사용하도록 잠시 기억합니다.
+    """
+
+    RECENT_SEC = 60
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._recent = {}
+
+    def refresh(self, refresh_token):
+        """(access_token, refresh_token) 또는 실패 시 None"""
+        if not refresh_token:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            self._recent = {k: v for k, v in self._recent.items() if now - v[1] < self.RECENT_SEC}
+            if refresh_token in self._recent:
+                return self._recent[refresh_token][0]
+            flight = self._flights.get(refresh_token)
+            leader = flight is None
+            if leader:
+                flight = self._flights[refresh_token] = _Flight()
+
+        if not leader:
+            flight.done.wait(timeout=sum(TIMEOUTS["auth"]))
+            return flight.result
+
+        try:
+            flight.result = _post_refresh(refresh_token)
+        finally:
+            with self._lock:
+                del self._flights[refresh_token]
+                if flight.result:
+                    self._recent[refresh_token] = (flight.result, time.monotonic())
+            flight.done.set()
+        return flight.result
+
+def _post_refresh(refresh_token):
+    API_URL = f"{get_api_base_url()}/accounts/login/refresh/"
+    try:
+        response = http_client.request("POST", API_URL, "auth", json={"refresh_token": refresh_token})
+        if response.status_code != 200:
+            return None
+        data = http_client.decode_json(response)
+        return data.get("access_token"), data.get("refresh_token") or refresh_token
+    except (requests.exceptions.RequestException, ValueError):
+        return None
+
+@st.cache_resource
+def get_token_refresher():
+    return TokenRefresher()
+
+def refresh_tokens(tokens):
+    """tokens를 재발급된 값으로 바꿉니다. 성공 여부를 돌려줍니다."""
+    stale = tokens.refresh_token
+    result = get_token_refresher().refresh(stale)
+    if not result or not result[0]:
+        return False
+    tokens.replace(stale, *result)
+    return True
+
+def authed_request(method, url, family, tokens, extra_headers=None, **kwargs):
+    """인증 헤더를 붙여 요청합니다. extra_headers는 인증 헤더 위에 덧붙입니다.
+
+    만료 직전이면 미리 재발급하고, 401이면 재발급 후 한 번만 다시 보냅니다.
+    """
+    def _send():
+        headers = {**tokens.headers, **(extra_headers or {})}
+        return http_client.request(method, url, family, headers=headers, **kwargs)
+
+    if tokens.expires_soon():
+        refresh_tokens(tokens)
+    response = _send()
+    if response.status_code == 401 and refresh_tokens(tokens):
+        response = _send()
+    return response
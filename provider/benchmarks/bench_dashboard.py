@@ -0,0 +1,155 @@
+# benchmarks/bench_dashboard.py
+"""대시보드 종단 벤치마크: 로컬 목 백엔드 + Streamlit AppTest로 app.py를 그대로 실행
+
+    cd provider && python benchmarks/bench_dashboard.py --latency-ms 80 --spaces 4 --slots 72
+    cd provider && python benchmarks/bench_dashboard.py --json > before.json   # 변경 전후 비교용
+
+로그인 → 대시보드 재실행 → 일괄 마감 → 통계 화면 → 기간 변경 순서로 진행하며
+단계마다 rerun 시간, 백엔드 요청 수/응답 바이트, 요소 수, 메모리(tracemalloc)를 출력합니다.
+tracemalloc은 할당이 많은 단계를 몇 배 느리게 만들므로, 시간은 추적 없이 재고
+메모리는 같은 시나리오를 별도 프로세스에서 한 번 더 돌려서 잽니다. (--no-memory로 생략)
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from streamlit.testing.v1 import AppTest
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROVIDER_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+from mock_backend import MockBackend  # noqa: E402
+
+def count_elements(node):
+    children = getattr(node, "children", None) or {}
+    return 1 + sum(count_elements(child) for child in children.values())
+
+def _login(at):
+    at.text_input[0].input("owner@example.com")
+    at.text_input[1].input("password")
+    at.button[0].click()
+
+def _bulk_close(at):
+    grid = at.multiselect[0]
+    available = [opt for opt in grid.options if "예약 가능" in opt]
+    grid.select(available[0] if available else grid.options[0])
+    at.run()
+    next(b for b in at.button if "마감" in b.label).click()
+
+def _open_stats(at):
+    at.segmented_control(key="dashboard_view").set_value("성과 분석 및 통계")
+
+def _switch_period(at):
+    at.selectbox(key="stats_period").select("최근 30일")
+
+SCENARIO = (
+    ("cold_start", None),
+    ("login", _login),
+    ("dashboard_rerun", lambda at: None),
+    ("bulk_close", _bulk_close),
+    ("stats_view", _open_stats),
+    ("stats_period", _switch_period),
+    ("stats_rerun", lambda at: None),
+)
+
+def run(backend, reruns, trace_memory=False):
+    """SCENARIO를 실행하고 단계별 결과를 돌려줍니다. trace_memory=True면 메모리만 재는 패스입니다."""
+    at = AppTest.from_file(os.path.join(PROVIDER_DIR, "app.py"), default_timeout=120)
+    at.secrets["api"] = {"BASE_URL": backend.base_url}
+    results = []
+    if trace_memory:
+        tracemalloc.start()
+    for name, action in SCENARIO:
+        repeat = reruns if name.endswith("_rerun") else 1
+        for _ in range(repeat):
+            backend.reset_counts()
+            if trace_memory:
+                tracemalloc.reset_peak()
+                mem_before = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            if action is not None:
+                action(at)
+            at.run()
+            elapsed = time.perf_counter() - started
+            if at.exception:
+                raise RuntimeError(f"{name}: {at.exception}")
+            if trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                results.append({
+                    "step": name,
+                    "mem_delta_kb": round((current - mem_before) / 1024, 1),
+                    "mem_peak_kb": round((peak - mem_before) / 1024, 1),
+                })
+                continue
+            last_run = at.session_state["_metrics_last_run"] if "_metrics_last_run" in at.session_state else {}
+            results.append({
+                "step": name,
+                "wall_ms": round(elapsed * 1000, 1),
+                "script_ms": last_run.get("duration_ms"),
+                "requests": dict(backend.requests),
+                "bytes": backend.bytes_sent,
+                "elements": count_elements(at.main) + count_elements(at.sidebar),
+            })
+    if trace_memory:
+        tracemalloc.stop()
+    return results
+
+def run_memory_pass(args):
+    """같은 설정으로 새 프로세스에서 메모리 패스를 돌립니다. (프로세스 전역 캐시가 비어 있는 상태에서 시작)"""
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--memory-pass",
+         "--latency-ms", str(args.latency_ms), "--spaces", str(args.spaces), "--slots", str(args.slots),
+         "--stats-records", str(args.stats_records), "--stores", str(args.stores), "--reruns", str(args.reruns)],
+        capture_output=True, text=True, check=True, cwd=PROVIDER_DIR,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=int, default=50, help="목 백엔드 응답 지연")
+    parser.add_argument("--spaces", type=int, default=4)
+    parser.add_argument("--slots", type=int, default=72, help="공간당 슬롯 수")
+    parser.add_argument("--stats-records", type=int, default=5000, help="통계 응답의 예약 레코드 수")
+    parser.add_argument("--stores", type=int, default=1, help="점주가 가진 가게 수")
+    parser.add_argument("--reruns", type=int, default=3, help="*_rerun 단계 반복 횟수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--no-memory", action="store_true", help="메모리 패스를 생략")
+    parser.add_argument("--memory-pass", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    os.chdir(PROVIDER_DIR)
+    backend = MockBackend(args.latency_ms, args.spaces, args.slots, args.stats_records, stores=args.stores).start()
+    try:
+        results = run(backend, args.reruns, trace_memory=args.memory_pass)
+    finally:
+        backend.stop()
+    if args.memory_pass:
+        print(json.dumps(results))
+        return
+
+    memory = [{}] * len(results) if args.no_memory else run_memory_pass(args)
+    for r, m in zip(results, memory):
+        r["mem_delta_kb"] = m.get("mem_delta_kb")
+        r["mem_peak_kb"] = m.get("mem_peak_kb")
+
+    if args.json:
+        print(json.dumps({"config": vars(args), "steps": results}, ensure_ascii=False, indent=2))
+        return
+    print(f"latency={args.latency_ms}ms spaces={args.spaces} slots/space={args.slots} "
+          f"stats_records={args.stats_records}")
+    print(f"{'step':16s} {'wall ms':>9s} {'script ms':>9s} {'reqs':>5s} {'bytes':>9s} "
+          f"{'elements':>8s} {'mem Δ KB':>9s} {'peak KB':>9s}  requests")
+    for r in results:
+        print(f"{r['step']:16s} {r['wall_ms']:9.1f} {r['script_ms'] or 0:9.1f} "
+              f"{sum(r['requests'].values()):5d} {r['bytes']:9d} {r['elements']:8d} "
+              f"{_kb(r['mem_delta_kb'])} {_kb(r['mem_peak_kb'])}  {r['requests']}")
+
+def _kb(value):
+    return f"{'-':>9s}" if value is None else f"{value:9.1f}"
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# benchmarks/bench_grid_elements.py
+"""슬롯 그리드 렌더링 비교: 기준 커밋의 render_slot_grid(슬롯별 columns/markdown/button) vs 현재 코드
+
+    cd provider && python benchmarks/bench_grid_elements.py --spaces 4 --slots 72
+    cd provider && python benchmarks/bench_grid_elements.py --baseline <커밋>   # 기본값: 저장소 첫 커밋
+
+기준 쪽은 git archive로 꺼낸 그 커밋의 provider/ 코드를 그대로 import해서 그립니다.
+두 트리의 모듈 이름이 같으므로 각각 별도 프로세스에서 Streamlit AppTest로
+오늘/내일 그리드를 한 번 렌더하고 요소 수와 소요 시간을 출력합니다.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+PROVIDER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(PROVIDER_DIR)
+DAYS = ("today", "tomorrow")
+
+def make_slots(n_slots, seed=0):
+    slots = []
+    for i in range(n_slots):
+        hh, mm = divmod(9 * 60 + i * 10, 60)
+        kind = (i + seed) % 3
+        slots.append({
+            "slot_id": seed * 10_000 + i,
+            "time": f"{hh:02d}:{mm:02d}",
+            "is_reserved": kind != 0,
+            "reservation_info": {
+                "reservation_id": i, "user_email": f"user{i}@example.com", "menu_name": f"메뉴 {i % 7}",
+            } if kind == 1 else None,
+        })
+    return slots
+
+def make_timeline(n_spaces, n_slots):
+    # 기준 코드의 버튼 key가 slot_id만 쓰므로 날짜/공간마다 slot_id가 겹치지 않게 만듦
+    return {
+        day: [make_slots(n_slots, seed=d * 100 + s) for s in range(n_spaces)]
+        for d, day in enumerate(DAYS)
+    }
+
+def _baseline_app(provider_dir, timeline):
+    # 기준 커밋의 render_slot_grid(slots)를 그대로 호출
+    import sys
+    sys.path.insert(0, provider_dir)
+    from ui_components import render_slot_grid
+    for day in timeline:
+        for slots in timeline[day]:
+            render_slot_grid(slots)
+
+def _current_app(provider_dir, timeline):
+    import sys
+    sys.path.insert(0, provider_dir)
+    import timeline_model
+    from ui_components import inject_grid_css, render_slot_grid
+    inject_grid_css()
+    for day in timeline:
+        for space_idx, slots in enumerate(timeline[day]):
+            render_slot_grid(timeline_model.parse_slots(slots), f"{day}_{space_idx}")
+
+APPS = {"baseline": _baseline_app, "current": _current_app}
+
+def count_elements(node):
+    children = getattr(node, "children", None) or {}
+    return 1 + sum(count_elements(child) for child in children.values())
+
+def render(name, provider_dir, timeline, base_url):
+    at = AppTest.from_function(APPS[name], args=(provider_dir, timeline), default_timeout=60)
+    at.secrets["api"] = {"BASE_URL": base_url}
+    started = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(at.exception)
+    return count_elements(at.main), elapsed
+
+def export_tree(rev, dest):
+    """rev 시점의 provider/ 디렉터리를 dest 아래에 풀고 그 경로를 돌려줍니다."""
+    archive = os.path.join(dest, "tree.tar")
+    with open(archive, "wb") as f:
+        subprocess.run(["git", "-C", REPO_DIR, "archive", rev, "provider"], stdout=f, check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(dest, filter="data")
+    return os.path.join(dest, "provider")
+
+def root_commit():
+    out = subprocess.run(
+        ["git", "-C", REPO_DIR, "rev-list", "--max-parents=0", "HEAD"],
+        capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return out[-1]
+
+def run_in_subprocess(name, provider_dir, args):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--render", name, "--tree", provider_dir,
+         "--spaces", str(args.spaces), "--slots", str(args.slots), "--base-url", args.base_url],
+        capture_output=True, text=True, check=True, cwd=provider_dir,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spaces", type=int, default=4)
+    parser.add_argument("--slots", type=int, default=72)
+    parser.add_argument("--base-url", default="http://127.0.0.1:9")
+    parser.add_argument("--baseline", help="비교할 기준 커밋 (기본값: 첫 커밋)")
+    parser.add_argument("--render", choices=list(APPS), help=argparse.SUPPRESS)
+    parser.add_argument("--tree", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.render:
+        elements, elapsed = render(args.render, args.tree, make_timeline(args.spaces, args.slots), args.base_url)
+        print(json.dumps({"elements": elements, "elapsed": elapsed}))
+        return 0
+
+    rev = args.baseline or root_commit()
+    print(f"spaces={args.spaces} slots/space={args.slots} days={len(DAYS)} baseline={rev[:10]}")
+    with tempfile.TemporaryDirectory() as tmp:
+        trees = {"baseline": export_tree(rev, tmp), "current": PROVIDER_DIR}
+        for name, provider_dir in trees.items():
+            result = run_in_subprocess(name, provider_dir, args)
+            print(f"{name:8s} elements={result['elements']:6d} render={result['elapsed'] * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    sys.exit(main())
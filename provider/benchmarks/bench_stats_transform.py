@@ -0,0 +1,74 @@
+# benchmarks/bench_stats_transform.py
+"""통계 변환 비교: 기존 pandas pd.cut 경로 vs stats_transform (NumPy bincount + 해시 메모이즈)
+
+    cd provider && python benchmarks/bench_stats_transform.py --records 100000
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import stats_transform  # noqa: E402
+
+def make_payload(n_records, seed=0):
+    rnd = random.Random(seed)
+    return {
+        "time_idx_and_discount_rate": [
+            {"time_offset_idx": rnd.randint(0, 71), "discount_rate": round(rnd.random() * 0.4, 3)}
+            for _ in range(n_records)
+        ],
+        "hourly_statistics": {str(h): rnd.randint(0, n_records // 24) for h in range(24)},
+        "menu_statistics": [{"name": f"메뉴 {i}", "count": rnd.randint(0, 500)} for i in range(30)],
+    }
+
+def legacy_transform(payload):
+    # 기존 ui_components의 인라인 pandas 변환
+    df = pd.DataFrame(payload["time_idx_and_discount_rate"])
+    vals = pd.to_numeric(df.dropna(subset=["discount_rate"])["discount_rate"], errors="coerce").dropna()
+    if vals.max() <= 1:
+        vals = vals * 100
+    end = max(int(math.ceil(float(vals.max()) / 5) * 5), 5)
+    categories = pd.IntervalIndex.from_breaks(list(range(0, end + 5, 5)), closed="left")
+    discount = pd.cut(vals, bins=categories, right=False, include_lowest=True).value_counts().reindex(categories, fill_value=0)
+    discount.index = [f"{int(iv.left):02d}–{int(iv.right):02d}%" for iv in discount.index]
+
+    minutes = pd.to_numeric(df.dropna(subset=["time_offset_idx"])["time_offset_idx"], errors="coerce").dropna().astype(int) * 10
+    offsets = pd.cut(minutes, bins=list(range(0, 721, 60)), right=False, include_lowest=True).value_counts().sort_index()
+
+    s = pd.Series(payload["hourly_statistics"], dtype="int64")
+    s.index = s.index.astype(int)
+    s = s.reindex(range(24), fill_value=0).sort_index()
+
+    menus = pd.DataFrame(payload["menu_statistics"]).set_index("name")
+    top = pd.to_numeric(menus[menus.columns[0]], errors="coerce").fillna(0).sort_values(ascending=False).head(3)
+    return discount, offsets, s, top
+
+def timed(fn, *args, repeat=5):
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = make_payload(args.records)
+    print(f"records={args.records}")
+    print(f"legacy pandas        {timed(legacy_transform, payload, repeat=args.repeat):9.1f} ms")
+    print(f"build_stats_frames   {timed(stats_transform.build_stats_frames, payload, repeat=args.repeat):9.1f} ms")
+    print(f"payload_hash         {timed(stats_transform.payload_hash, payload, repeat=args.repeat):9.1f} ms")
+    stats_transform.transform_stats(payload)
+    print(f"transform_stats(hit) {timed(stats_transform.transform_stats, payload, repeat=args.repeat):9.1f} ms")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# benchmarks/bench_timeline_model.py
+"""타임라인 디코딩/메모리 비교: 표준 json vs orjson/msgspec, slot dict vs Slot(__slots__) 모델
+
+    cd provider && python benchmarks/bench_timeline_model.py --slots 10000
+"""
+import argparse
+import gc
+import importlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("API_BASE_URL", "http://127.0.0.1:9")  # 오프라인 실행용 (요청은 보내지 않음)
+from timeline_model import parse_timeline  # noqa: E402
+
+def make_payload(n_slots, n_spaces=10):
+    per_space = n_slots // (2 * n_spaces)
+
+    def space(day, s):
+        slots = []
+        for i in range(per_space):
+            kind = i % 3
+            slots.append({
+                "slot_id": (day * n_spaces + s) * per_space + i,
+                "time": f"{i * 10 // 60 % 24:02d}:{i * 10 % 60:02d}",
+                "is_reserved": kind != 0,
+                "reservation_info": {
+                    "reservation_id": i, "user_email": f"user{i}@example.com", "menu_name": f"메뉴 {i % 9}",
+                } if kind == 1 else None,
+            })
+        return {"space_name": f"공간 {s}", "slots": slots}
+
+    return {
+        day_name: {"spaces": [space(day, s) for s in range(n_spaces)]}
+        for day, day_name in enumerate(("today", "tomorrow"))
+    }
+
+def best_ms(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def allocated_kb(build):
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return size / 1024
+
+def decoders():
+    yield "json", json.loads
+    for name in ("orjson", "msgspec"):
+        try:
+            mod = importlib.import_module(name)
+        except ImportError:
+            print(f"{name:8s} (미설치, 건너뜀)")
+            continue
+        yield name, mod.loads if name == "orjson" else mod.json.Decoder().decode
+
+def render_loop_dicts(tree):
+    n = 0
+    for day in ("today", "tomorrow"):
+        for space in tree[day]["spaces"]:
+            for slot in space["slots"]:
+                info = slot.get("reservation_info") or {}
+                n += len(slot.get("time", "-")) + bool(slot.get("is_reserved")) + len(info.get("user_email", ""))
+    return n
+
+def render_loop_model(model):
+    n = 0
+    for spaces in model.values():
+        for space in spaces:
+            for slot in space.slots:
+                n += len(slot.time) + slot.is_reserved + len(slot.user_email)
+    return n
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slots", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    raw = json.dumps(make_payload(args.slots)).encode("utf-8")
+    print(f"slots={args.slots} payload={len(raw) / 1024:.0f} KiB")
+
+    print("-- decode")
+    for name, loads in decoders():
+        print(f"{name:8s} {best_ms(lambda: loads(raw), args.repeat):8.2f} ms")
+
+    tree = json.loads(raw)
+    model = parse_timeline(tree)
+    print("-- memory (tracemalloc)")
+    print(f"dict tree  {allocated_kb(lambda: json.loads(raw)):9.0f} KiB")
+    print(f"Slot model {allocated_kb(lambda: parse_timeline(tree)):9.0f} KiB")
+    print("-- per-rerun slot access")
+    print(f"dict .get  {best_ms(lambda: render_loop_dicts(tree), args.repeat):8.2f} ms")
+    print(f"Slot attrs {best_ms(lambda: render_loop_model(model), args.repeat):8.2f} ms")
+    print(f"parse      {best_ms(lambda: parse_timeline(tree), args.repeat):8.2f} ms")
+
+if __name__ == "__main__":
+    sys.exit(main())
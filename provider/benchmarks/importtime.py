@@ -0,0 +1,61 @@
+# benchmarks/importtime.py
+"""엔트리 경로별 콜드 스타트 import 비용 측정 (python -X importtime 기반)
+
+    cd provider && python benchmarks/importtime.py [--top 10] [--runs 3]
+
+각 경로를 새 인터프리터에서 import하고 누적 import 시간과 무거운 모듈을 출력합니다.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+PROVIDER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 경로 이름 → 실행할 import 문
+ENTRY_PATHS = {
+    "streamlit (기준선)": "import streamlit",
+    "login (app.py → ui_components)": "import streamlit, ui_components",
+    "stats view (+ stats_view)": "import streamlit, ui_components, stats_view",
+}
+
+WATCHED = ("pandas", "numpy", "requests", "orjson", "msgspec")
+
+def measure(statement):
+    env = dict(os.environ, API_BASE_URL=os.environ.get("API_BASE_URL", "http://127.0.0.1:9"))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=PROVIDER_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # 이름 앞의 들여쓰기 = import 깊이 (구분자 뒤 공백 한 칸은 제외)
+        rows.append((name[1:], int(self_us), int(cumulative_us)))
+    return rows
+
+def summarize(rows):
+    top_level = [r for r in rows if not r[0].startswith(" ")]
+    total_ms = sum(r[2] for r in top_level) / 1000
+    loaded = {r[0].strip() for r in rows}
+    return total_ms, loaded
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    for label, statement in ENTRY_PATHS.items():
+        runs = [measure(statement) for _ in range(args.runs)]
+        best_rows = min(runs, key=lambda rows: summarize(rows)[0])
+        total_ms, loaded = summarize(best_rows)
+        watched = ", ".join(f"{m}={'Y' if m in loaded else '-'}" for m in WATCHED)
+        print(f"\n== {label}: {total_ms:.1f} ms  ({watched})")
+        for name, _, cumulative_us in sorted(best_rows, key=lambda r: -r[2])[:args.top]:
+            print(f"   {cumulative_us / 1000:8.1f} ms  {name.strip()}")
+
+if __name__ == "__main__":
+    sys.exit(main())
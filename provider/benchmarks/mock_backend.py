@@ -0,0 +1,260 @@
+# benchmarks/mock_backend.py
+"""벤치마크용 로컬 백엔드 (실제 API 대신 같은 경로/응답 형태를 흉내냄)
+
+    from mock_backend import MockBackend
+    backend = MockBackend(latency_ms=50, spaces=4, slots=72, stats_records=5000, stores=3).start()
+    ... at.secrets["api"] = {"BASE_URL": backend.base_url}
+    backend.stop()
+
+구현한 경로:
+    POST   /accounts/login/owner/, /accounts/login/refresh/
+    GET    /stores/me/owner/                      (stores > 1 이면 {"stores": [...]})
+    GET    /reservations/me/owner/{store_id}      (ETag / If-None-Match → 304)
+    GET    /stores/{store_id}/{day}/stats
+    PATCH  /reservations/{slot_id}/sold_out/, /reservations/{slot_id}/restock/
+    DELETE /reservations/{slot_id}/{reservation_id}/cancel/
+
+fail_status를 정하면(예: 503) 모든 요청에 그 상태로 응답합니다. (장애 재현용, "failed")
+fail_body를 함께 정하면 JSON 대신 그 본문을 text/html로 보냅니다. (프록시 오류 페이지 흉내)
+리프레시 토큰은 한 번 쓰면 폐기되고 새 토큰이 발급됩니다. (이미 쓴 토큰으로 재발급하면 401, "refresh_rejected")
+Authorization 헤더가 없는 GET에는 401로 응답합니다. ("unauthorized")
+denied_tokens에 넣은 액세스 토큰의 GET에는 403으로 응답합니다. ("forbidden", 권한을 잃은 계정 흉내)
+PATCH/DELETE에 Idempotency-Key가 있으면 같은 키의 재전송은 다시 적용하지 않고 200을 돌려줍니다. ("replayed")
+"""
+import base64
+import hashlib
+import itertools
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STORE_ID = 7
+STORE_NAME = "벤치마크 가게"
+
+def _jwt(exp, jti=0):
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp, "jti": jti}).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+def make_timeline(spaces, slots, seed=0):
+    """오늘/내일 × 공간 수 × 공간당 슬롯 수 크기의 타임라인 응답"""
+    rng = random.Random(seed)
+
+    def space(day_idx, s):
+        items = []
+        for i in range(slots):
+            hh, mm = divmod(9 * 60 + i * 10, 60)
+            kind = rng.randrange(3)
+            items.append({
+                "slot_id": (day_idx * spaces + s) * slots + i + 1,
+                "time": f"{hh % 24:02d}:{mm:02d}",
+                "is_reserved": kind != 0,
+                "reservation_info": {
+                    "reservation_id": i + 1,
+                    "user_email": f"user{i}@example.com",
+                    "menu_name": f"메뉴 {i % 7}",
+                } if kind == 1 else None,
+            })
+        return {"space_name": f"공간 {s + 1}", "slots": items}
+
+    return {
+        day: {"spaces": [space(day_idx, s) for s in range(spaces)]}
+        for day_idx, day in enumerate(("today", "tomorrow"))
+    }
+
+def make_stats(day, records, seed=0):
+    """통계 응답. records는 time_idx_and_discount_rate 길이(응답 크기 조절용)"""
+    rng = random.Random(f"{seed}-{day}")
+    scale = max(int(day), 1)
+    return {
+        "total_revenue": {"value": 120_000 * scale, "delta": rng.randint(-20, 20)},
+        "total_reservations_count": {"value": 12 * scale, "delta": rng.randint(-5, 5)},
+        "total_discount_amount": {"value": 8_000 * scale},
+        "time_idx_and_discount_rate": [
+            {"time_offset_idx": rng.randrange(36), "discount_rate": rng.choice((0, 0.1, 0.2, 0.3, 0.5))}
+            for _ in range(records)
+        ],
+        "hourly_statistics": {str(h): rng.randint(0, 10 * scale) for h in range(9, 22)},
+        "menu_statistics": [{"name": f"메뉴 {i}", "count": rng.randint(1, 30 * scale)} for i in range(12)],
+    }
+
+class MockBackend:
+    """설정 가능한 지연/응답 크기를 가진 스레드 HTTP 서버. 경로별 요청 수를 셉니다."""
+
+    def __init__(self, latency_ms=0, spaces=2, slots=36, stats_records=200, seed=0, stores=1):
+        self.latency_ms = latency_ms
+        self.stores = [
+            {"store_id": STORE_ID + i, "store_name": STORE_NAME if i == 0 else f"{STORE_NAME} {i + 1}호점"}
+            for i in range(stores)
+        ]
+        self.stats_records = stats_records
+        self.seed = seed
+        self.timeline = make_timeline(spaces, slots, seed)
+        self.requests = Counter()
+        self.bytes_sent = 0
+        self.idempotency_keys = set()
+        self.refresh_tokens = set()     # 아직 쓰지 않은 리프레시 토큰
+        self.token_ttl = 3600           # 발급하는 액세스 토큰 유효 시간(초)
+        self._token_seq = itertools.count()
+        self.denied_tokens = set()
+        self.fail_status = None
+        self.fail_body = None
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True, name="mock-backend").start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset_counts(self):
+        with self._lock:
+            self.requests.clear()
+            self.bytes_sent = 0
+
+    def _issue_tokens(self):
+        with self._lock:
+            seq = next(self._token_seq)
+            refresh = f"refresh-{seq}"
+            self.refresh_tokens.add(refresh)
+        return {"access_token": _jwt(time.time() + self.token_ttl, seq), "refresh_token": refresh}
+
+    def _find_slot(self, slot_id):
+        for day in self.timeline.values():
+            for space in day["spaces"]:
+                for slot in space["slots"]:
+                    if slot["slot_id"] == slot_id:
+                        return slot
+        return None
+
+    def _handler_class(self):
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body=b"", headers=()):
+                self.send_response(status)
+                for key, value in headers:
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+                with backend._lock:
+                    backend.bytes_sent += len(body)
+
+            def _json(self, obj, status=200, headers=()):
+                body = json.dumps(obj, ensure_ascii=False).encode()
+                self._send(status, body, (("Content-Type", "application/json"), *headers))
+
+            def _replayed(self):
+                idem = self.headers.get("Idempotency-Key")
+                if not idem:
+                    return False
+                with backend._lock:
+                    seen = idem in backend.idempotency_keys
+                    backend.idempotency_keys.add(idem)
+                return seen
+
+            def _route(self, method):
+                path = self.path.split("?")[0]
+                parts = [p for p in path.split("/") if p]
+                if backend.latency_ms:
+                    time.sleep(backend.latency_ms / 1000)
+
+                if backend.fail_status:
+                    key = "failed"
+                    if backend.fail_body is not None:
+                        self._send(backend.fail_status, backend.fail_body, (("Content-Type", "text/html"),))
+                    else:
+                        self._json({"detail": "unavailable"}, backend.fail_status)
+                elif method == "GET" and not self.headers.get("Authorization"):
+                    key = "unauthorized"
+                    self._json({"detail": "authentication required"}, 401)
+                elif method == "GET" and self.headers.get("Authorization", "")[7:] in backend.denied_tokens:
+                    key = "forbidden"
+                    self._json({"detail": "permission denied"}, 403)
+                elif method == "POST" and path.endswith("/accounts/login/owner/"):
+                    key = "login"
+                    self._json(backend._issue_tokens())
+                elif method == "POST" and path.endswith("/accounts/login/refresh/"):
+                    token = (json.loads(self.body or b"{}") or {}).get("refresh_token")
+                    with backend._lock:
+                        valid = token in backend.refresh_tokens
+                        backend.refresh_tokens.discard(token)
+                    if valid:
+                        key = "refresh"
+                        self._json(backend._issue_tokens())
+                    else:
+                        key = "refresh_rejected"
+                        self._json({"detail": "invalid refresh token"}, 401)
+                elif method == "GET" and path.endswith("/stores/me/owner/"):
+                    key = "store"
+                    self._json(backend.stores[0] if len(backend.stores) == 1 else {"stores": backend.stores})
+                elif method == "GET" and parts[:3] == ["reservations", "me", "owner"]:
+                    with backend._lock:
+                        body = json.dumps(backend.timeline, ensure_ascii=False).encode()
+                    etag = '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+                    if self.headers.get("If-None-Match") == etag:
+                        key = "timeline_304"
+                        self._send(304, headers=(("ETag", etag),))
+                    else:
+                        key = "timeline"
+                        self._send(200, body, (("Content-Type", "application/json"), ("ETag", etag)))
+                elif method == "GET" and path.endswith("/stats") and len(parts) == 4:
+                    key = "stats"
+                    self._json(make_stats(parts[2], backend.stats_records, backend.seed))
+                elif method in ("PATCH", "DELETE") and self._replayed():
+                    key = "replayed"
+                    self._json({})
+                elif method == "PATCH" and len(parts) == 3 and parts[2] in ("sold_out", "restock"):
+                    key = parts[2]
+                    with backend._lock:
+                        slot = backend._find_slot(int(parts[1]))
+                        if slot is not None:
+                            slot["is_reserved"] = parts[2] == "sold_out"
+                    self._json({} if slot is not None else {"detail": "not found"}, 200 if slot else 404)
+                elif method == "DELETE" and len(parts) == 4 and parts[3] == "cancel":
+                    key = "cancel"
+                    with backend._lock:
+                        slot = backend._find_slot(int(parts[1]))
+                        if slot is not None:
+                            slot["is_reserved"] = False
+                            slot["reservation_info"] = None
+                    self._json({} if slot is not None else {"detail": "not found"}, 200 if slot else 404)
+                else:
+                    key = "not_found"
+                    self._json({"detail": "not found"}, 404)
+
+                with backend._lock:
+                    backend.requests[key] += 1
+
+            def do_GET(self):
+                self._route("GET")
+
+            def do_POST(self):
+                self.body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self._route("POST")
+
+            def do_PATCH(self):
+                self._route("PATCH")
+
+            def do_DELETE(self):
+                self._route("DELETE")
+
+        return Handler
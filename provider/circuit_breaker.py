@@ -0,0 +1,107 @@
+# circuit_breaker.py
+import threading
+import time
+from collections import deque
+import requests
+import streamlit as st
+from config import CIRCUIT_FAILURE_RATIO, CIRCUIT_MIN_CALLS, CIRCUIT_OPEN_SEC, CIRCUIT_WINDOW, TIMEOUTS
+from metrics import get_registry
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """차단 중인 엔드포인트 묶음으로 요청하려 할 때. 기존 RequestException 처리에 그대로 걸립니다."""
+
+    def __init__(self, family):
+        super().__init__(f"{family} API 응답이 불안정해 잠시 요청을 보내지 않습니다.")
+        self.family = family
+
+class CircuitBreaker:
+    """엔드포인트 묶음(auth/stores/reservations/stats) 하나의 서킷 브레이커
+
+    - closed: 최근 window번의 결과 중 실패 비율이 failure_ratio 이상이면(min_calls번 이상일 때) open으로.
+    - open: 요청을 보내지 않고 바로 CircuitOpenError. open_sec가 지나면 half_open.
+    - half_open: 시험 요청 하나만 보내고, 성공하면 closed, 실패하면 다시 open.
+      시험 요청은 따로 만들지 않고 그 뒤 처음 들어오는 실제(인증된) 요청이 맡습니다.
+      인증 없는 확인 요청은 느리거나 실패하는 핸들러에 닿기 전에 401로 끝나 복구 여부를 알 수 없기 때문입니다.
+    실패는 연결 오류/타임아웃과 5xx 응답입니다. (4xx는 서버가 살아 있다는 뜻이므로 성공으로 셈)
+    """
+
+    def __init__(self, family, window, min_calls, failure_ratio, open_sec):
+        self.family = family
+        self._min_calls = min_calls
+        self._failure_ratio = failure_ratio
+        self._open_sec = open_sec
+        self._lock = threading.Lock()
+        self._results = deque(maxlen=window)
+        self._state = "closed"
+        self._opened_at = None        # time.monotonic()
+        self._trial = False           # half_open 시험 요청이 진행 중인지
+        self.opened_wall = None       # time.time(), 화면 표시용
+
+    @property
+    def state(self):
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self):
+        if self._state == "open" and time.monotonic() - self._opened_at >= self._open_sec:
+            self._state = "half_open"
+            self._trial = False
+
+    def allow(self):
+        """요청을 보내도 되는지. half_open이면 시험 요청 하나에만 True"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == "closed":
+                return True
+            if self._state == "half_open" and not self._trial:
+                self._trial = True
+                return True
+        get_registry().inc("provider_circuit_rejected_total", family=self.family)
+        return False
+
+    def retry_in(self):
+        """다시 시험해 볼 수 있을 때까지 남은 초 (open이 아니면 0)"""
+        with self._lock:
+            if self._state != "open":
+                return 0.0
+            return max(self._open_sec - (time.monotonic() - self._opened_at), 0.0)
+
+    def record(self, ok):
+        """결과를 기록합니다. 이번 결과로 open이 됐으면 True"""
+        with self._lock:
+            if self._state == "half_open":
+                self._trial = False
+                if ok:
+                    self._state = "closed"
+                    self._results.clear()
+                    self.opened_wall = None
+                    get_registry().inc("provider_circuit_transitions_total", family=self.family, to="closed")
+                    return False
+                self._open()
+                return True
+            if self._state == "open":
+                return False
+            self._results.append(ok)
+            failures = self._results.count(False)
+            if len(self._results) >= self._min_calls and failures / len(self._results) >= self._failure_ratio:
+                self._open()
+                return True
+            return False
+
+    def _open(self):
+        self._state = "open"
+        self._opened_at = time.monotonic()
+        if self.opened_wall is None:
+            self.opened_wall = time.time()
+        get_registry().inc("provider_circuit_transitions_total", family=self.family, to="open")
+
+@st.cache_resource
+def _get_breakers():
+    return {
+        family: CircuitBreaker(family, CIRCUIT_WINDOW, CIRCUIT_MIN_CALLS, CIRCUIT_FAILURE_RATIO, CIRCUIT_OPEN_SEC)
+        for family in TIMEOUTS
+    }
+
+def get_breaker(family):
+    return _get_breakers()[family]
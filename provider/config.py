@@ -1,3 +1,5 @@
+import os
+
 def _get_api_base_url():
     try:
         import streamlit as st
@@ -6,7 +8,97 @@ def _get_api_base_url():
             return v
     except Exception:
         pass
+
+    v = os.environ.get("API_BASE_URL")
+    if v:
+        return v
     
     raise RuntimeError("API_BASE_URL is not set in Streamlit secrets or env")
 
-API_BASE_URL = _get_api_base_url()
\ No newline at end of file
+_api_base_url = None
+
+def get_api_base_url():
+    """처음 호출될 때 한 번만 secrets/env를 읽습니다. (import 시점에는 읽지 않음)"""
+    global _api_base_url
+    if _api_base_url is None:
+        _api_base_url = _get_api_base_url()
+    return _api_base_url
+
+def __getattr__(name):
+    # 예전처럼 config.API_BASE_URL로 접근해도 지연 로딩되도록
+    if name == "API_BASE_URL":
+        return get_api_base_url()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# 엔드포인트 계열별 (connect, read) 타임아웃(초)
+TIMEOUTS = {
+    "auth": (3.05, 10),
+    "stores": (3.05, 10),
+    "reservations": (3.05, 10),
+    "stats": (3.05, 30),  # 30일 집계는 응답이 느릴 수 있음
+}
+
+# 커넥션 풀 / 재시도 설정
+HTTP_POOL_SIZE = 20
+HTTP_MAX_RETRIES = 2          # 멱등 GET에만 적용
+HTTP_BACKOFF_FACTOR = 0.3     # 0.3s, 0.6s, ...
+
+# 서킷 브레이커 (TIMEOUTS의 엔드포인트 묶음별) — 백엔드가 불안정하면 타임아웃을 기다리지 않고 바로 실패
+CIRCUIT_WINDOW = 20           # 실패율을 계산할 최근 요청 수
+CIRCUIT_MIN_CALLS = 5         # 이만큼은 쌓여야 차단 여부를 판단
+CIRCUIT_FAILURE_RATIO = 0.5   # 실패(연결 오류/타임아웃/5xx) 비율이 이 이상이면 차단
+CIRCUIT_OPEN_SEC = 10         # 차단 후 시험 요청을 보내기까지 기다리는 시간
+
+# 응답 캐시 TTL(초) — (store_id, endpoint, period) 단위
+CACHE_TTL = {
+    "timeline": 15,
+    "stats": 300,
+    "stats_range": 6 * 60 * 60,   # 오늘을 포함하지 않는 임의 기간 통계 (지난 날짜는 바뀌지 않음)
+}
+STATS_RANGE_MAX_DAYS = 365        # 직접 선택 기간에서 고를 수 있는 가장 오래된 날짜 (오늘 기준)
+
+# 병렬 호출용 스레드 풀 크기
+HTTP_MAX_WORKERS = 8
+MULTI_STORE_MAX_WORKERS = 4   # 여러 가게 동시 조회 시 한 세션이 동시에 보내는 요청 수 상한
+
+# 슬롯 마감/열기/취소 대기열 (몰린 클릭이 예약 API를 한꺼번에 두드리지 않도록)
+MUTATION_RATE_PER_SEC = 5     # 가게별 초당 요청 수 (토큰 버킷)
+MUTATION_BURST = 10           # 쉬고 있던 가게가 한 번에 보낼 수 있는 요청 수
+MUTATION_MAX_IN_FLIGHT = 4    # 프로세스 전체 동시 요청 수 상한
+MUTATION_MAX_QUEUED_PER_STORE = 50   # 가게별 대기열 상한, 넘치면 "busy"로 거절
+MUTATION_WAIT_SEC = 2         # 버튼 콜백이 결과를 기다리는 시간, 이후는 백그라운드에서 계속 처리
+
+# 세션에 들고 있는 타임라인을 백엔드와 다시 맞추는 주기(초)
+TIMELINE_RECONCILE_SEC = 30
+
+# 액세스 토큰 만료 몇 초 전에 미리 재발급할지
+TOKEN_REFRESH_LEEWAY_SEC = 60
+
+# 브라우저 세션별 로그인 상태 저장소 (메모리 LRU + 선택적 SQLite 파일)
+SESSION_STORE_MAX_ENTRIES = 1000
+SESSION_STORE_TTL_SEC = 12 * 60 * 60
+SESSION_STORE_PATH = None  # 예: ".cache/sessions.sqlite3" — 재시작 후에도 로그인 유지
+SESSION_COOKIE_NAME = "provider_sid"   # 세션 ID를 담는 쿠키 (URL에는 싣지 않음)
+
+# 통계/타임라인 스냅샷 (재시작 직후에도 마지막 통계를 먼저 보여주고 백그라운드에서 갱신)
+SNAPSHOT_CACHE_PATH = ".cache/snapshots.sqlite3"   # None이면 저장하지 않음
+SNAPSHOT_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# 실시간 예약 반영: 가게별 백그라운드 감시 스레드가 조건부 GET으로 변경분만 받아옴
+LIVE_POLL_SEC = 5         # 감시 주기 / 타임라인 프래그먼트 갱신 주기
+LIVE_IDLE_SEC = 60        # 이 시간 동안 보는 세션이 없으면 감시 스레드 종료
+LIVE_BACKLOG = 200        # 세션이 따라잡을 수 있는 최근 변경 버전 수
+
+# 슬롯 그리드 창: 한 번에 그리는 범위 (가게 규모가 커도 rerun 비용은 보이는 만큼만)
+GRID_WINDOW_HOURS = 3     # '지금부터' 보기에서 보여줄 시간 (현재 시각의 정시부터)
+GRID_SPACES_PER_PAGE = 4  # 한 페이지에 그리는 공간 수
+
+# 타임라인 ?since= 델타 요청 (백엔드가 cursor/slots 델타 응답을 지원할 때만 켬)
+TIMELINE_DELTA_SINCE = False
+
+# 계측: 렌더/백엔드 지연 히스토그램, 매 rerun마다 JSON 로그 한 줄
+METRICS_LOG_RERUNS = True
+# 진단용 (운영에서는 끔): 켜면 렌더 요소 수도 세고(Streamlit 내부 전송 함수를 감쌈),
+# ?debug=1 로 사이드바 성능 지표 패널을 열 수 있음. (패널은 주소만 알면 누구나 열고 프로세스 전체 지표가 보임)
+METRICS_DEBUG = False
+METRICS_DEBUG_PARAM = "debug"
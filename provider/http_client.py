@@ -0,0 +1,165 @@
+# http_client.py
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from urllib3.util.retry import Retry
+from config import HTTP_POOL_SIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, HTTP_MAX_WORKERS, TIMEOUTS
+from metrics import record_http
+from circuit_breaker import CircuitOpenError, get_breaker
+
+# JSON 디코더: orjson > msgspec > 표준 json 순으로 설치된 것을 사용
+try:
+    import orjson
+
+    JSON_BACKEND = "orjson"
+    _loads = orjson.loads
+except ImportError:
+    try:
+        import msgspec
+
+        JSON_BACKEND = "msgspec"
+        _loads = msgspec.json.Decoder().decode
+    except ImportError:
+        import json
+
+        JSON_BACKEND = "json"
+        _loads = json.loads
+
+def loads(raw):
+    """bytes/str → 파이썬 객체. 디코더와 상관없이 실패하면 ValueError"""
+    try:
+        return _loads(raw)
+    except ValueError:
+        raise
+    except Exception as e:  # msgspec.DecodeError는 ValueError가 아님
+        raise ValueError(str(e)) from e
+
+def decode_json(response):
+    """response.json() 대신 사용하는 빠른 디코딩"""
+    return loads(response.content)
+
+@st.cache_resource
+def get_session():
+    """프로세스 전역 requests.Session (커넥션 풀 + keep-alive)
+
+    재시도는 멱등한 GET에만 적용하고, PATCH/DELETE/POST는 한 번만 보냅니다.
+    """
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        connect=HTTP_MAX_RETRIES,
+        read=HTTP_MAX_RETRIES,
+        status=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def request(method, url, family, **kwargs):
+    """공용 세션으로 요청을 보냅니다. family는 config.TIMEOUTS 키입니다.
+
+    family의 서킷이 열려 있으면 보내지 않고 CircuitOpenError(RequestException)를 냅니다.
+    """
+    breaker = get_breaker(family)
+    if not breaker.allow():
+        record_http(family, method, "circuit_open", 0, 0.0)
+        raise CircuitOpenError(family)
+    kwargs.setdefault("timeout", TIMEOUTS[family])
+    started = time.perf_counter()
+    try:
+        response = get_session().request(method, url, **kwargs)
+    except requests.exceptions.RequestException as e:
+        # 응답이 없으면 상태 코드 대신 예외 이름(ConnectTimeout, ReadTimeout, ConnectionError 등)으로 셈
+        breaker.record(False)
+        record_http(family, method, type(e).__name__, 0, (time.perf_counter() - started) * 1000)
+        raise
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    breaker.record(response.status_code < 500)
+    record_http(family, method, response.status_code, len(response.content), elapsed_ms)
+    return response
+
+@st.cache_resource
+def get_executor():
+    """백엔드 호출을 병렬로 보내기 위한 프로세스 전역 스레드 풀"""
+    return ThreadPoolExecutor(max_workers=HTTP_MAX_WORKERS, thread_name_prefix="api")
+
+def submit(fn, *args, **kwargs):
+    """현재 스크립트 컨텍스트를 붙여서 스레드 풀에 작업을 제출합니다."""
+    ctx = get_script_run_ctx()
+
+    def _run():
+        if ctx is not None:
+            add_script_run_ctx(None, ctx)
+        return fn(*args, **kwargs)
+
+    return get_executor().submit(_run)
+
+@st.cache_resource
+def _get_background_jobs():
+    return {}, threading.Lock()
+
+def submit_once(key, fn, *args):
+    """같은 key의 백그라운드 작업이 진행 중이면 새로 제출하지 않고 그 Future를 돌려줍니다.
+
+    렌더가 끝난 뒤에도 계속 도는 작업이므로 스크립트 컨텍스트를 붙이지 않습니다. (st 요소 금지)
+    """
+    jobs, lock = _get_background_jobs()
+    with lock:
+        future = jobs.get(key)
+        if future is None or future.done():
+            future = jobs[key] = get_executor().submit(fn, *args)
+    return future
+
+def is_running(key):
+    jobs, lock = _get_background_jobs()
+    with lock:
+        future = jobs.get(key)
+    return future is not None and not future.done()
+
+def run_parallel(*calls):
+    """(fn, args...) 튜플들을 동시에 실행하고, 입력 순서대로 결과를 돌려줍니다."""
+    futures = [submit(fn, *args) for fn, *args in calls]
+    return [f.result() for f in futures]
+
+def iter_bounded(calls, limit):
+    """calls를 동시에 최대 limit개씩 실행하면서, 끝나는 순서대로 (입력 순번, 결과)를 내놓습니다.
+
+    가게가 많아도 한 세션이 공용 스레드 풀과 백엔드를 독점하지 않도록, 하나가 끝날 때마다 다음 것을 제출합니다.
+    """
+    queue = iter(enumerate(calls))
+    pending = {}
+
+    def _submit_next():
+        item = next(queue, None)
+        if item is not None:
+            idx, (fn, *args) = item
+            pending[submit(fn, *args)] = idx
+
+    for _ in range(max(limit, 1)):
+        _submit_next()
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            idx = pending.pop(future)
+            _submit_next()
+            yield idx, future.result()
+
+def run_bounded(calls, limit):
+    """iter_bounded의 결과를 입력 순서대로 모아서 돌려줍니다."""
+    results = [None] * len(calls)
+    for idx, result in iter_bounded(calls, limit):
+        results[idx] = result
+    return results
@@ -0,0 +1,149 @@
+# live_updates.py
+import itertools
+import threading
+import time
+from collections import deque
+import streamlit as st
+from api_functions import AccessDenied, get_timeline_conditional
+from config import LIVE_BACKLOG, LIVE_IDLE_SEC, LIVE_POLL_SEC
+from response_cache import get_response_cache
+
+_watch_ids = itertools.count(1)
+
+def flatten_slots(timeline):
+    """{slot_id: slot}와 구조 키(날짜별 공간 목록)를 돌려줍니다."""
+    slots, structure = {}, []
+    for day in ("today", "tomorrow"):
+        for space in ((timeline or {}).get(day) or {}).get("spaces") or []:
+            day_slots = space.get("slots") or []
+            structure.append((day, space.get("space_name"), tuple(s.get("slot_id") for s in day_slots)))
+            for slot in day_slots:
+                slots[slot.get("slot_id")] = slot
+    return slots, tuple(structure)
+
+def diff_slots(old_slots, new_slots):
+    """바뀐 슬롯만 {slot_id: 새 slot}으로"""
+    return {sid: slot for sid, slot in new_slots.items() if old_slots.get(sid) != slot}
+
+class TimelineWatcher:
+    """가게 하나의 타임라인을 백그라운드에서 감시하고 슬롯 단위 변경분을 버전별로 쌓습니다.
+
+    같은 가게를 같은 토큰(AuthTokens.principal)으로 보는 세션들이 하나의 감시 스레드를 공유합니다.
+    토큰마다 따로 감시하므로, 한 세션의 토큰으로 받은 예약 현황이 다른 토큰의 세션에 넘어가지 않습니다.
+    백엔드가 이 토큰을 거절하면(AccessDenied) 들고 있던 트리를 버리고 denied를 켭니다.
+    get_timeline_conditional을 쓰므로 변경이 없을 때는 304만 받고 본문을 파싱하지 않습니다.
+    """
+
+    def __init__(self, store_id):
+        self.store_id = store_id
+        self.watch_id = next(_watch_ids)   # 버전은 감시자마다 따로 세므로 세션이 어느 감시자의 버전인지 구분
+        self.denied = False
+        self._lock = threading.Lock()
+        self._auth = None
+        self._tree = None
+        self._slots = {}
+        self._structure = None
+        self._version = 0
+        self._changes = deque(maxlen=LIVE_BACKLOG)   # (version, deltas | None=구조 변경)
+        self._last_seen = 0.0
+        self._last_ok = None
+        self._thread = None
+
+    def subscribe(self, auth):
+        """세션이 화면을 그릴 때마다 호출: 세션의 토큰 묶음을 넘기고 감시 스레드를 살려둡니다.
+
+        복사하지 않고 같은 객체를 쓰므로, 감시 중 재발급된 토큰은 세션의 다음 렌더에서 반영됩니다.
+        """
+        with self._lock:
+            self._auth = auth
+            self._last_seen = time.monotonic()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=f"timeline-watch-{self.store_id}", daemon=True,
+                )
+                self._thread.start()
+
+    def idle(self):
+        """감시 스레드가 구독이 끊겨 멈췄는지 (한 번도 구독하지 않았으면 False)"""
+        with self._lock:
+            return self._last_seen > 0 and self._thread is None
+
+    def synced_within(self, seconds):
+        last_ok = self._last_ok
+        return last_ok is not None and time.monotonic() - last_ok < seconds
+
+    def changes_since(self, cursor):
+        """(version, deltas, tree)
+
+        deltas가 None이면 따라잡을 수 없으니(첫 구독/구조 변경/백로그 초과) tree 전체로 교체해야 합니다.
+        """
+        with self._lock:
+            if self._tree is None:
+                return cursor, {}, None
+            if cursor == self._version:
+                return cursor, {}, self._tree
+            pending = [(v, d) for v, d in self._changes if cursor is not None and v > cursor]
+            if cursor is None or len(pending) != self._version - cursor or any(d is None for _, d in pending):
+                return self._version, None, self._tree
+            merged = {}
+            for _, deltas in pending:
+                merged.update(deltas)
+            return self._version, merged, self._tree
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if time.monotonic() - self._last_seen > LIVE_IDLE_SEC:
+                    self._thread = None
+                    return
+                auth = self._auth
+            self._poll(auth)
+            time.sleep(LIVE_POLL_SEC)
+
+    def _poll(self, auth):
+        # 조건부 GET: 변경이 없으면 304 → 지난번과 같은 트리 객체가 돌아옴
+        try:
+            tree = get_timeline_conditional(self.store_id, auth)
+        except AccessDenied:
+            # 이 토큰으로는 볼 수 없음: 받아 둔 트리도 더는 넘겨주지 않음
+            with self._lock:
+                self._tree, self._slots, self._structure = None, {}, None
+                self._last_ok = None
+                self.denied = True
+            get_response_cache().invalidate(self.store_id, "timeline", principal=auth.principal)
+            return
+        if tree is None:
+            return
+        self._last_ok = time.monotonic()
+        self.denied = False
+        if tree is not self._tree:
+            self._apply(tree, auth)
+
+    def _apply(self, tree, auth):
+        # 새 ETag로 200을 받았는데 슬롯이 그대로여도 트리는 바꿔 둠 (다음 304부터 같은 객체로 비교되도록)
+        slots, structure = flatten_slots(tree)
+        with self._lock:
+            if self._tree is not None and structure == self._structure:
+                deltas = diff_slots(self._slots, slots)
+            else:
+                deltas = None
+            self._tree, self._slots, self._structure = tree, slots, structure
+            if deltas is None or deltas:
+                self._version += 1
+                self._changes.append((self._version, deltas))
+        get_response_cache().set(self.store_id, auth.principal, "timeline", tree)
+
+@st.cache_resource
+def _get_watchers():
+    return {}, threading.Lock()
+
+def get_watcher(store_id, principal):
+    """(가게, 토큰)별 감시자. 토큰이 재발급되면 새 감시자가 생기고, 예전 것은 구독이 끊겨 LIVE_IDLE_SEC 뒤 멈춥니다."""
+    watchers, lock = _get_watchers()
+    with lock:
+        for key in [k for k, w in watchers.items() if w.idle()]:
+            del watchers[key]
+        key = (store_id, principal)
+        if key not in watchers:
+            watchers[key] = TimelineWatcher(store_id)
+        return watchers[key]
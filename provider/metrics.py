@@ -0,0 +1,231 @@
+# metrics.py
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from config import METRICS_DEBUG, METRICS_LOG_RERUNS
+
+logger = logging.getLogger("provider.metrics")
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+SIZE_BUCKETS_BYTES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+COUNT_BUCKETS = (10, 50, 100, 250, 500, 1000, 2500, 5000)
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # 마지막 칸 = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+class MetricsRegistry:
+    """프로세스 전역 지표 저장소 (히스토그램 + 카운터), Prometheus 텍스트로 내보낼 수 있음"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS_MS, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = Histogram(buckets)
+            hist.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def to_prometheus(self):
+        lines = []
+        typed = set()
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name}{_labels(labels)} {value}")
+            for (name, labels), hist in sorted(self._histograms.items(), key=lambda kv: kv[0]):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} histogram")
+                cumulative = 0
+                for upper, count in zip(list(hist.buckets) + ["+Inf"], hist.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', upper),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {hist.sum:.3f}")
+                lines.append(f"{name}_count{_labels(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+@st.cache_resource
+def get_registry():
+    return MetricsRegistry()
+
+# --- rerun 단위 기록 -------------------------------------------------------
+
+def _current_run():
+    """스크립트 컨텍스트가 있는 스레드에서만 이번 rerun 기록을 돌려줍니다."""
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    return st.session_state.get("_metrics_run")
+
+def _element_count():
+    """이번 세션으로 보낸 요소(delta) 메시지 수 (METRICS_DEBUG가 꺼져 있으면 None)
+
+    Streamlit 내부(ScriptRunContext의 전송 함수)를 감싸서 세므로 진단할 때만 켭니다.
+    """
+    if not METRICS_DEBUG:
+        return None
+    ctx = get_script_run_ctx(suppress_warning=True)
+    enqueue = getattr(ctx, "_enqueue", None)
+    if enqueue is None:
+        return 0
+    if not getattr(enqueue, "_counts_elements", False):
+        original = enqueue
+
+        def counting_enqueue(msg):
+            if msg.HasField("delta"):
+                counting_enqueue.elements += 1
+            original(msg)
+
+        counting_enqueue._counts_elements = True
+        counting_enqueue.elements = 0
+        ctx._enqueue = enqueue = counting_enqueue
+    return enqueue.elements
+
+def _elements_since(start):
+    now = _element_count()
+    return None if now is None or start is None else now - start
+
+def begin_run():
+    st.session_state["_metrics_run"] = {
+        "started": time.perf_counter(),
+        "elements_at_start": _element_count(),
+        "sections": {},
+        "api": [],
+    }
+
+def end_run():
+    run = st.session_state.pop("_metrics_run", None)
+    if run is None:
+        return
+    total_ms = (time.perf_counter() - run["started"]) * 1000
+    elements = _elements_since(run["elements_at_start"])
+    registry = get_registry()
+    registry.observe("provider_rerun_duration_ms", total_ms)
+    if elements is not None:
+        registry.observe("provider_rerun_elements", elements, buckets=COUNT_BUCKETS)
+    summary = {
+        "event": "rerun",
+        "store_id": st.session_state.get("store_id"),
+        "duration_ms": round(total_ms, 1),
+        "elements": elements,
+        "sections": run["sections"],
+        "api": run["api"],
+    }
+    st.session_state["_metrics_last_run"] = summary
+    if METRICS_LOG_RERUNS:
+        logger.info(json.dumps(summary, ensure_ascii=False, default=str))
+
+@contextmanager
+def timed(section):
+    """렌더 구간의 소요 시간과 그 사이에 그린 요소 수를 기록합니다."""
+    started = time.perf_counter()
+    elements_before = _element_count()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        elements = _elements_since(elements_before)
+        registry = get_registry()
+        registry.observe("provider_render_duration_ms", elapsed_ms, section=section)
+        if elements is not None:
+            registry.observe("provider_render_elements", elements, buckets=COUNT_BUCKETS, section=section)
+        run = _current_run()
+        if run is not None:
+            entry = run["sections"].setdefault(section, {"ms": 0.0, "calls": 0})
+            entry["ms"] = round(entry["ms"] + elapsed_ms, 1)
+            entry["calls"] += 1
+            if elements is not None:
+                entry["elements"] = entry.get("elements", 0) + elements
+
+def instrumented(fn):
+    """api_functions 호출의 소요 시간을 함수 이름별로 기록합니다.
+
+    제너레이터 함수는 만들 때가 아니라 끝까지 다 돌 때(중간에 닫히면 그때)까지를 재고,
+    끝까지 돌았으면 ok로 셉니다.
+    """
+    if inspect.isgeneratorfunction(fn):
+        @functools.wraps(fn)
+        def gen_wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            ok = False
+            try:
+                yield from fn(*args, **kwargs)
+                ok = True
+            finally:
+                _record_call(fn.__name__, started, ok)
+        return gen_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = result is not None and result is not False
+            return result
+        finally:
+            _record_call(fn.__name__, started, ok)
+    return wrapper
+
+def _record_call(name, started, ok):
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    get_registry().observe("provider_api_call_duration_ms", elapsed_ms, call=name, ok=ok)
+    run = _current_run()
+    if run is not None:
+        run["api"].append({"call": name, "ms": round(elapsed_ms, 1), "ok": ok})
+
+def record_http(family, method, status, nbytes, elapsed_ms):
+    """HTTP 요청 하나의 상태 코드/응답 크기/지연을 기록합니다. (http_client에서 호출)
+
+    응답을 못 받은 요청은 status에 예외 이름이, 서킷이 열려 보내지 않은 요청은 "circuit_open"이 들어옵니다.
+    """
+    registry = get_registry()
+    registry.inc("provider_http_requests_total", family=family, method=method, status=status)
+    registry.observe("provider_http_duration_ms", elapsed_ms, family=family, method=method)
+    registry.observe("provider_http_response_bytes", nbytes, buckets=SIZE_BUCKETS_BYTES, family=family)
+
+def render_debug_panel():
+    """METRICS_DEBUG가 켜져 있고 ?debug=1 일 때만 사이드바에 직전 rerun 요약과 Prometheus 덤프를 보여줍니다."""
+    with st.sidebar.expander("🛠 성능 지표", expanded=False):
+        last = st.session_state.get("_metrics_last_run")
+        if last:
+            st.caption(f"직전 rerun: {last['duration_ms']} ms · 요소 {last['elements']}개")
+            st.json({"sections": last["sections"], "api": last["api"]}, expanded=False)
+        text = get_registry().to_prometheus()
+        st.download_button("Prometheus 텍스트 받기", text, file_name="provider_metrics.prom", mime="text/plain")
+        st.code(text, language="text")
@@ -0,0 +1,175 @@
+# mutation_queue.py
+import threading
+import time
+import uuid
+from collections import Counter, deque
+import streamlit as st
+from config import MUTATION_BURST, MUTATION_MAX_IN_FLIGHT, MUTATION_MAX_QUEUED_PER_STORE, MUTATION_RATE_PER_SEC
+from metrics import get_registry
+
+class TokenBucket:
+    """초당 rate개씩 차오르고 최대 burst개까지 쌓이는 토큰 버킷 (호출자가 잠금을 잡고 사용)"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_take(self, now):
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self, now):
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+FINISHED_STATUSES = ("done", "failed", "busy", "conflict")
+
+class MutationJob:
+    """슬롯 하나에 대한 마감/열기/취소 요청. job_id는 백엔드 Idempotency-Key로도 씁니다."""
+
+    __slots__ = ("job_id", "store_id", "slot_id", "action", "send", "status", "created_at", "finished_at")
+
+    def __init__(self, store_id, slot_id, action, send):
+        self.job_id = uuid.uuid4().hex
+        self.store_id = store_id
+        self.slot_id = slot_id
+        self.action = action
+        self.send = send            # send(job) -> 성공 여부 (스레드 풀에서 호출, st 요소 금지)
+        self.status = "queued"      # queued / running / done / failed, 접수 거절이면 busy / conflict
+        self.created_at = time.monotonic()
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATUSES
+
+    @classmethod
+    def rejected(cls, store_id, slot_id, action, reason):
+        """대기열에 넣지 않고 바로 끝난 작업 (reason: busy / conflict)"""
+        job = cls(store_id, slot_id, action, None)
+        job.status = reason
+        job.finished_at = job.created_at
+        return job
+
+class MutationQueue:
+    """프로세스 전역 뮤테이션 대기열
+
+    - 슬롯당 진행 중인 작업은 하나: 같은 슬롯에 같은 작업이 다시 들어오면 새로 보내지 않고 기존 작업을 돌려주고,
+      다른 작업(예: 마감 대기 중에 열기)이 들어오면 "conflict"로 거절합니다.
+    - 가게별로 max_queued개까지만 대기열에 쌓고, 가득 차면 "busy"로 거절합니다.
+    - 가게별 토큰 버킷으로 초당 요청 수를 제한하고, 프로세스 전체 동시 요청은 max_in_flight개로 묶습니다.
+    - 백그라운드 디스패처 스레드가 대기열을 비우므로, 몰린 클릭도 API에는 고르게 나갑니다.
+    """
+
+    def __init__(self, rate, burst, max_in_flight, max_queued, executor):
+        self._rate = rate
+        self._burst = burst
+        self._max_in_flight = max_in_flight
+        self._max_queued = max_queued
+        self._executor = executor
+        self._cond = threading.Condition()
+        self._pending = deque()
+        self._active = {}    # (store_id, slot_id) -> 진행 중인 MutationJob
+        self._queued = Counter()    # store_id -> 아직 보내지 않은 작업 수
+        self._buckets = {}
+        self._in_flight = 0
+        self._thread = None
+
+    def submit(self, store_id, slot_id, action, send):
+        """작업을 넣고 MutationJob을 돌려줍니다. 거절된 작업은 status가 busy / conflict인 채로 끝나 있습니다."""
+        with self._cond:
+            job = self._active.get((store_id, slot_id))
+            if job is not None:
+                if job.action == action:
+                    get_registry().inc("provider_mutation_deduplicated_total", action=action)
+                    return job
+                return self._reject(store_id, slot_id, action, "conflict")
+            if self._queued[store_id] >= self._max_queued:
+                return self._reject(store_id, slot_id, action, "busy")
+            job = MutationJob(store_id, slot_id, action, send)
+            self._active[(store_id, slot_id)] = job
+            self._pending.append(job)
+            self._queued[store_id] += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._dispatch, name="mutation-queue", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+            return job
+
+    def _reject(self, store_id, slot_id, action, reason):
+        get_registry().inc("provider_mutation_rejected_total", action=action, reason=reason)
+        return MutationJob.rejected(store_id, slot_id, action, reason)
+
+    def wait(self, jobs, timeout):
+        """jobs가 모두 끝나거나 timeout이 지날 때까지 기다립니다."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while not all(job.finished for job in jobs):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+    def pending_slots(self, store_id):
+        """이 가게에서 아직 끝나지 않은 작업의 {slot_id: action}"""
+        with self._cond:
+            return {slot_id: job.action for (sid, slot_id), job in self._active.items() if sid == store_id}
+
+    def _next_job(self):
+        # 호출자가 잠금을 잡고 있음. 토큰이 있는 가게의 가장 오래된 작업, 없으면 (None, 다음 토큰까지 대기 시간)
+        now = time.monotonic()
+        wait = None
+        for job in self._pending:
+            bucket = self._buckets.setdefault(job.store_id, TokenBucket(self._rate, self._burst))
+            if bucket.try_take(now):
+                return job, None
+            w = bucket.wait_time(now)
+            wait = w if wait is None else min(wait, w)
+        return None, wait
+
+    def _dispatch(self):
+        while True:
+            with self._cond:
+                job = None
+                while job is None:
+                    if self._pending and self._in_flight < self._max_in_flight:
+                        job, wait = self._next_job()
+                        if job is None:
+                            self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                self._pending.remove(job)
+                self._queued[job.store_id] -= 1
+                job.status = "running"
+                self._in_flight += 1
+            self._executor.submit(self._run, job)
+
+    def _run(self, job):
+        try:
+            ok = bool(job.send(job))
+        except Exception:
+            ok = False
+        get_registry().inc("provider_mutation_total", action=job.action, ok=ok)
+        with self._cond:
+            job.status = "done" if ok else "failed"
+            job.finished_at = time.monotonic()
+            self._in_flight -= 1
+            if self._active.get((job.store_id, job.slot_id)) is job:
+                del self._active[(job.store_id, job.slot_id)]
+            self._cond.notify_all()
+
+@st.cache_resource
+def get_mutation_queue():
+    from http_client import get_executor
+    return MutationQueue(
+        MUTATION_RATE_PER_SEC, MUTATION_BURST, MUTATION_MAX_IN_FLIGHT, MUTATION_MAX_QUEUED_PER_STORE, get_executor(),
+    )
@@ -0,0 +1,82 @@
+# response_cache.py
+import threading
+import time
+import streamlit as st
+from config import CACHE_TTL
+
+class ResponseCache:
+    """(store_id, principal, endpoint, period) 키의 TTL 캐시
+
+    모든 세션이 공유하므로 키에는 반드시 store_id와, 그 응답을 받아 온 토큰(AuthTokens.principal)이 들어갑니다.
+    다른 토큰으로 받은 응답은 돌려주지 않으므로, 권한을 잃은 세션은 캐시가 아니라 백엔드의 거절을 받습니다.
+    무효화는 가게 단위로 모든 토큰의 항목을 지웁니다.
+    """
+
+    def __init__(self, ttl):
+        self._ttl = ttl
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, store_id, principal, endpoint, period=None):
+        key = (store_id, principal, endpoint, period)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, store_id, principal, endpoint, value, period=None):
+        expires_at = time.monotonic() + self._ttl.get(endpoint, 0)
+        with self._lock:
+            self._data[(store_id, principal, endpoint, period)] = (expires_at, value)
+
+    def invalidate(self, store_id, endpoint=None, principal=None):
+        """가게 단위로 무효화합니다. endpoint/principal을 주면 그 엔드포인트/토큰의 항목만 지웁니다."""
+        with self._lock:
+            for key in [
+                k for k in self._data
+                if k[0] == store_id and endpoint in (None, k[2]) and principal in (None, k[1])
+            ]:
+                del self._data[key]
+
+@st.cache_resource
+def get_response_cache():
+    return ResponseCache(CACHE_TTL)
+
+class ValidatorStore:
+    """(가게, 토큰)별 마지막 ETag/Last-Modified와 파싱된 본문 (만료 없음)
+
+    조건부 요청이 304를 받으면 저장된 본문을 다시 파싱하지 않고 재사용합니다.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, store_id, principal, endpoint):
+        """(etag, last_modified, cursor, body) 또는 None"""
+        with self._lock:
+            return self._data.get((store_id, principal, endpoint))
+
+    def set(self, store_id, principal, endpoint, etag, last_modified, cursor, body):
+        with self._lock:
+            self._data[(store_id, principal, endpoint)] = (etag, last_modified, cursor, body)
+
+    def invalidate(self, store_id, endpoint=None):
+        """가게 단위로 지웁니다. endpoint를 주면 해당 엔드포인트만 지웁니다. (다음 요청은 조건 없이 전체를 받음)"""
+        with self._lock:
+            for key in [k for k in self._data if k[0] == store_id and endpoint in (None, k[2])]:
+                del self._data[key]
+
+@st.cache_resource
+def get_validator_store():
+    return ValidatorStore()
+
+def invalidate_store(store_id, endpoint=None):
+    """응답 캐시와 조건부 요청 검증값을 함께 지웁니다."""
+    get_response_cache().invalidate(store_id, endpoint)
+    get_validator_store().invalidate(store_id, endpoint)
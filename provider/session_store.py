@@ -0,0 +1,73 @@
+# session_store.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+class SessionStore:
+    """세션 ID별 상태 저장소 (LRU + TTL)
+
+    메모리 LRU가 기본이고, path를 주면 SQLite 파일에도 써서 프로세스가 재시작돼도 복원됩니다.
+    """
+
+    def __init__(self, max_entries, ttl, path=None):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # sid -> (updated_at, data)
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "sid TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, sid):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(sid)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT updated_at, data FROM sessions WHERE sid = ?", (sid,)
+                ).fetchone()
+                if row:
+                    entry = (row[0], json.loads(row[1]))
+                    self._entries[sid] = entry
+            if entry is None:
+                return None
+            if now - entry[0] > self._ttl:
+                self._delete(sid)
+                return None
+            self._entries.move_to_end(sid)
+            return dict(entry[1])
+
+    def set(self, sid, data):
+        now = time.time()
+        data = dict(data)
+        with self._lock:
+            self._entries[sid] = (now, data)
+            self._entries.move_to_end(sid)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sessions (sid, data, updated_at) VALUES (?, ?, ?)",
+                    (sid, json.dumps(data), now),
+                )
+                self._db.execute("DELETE FROM sessions WHERE updated_at < ?", (now - self._ttl,))
+                self._db.commit()
+
+    def delete(self, sid):
+        with self._lock:
+            self._delete(sid)
+
+    def _delete(self, sid):
+        self._entries.pop(sid, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+            self._db.commit()
@@ -0,0 +1,52 @@
+# single_flight.py
+import threading
+import streamlit as st
+from metrics import get_registry
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출을 백엔드 요청 하나로 합치는 single-flight
+
+    먼저 온 호출(leader)만 fn을 실행하고, 그동안 들어온 호출은 그 결과(또는 예외)를 같이 받습니다.
+    끝난 결과는 기억하지 않으므로 이후 호출은 다시 요청합니다. (캐시는 response_cache 몫)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def do(self, key, fn, *args, timeout=None):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            get_registry().inc("provider_single_flight_shared_total", call=key[0])
+            if flight.done.wait(timeout):
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+            # leader가 너무 오래 걸리면 기다리지 않고 직접 요청
+            return fn(*args)
+
+        try:
+            flight.result = fn(*args)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+@st.cache_resource
+def get_single_flight():
+    return SingleFlight()
@@ -0,0 +1,98 @@
+# snapshot_store.py
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import streamlit as st
+from config import SNAPSHOT_CACHE_MAX_BYTES, SNAPSHOT_CACHE_PATH
+
+class SnapshotStore:
+    """가게별 마지막 통계/타임라인 응답을 SQLite 파일에 저장 (재시작 후 웜 스타트용)
+
+    키는 (store_id, principal, endpoint, period)이고 같은 키는 최신 응답으로 덮어씁니다.
+    principal(AuthTokens.principal)이 키에 들어가므로 저장본은 그 응답을 받아 온 토큰에만 돌려줍니다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 쓰이지 않은 스냅샷부터 지웁니다.
+    path가 없으면 아무것도 저장하지 않습니다.
+    """
+
+    def __init__(self, path, max_bytes):
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(snapshots)")}
+            if columns and "principal" not in columns:
+                # 토큰 구분이 없던 예전 저장본은 누구의 응답인지 알 수 없으므로 버림
+                self._db.execute("DROP TABLE snapshots")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                "store_id TEXT NOT NULL, principal TEXT NOT NULL, endpoint TEXT NOT NULL, period TEXT NOT NULL, "
+                "data BLOB NOT NULL, size INTEGER NOT NULL, "
+                "saved_at REAL NOT NULL, used_at REAL NOT NULL, "
+                "PRIMARY KEY (store_id, principal, endpoint, period))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS snapshots_used_at ON snapshots (used_at)")
+            self._db.commit()
+
+    @staticmethod
+    def _key(store_id, principal, endpoint, period):
+        return str(store_id), principal, endpoint, json.dumps(period)
+
+    def get(self, store_id, principal, endpoint, period=None):
+        """(data, saved_at) 또는 None. saved_at은 time.time() 기준입니다."""
+        if self._db is None:
+            return None
+        key = self._key(store_id, principal, endpoint, period)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data, saved_at FROM snapshots "
+                "WHERE store_id = ? AND principal = ? AND endpoint = ? AND period = ?", key,
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE snapshots SET used_at = ? "
+                "WHERE store_id = ? AND principal = ? AND endpoint = ? AND period = ?",
+                (time.time(), *key),
+            )
+            self._db.commit()
+        try:
+            return json.loads(zlib.decompress(row[0])), row[1]
+        except (zlib.error, ValueError):
+            return None
+
+    def set(self, store_id, principal, endpoint, data, period=None):
+        if self._db is None:
+            return
+        blob = zlib.compress(json.dumps(data, ensure_ascii=False).encode())
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO snapshots "
+                "(store_id, principal, endpoint, period, data, size, saved_at, used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*self._key(store_id, principal, endpoint, period), blob, len(blob), now, now),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM snapshots").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        rows = self._db.execute("SELECT rowid, size FROM snapshots ORDER BY used_at").fetchall()
+        doomed = []
+        for rowid, size in rows:
+            if total <= self._max_bytes:
+                break
+            doomed.append((rowid,))
+            total -= size
+        self._db.executemany("DELETE FROM snapshots WHERE rowid = ?", doomed)
+
+@st.cache_resource
+def get_snapshot_store():
+    return SnapshotStore(SNAPSHOT_CACHE_PATH, SNAPSHOT_CACHE_MAX_BYTES)
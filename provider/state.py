@@ -1,16 +1,81 @@
 # state.py
+import json
+import secrets
 import streamlit as st
+from config import SESSION_COOKIE_NAME, SESSION_STORE_MAX_ENTRIES, SESSION_STORE_PATH, SESSION_STORE_TTL_SEC
+from session_store import SessionStore
+
+CACHE_KEYS = ("logged_in", "access_token", "refresh_token", "store_id", "store_name", "stores", "headers")
 
 @st.cache_resource
+def get_session_store():
+    return SessionStore(SESSION_STORE_MAX_ENTRIES, SESSION_STORE_TTL_SEC, SESSION_STORE_PATH)
+
+def get_session_id():
+    """브라우저 세션 ID (로그인 전이면 None)
+
+    URL이 아니라 쿠키로만 주고받으므로 링크/북마크/Referer로 세션이 새지 않습니다.
+    예전 주소의 ?sid= 는 믿지 않고 지웁니다.
+    """
+    if "sid" in st.query_params:
+        del st.query_params["sid"]
+    if "_sid" not in st.session_state:
+        st.session_state["_sid"] = _cookie_session_id()
+    return st.session_state["_sid"] or None
+
+def _cookie_session_id():
+    sid = st.context.cookies.get(SESSION_COOKIE_NAME)
+    return sid if isinstance(sid, str) and sid else None
+
+def rotate_session_id():
+    """로그인 성공 시 새 세션 ID를 발급합니다. (이전 ID로 저장된 값은 지움)"""
+    old = get_session_id()
+    if old:
+        get_session_store().delete(old)
+    st.session_state["_sid"] = secrets.token_urlsafe(24)
+
+def persist_session_cookie():
+    """세션 ID가 브라우저 쿠키와 다르면 (로그인/로그아웃 직후) 쿠키를 고쳐 씁니다.
+
+    Streamlit은 응답 헤더를 건드릴 수 없어 HttpOnly로는 못 쓰고, 스크립트로 SameSite=Strict 쿠키를 씁니다.
+    st.context.cookies는 페이지를 다시 열 때까지 그대로이므로 그 전까지는 rerun마다 같은 값을 다시 씁니다.
+    """
+    sid = get_session_id()
+    if sid == _cookie_session_id():
+        return
+    max_age = SESSION_STORE_TTL_SEC if sid else 0
+    st.html(
+        f"""<script>
+        document.cookie = {json.dumps(SESSION_COOKIE_NAME)} + "=" + {json.dumps(sid or "")}
+            + "; Max-Age={max_age}; Path=/; SameSite=Strict"
+            + (location.protocol === "https:" ? "; Secure" : "");
+        </script>""",
+        unsafe_allow_javascript=True,
+    )
+
 def get_cache():
-    return {
-        "logged_in": False,
-        "access_token": None,
-        "refresh_token": None,
-        "store_id": None,
-        "store_name": None,
-        "headers": None,
-    }
+    """현재 브라우저 세션에 저장된 값 (없으면 로그아웃 상태 기본값)"""
+    sid = get_session_id()
+    cache = get_session_store().get(sid) if sid else None
+    if cache is None:
+        cache = dict.fromkeys(CACHE_KEYS)
+        cache["logged_in"] = False
+    return cache
+
+def token_writer(sid):
+    """재발급된 토큰을 sid의 저장값에 바로 쓰는 AuthTokens.on_refresh 콜백 (백그라운드 스레드에서 호출 가능)"""
+    store = get_session_store()
+
+    def write(tokens):
+        cache = store.get(sid)
+        if cache is not None:
+            store.set(sid, {
+                **cache,
+                "access_token": tokens.access_token,
+                "refresh_token": tokens.refresh_token,
+                "headers": tokens.headers,
+            })
+    return write
 
 def sync_session_from_cache():
     """앱 시작 시 세션 비어있으면 캐시값으로 복원"""
@@ -21,7 +86,17 @@ def sync_session_from_cache():
 
 def sync_cache_from_session():
     """로그인/토큰 갱신 후 세션값을 캐시에 반영"""
+    if not get_session_id():
+        return
     cache = get_cache()
-    for k in ("logged_in", "access_token", "refresh_token", "store_id", "store_name", "headers"):
+    for k in CACHE_KEYS:
         if k in st.session_state:
             cache[k] = st.session_state.get(k)
+    get_session_store().set(get_session_id(), cache)
+
+def clear_cache():
+    """로그아웃: 현재 브라우저 세션의 저장값과 세션 ID를 지웁니다. (쿠키는 persist_session_cookie가 만료시킴)"""
+    sid = get_session_id()
+    if sid:
+        get_session_store().delete(sid)
+    st.session_state["_sid"] = None
@@ -0,0 +1,140 @@
+# stats_export.py
+"""통계 응답 + 변환 결과(StatsFrames) → CSV/Parquet 내보내기 (streamlit 비의존, 제너레이터)
+
+화면에 그린 응답과 transform_stats 결과를 그대로 받아 쓰므로 내보내기 때문에 다시 요청하지 않습니다.
+행은 (section, key, value, detail) 긴 형식 하나로 만들고, 파일은 CHUNK_ROWS행씩 바이트 조각으로 내놓아
+기간이 길어 예약 레코드가 많아도 중간 DataFrame/문자열 전체를 만들지 않습니다.
+Parquet은 pyarrow가 설치돼 있을 때만 씁니다. (PARQUET_AVAILABLE)
+"""
+import csv
+import io
+import math
+
+from stats_rollup import menu_counts
+from stats_transform import KPI_FIELDS, OFFSET_BIN_MINUTES, SLOT_MINUTES
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+PARQUET_AVAILABLE = pq is not None
+EXPORT_COLUMNS = ("section", "key", "value", "detail")
+CHUNK_ROWS = 5000
+
+def _number(v):
+    try:
+        v = float(v)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(v):
+        return None
+    return int(v) if v.is_integer() else v
+
+def iter_rows(payload, frames):
+    """(section, key, value, detail) 행을 차례로 내놓습니다.
+
+    - kpi: KPI 이름, 값, 증감률(%)
+    - discount / offset / hourly: 차트에 그린 분포 그대로 (구간 라벨, 예약 건수)
+    - menu: 메뉴 전체 순위 (이름, 건수, 순위). 건수 필드는 차트와 같이 menu_counts로 읽음
+    - reservation: 원본 예약 레코드 (time_offset_idx, 할인율, 잔여 시간)
+    """
+    payload = payload or {}
+    for field in KPI_FIELDS:
+        kpi = payload.get(field) or {}
+        delta = kpi.get("delta")
+        yield "kpi", field, _number(kpi.get("value")), "" if delta in (None, "-") else f"{delta}%"
+
+    if frames.discount_counts is not None:
+        for label, count in frames.discount_counts.items():
+            yield "discount", label, int(count), ""
+    if frames.offset_counts is not None:
+        for minutes, count in frames.offset_counts.items():
+            yield "offset", f"{minutes}–{minutes + OFFSET_BIN_MINUTES}분", int(count), ""
+    if frames.hourly is not None:
+        for hour, count in zip(frames.hourly["hour"], frames.hourly["count"]):
+            yield "hourly", f"{hour:02d}시", int(count), ""
+
+    menus = [(name, _number(count)) for name, count in menu_counts(payload.get("menu_statistics"))]
+    menus.sort(key=lambda item: -item[1])
+    for rank, (name, count) in enumerate(menus, 1):
+        yield "menu", name, count, f"{rank}위"
+
+    for record in payload.get("time_idx_and_discount_rate") or []:
+        if not isinstance(record, dict):
+            continue
+        idx = _number(record.get("time_offset_idx"))
+        yield (
+            "reservation", "" if idx is None else str(idx), _number(record.get("discount_rate")),
+            "" if idx is None else f"{idx * SLOT_MINUTES}분 전",
+        )
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def iter_csv(rows, chunk_rows=CHUNK_ROWS):
+    """rows → UTF-8 CSV 바이트 조각 (엑셀에서 한글이 깨지지 않도록 BOM으로 시작)"""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    yield "﻿".encode() + buf.getvalue().encode()
+    for chunk in _chunks(rows, chunk_rows):
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(chunk)
+        yield buf.getvalue().encode()
+
+class _ChunkSink(io.RawIOBase):
+    """ParquetWriter가 쓴 바이트를 모아 뒀다가 drain()으로 넘겨주는 쓰기 전용 파일"""
+
+    def __init__(self):
+        self._chunks = []
+        self._pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._pos
+
+    def drain(self):
+        chunks, self._chunks = self._chunks, []
+        return chunks
+
+def iter_parquet(rows, chunk_rows=CHUNK_ROWS):
+    """rows → Parquet 바이트 조각 (chunk_rows행마다 row group 하나). pyarrow가 없으면 RuntimeError"""
+    if pq is None:
+        raise RuntimeError("Parquet 내보내기에는 pyarrow가 필요합니다.")
+    schema = pa.schema([
+        ("section", pa.string()), ("key", pa.string()), ("value", pa.float64()), ("detail", pa.string()),
+    ])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in _chunks(rows, chunk_rows):
+            columns = list(zip(*chunk))
+            writer.write_batch(pa.record_batch(
+                [pa.array(col, type=field.type) for col, field in zip(columns, schema)], schema=schema,
+            ))
+            yield from sink.drain()
+    yield from sink.drain()
+
+def export_bytes(payload, frames, fmt):
+    """다운로드 버튼용: fmt("csv"/"parquet") 파일 전체 바이트
+
+    Streamlit은 다운로드 내용을 bytes로 받으므로 마지막에만 조각을 합칩니다.
+    """
+    chunks = iter_parquet if fmt == "parquet" else iter_csv
+    return b"".join(chunks(iter_rows(payload, frames)))
@@ -0,0 +1,131 @@
+# stats_rollup.py
+"""임의 기간 통계를 '최근 N일' 누적 응답들의 차이로 계산 (streamlit 비의존 순수 함수)
+
+백엔드는 /stores/{id}/{N}/stats (오늘까지 최근 N일)만 제공하므로
+[start, end] 기간 = 최근 (today - start + 1)일 − 최근 (today - end)일 로 구합니다.
+누적 응답은 응답 캐시에 남아 있으므로 기간을 바꿔도 새로 필요한 N만 받습니다.
+결과는 백엔드 응답과 같은 형태라 KPI/차트 코드(transform_stats)를 그대로 씁니다.
+"""
+import math
+from collections import Counter
+from datetime import timedelta
+
+KPI_FIELDS = ("total_revenue", "total_reservations_count", "total_discount_amount")
+DELTA_FIELDS = ("total_revenue", "total_reservations_count")   # 화면에서 증감률을 보여주는 KPI
+
+def range_windows(start, end, today):
+    """[start, end] 기간을 만드는 (바깥 N, 안쪽 N). 안쪽 N이 0이면 바깥 응답이 곧 기간입니다."""
+    if start > end:
+        start, end = end, start
+    end = min(end, today)
+    return (today - start).days + 1, (today - end).days
+
+def previous_range(start, end):
+    """같은 길이의 직전 기간"""
+    length = (end - start).days + 1
+    return start - timedelta(days=length), start - timedelta(days=1)
+
+def month_to_date(today):
+    """이번 달 1일~오늘과, 지난달 같은 일수 구간 (전월 대비용)"""
+    this_start = today.replace(day=1)
+    last_end_of_month = this_start - timedelta(days=1)
+    last_start = last_end_of_month.replace(day=1)
+    last_end = last_start + timedelta(days=min(today.day, last_end_of_month.day) - 1)
+    return (this_start, today), (last_start, last_end)
+
+def _value(payload, field):
+    try:
+        v = float(((payload or {}).get(field) or {}).get("value", 0))
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if math.isnan(v) else v
+
+def _number(v):
+    return int(v) if float(v).is_integer() else round(v, 2)
+
+def _counter(mapping):
+    out = Counter()
+    for k, v in (mapping or {}).items():
+        try:
+            out[str(k)] += float(v)
+        except (TypeError, ValueError):
+            continue
+    return out
+
+def menu_counts(menu_data):
+    """menu_statistics → [(메뉴명, 건수)] (응답 순서 그대로, 숫자가 아닌 건수는 0)
+
+    건수 필드 이름이 정해져 있지 않아서, 기준 코드처럼 첫 항목의 name 외 첫 번째 필드를 씁니다.
+    (stats_transform.top_menus, stats_export도 이 함수로 읽음)
+    """
+    rows = [r for r in menu_data or [] if isinstance(r, dict) and r.get("name") is not None]
+    field = next((k for k in rows[0] if k != "name"), None) if rows else None
+    if field is None:
+        return []
+    out = []
+    for r in rows:
+        try:
+            count = float(r.get(field))
+        except (TypeError, ValueError):
+            count = 0.0
+        out.append((r["name"], 0.0 if math.isnan(count) else count))
+    return out
+
+def _menu_counter(menu_data):
+    out = Counter()
+    for name, count in menu_counts(menu_data):
+        out[name] += count
+    return out
+
+def _record_counter(records):
+    return Counter(
+        (r.get("time_offset_idx"), r.get("discount_rate"))
+        for r in records or [] if isinstance(r, dict)
+    )
+
+def subtract_stats(outer, inner):
+    """outer − inner (둘 다 백엔드 통계 응답). inner가 None이면 outer를 그대로 씁니다.
+
+    합계/시간대별/메뉴별 건수는 빼고, 예약 레코드는 (time_offset_idx, discount_rate) 다중집합 차이로 구합니다.
+    음수는 0으로 자릅니다. 증감률(delta)은 여기서 알 수 없으므로 "-"로 둡니다.
+    """
+    outer = outer or {}
+    if inner is None:
+        result = dict(outer)
+        for field in KPI_FIELDS:
+            result[field] = {"value": _number(_value(outer, field)), "delta": "-"}
+        return result
+
+    result = {
+        field: {"value": _number(max(_value(outer, field) - _value(inner, field), 0)), "delta": "-"}
+        for field in KPI_FIELDS
+    }
+
+    hourly = _counter(outer.get("hourly_statistics"))
+    hourly.subtract(_counter(inner.get("hourly_statistics")))
+    result["hourly_statistics"] = {h: _number(max(c, 0)) for h, c in hourly.items()}
+
+    menus = _menu_counter(outer.get("menu_statistics"))
+    menus.subtract(_menu_counter(inner.get("menu_statistics")))
+    result["menu_statistics"] = [
+        {"name": name, "count": _number(count)}
+        for name, count in menus.most_common() if count > 0
+    ]
+
+    records = _record_counter(outer.get("time_idx_and_discount_rate"))
+    records.subtract(_record_counter(inner.get("time_idx_and_discount_rate")))
+    result["time_idx_and_discount_rate"] = [
+        {"time_offset_idx": idx, "discount_rate": rate}
+        for (idx, rate), count in records.items()
+        for _ in range(max(count, 0))
+    ]
+    return result
+
+def with_deltas(current, previous):
+    """비교 기간 대비 증감률(%)을 채운 current 복사본. 비교 값이 0이면 "-"."""
+    result = dict(current)
+    for field in DELTA_FIELDS:
+        now, before = _value(current, field), _value(previous, field)
+        delta = round((now - before) / before * 100, 1) if before else "-"
+        result[field] = {**(current.get(field) or {}), "delta": delta}
+    return result
@@ -0,0 +1,189 @@
+# stats_transform.py
+"""fetch_stats_data 응답 → 차트에 바로 쓰는 프레임 변환 (렌더링과 분리된 순수 함수)
+
+streamlit에 의존하지 않으므로 합성 페이로드로 바로 테스트/벤치마크할 수 있습니다.
+같은 페이로드(내용 해시 기준)는 다시 계산하지 않고 메모이즈된 결과를 돌려줍니다.
+"""
+import hashlib
+import math
+import pickle
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from stats_rollup import menu_counts
+
+DISCOUNT_STEP = 5            # 할인율 구간 폭(%)
+OFFSET_BIN_MINUTES = 60      # 잔여 시간 구간 폭(분)
+OFFSET_MAX_MINUTES = 720     # 잔여 시간 상한(분)
+SLOT_MINUTES = 10            # time_offset_idx 1칸 = 10분
+TOP_MENUS = 3
+
+@dataclass(frozen=True)
+class StatsFrames:
+    discount_counts: pd.Series | None   # index: "00–05%" 라벨, 값: 예약 건수
+    offset_counts: pd.Series | None     # index: 구간 왼쪽 경계(분), 값: 예약 건수
+    hourly: pd.DataFrame | None         # columns: hour, count (0~23시)
+    hourly_ytop: int
+    hourly_yvals: list
+    top_menus: list                     # [(메뉴명, 건수)] 최대 3개, 실제 데이터만
+    menu_chart: pd.DataFrame | None     # columns: 메뉴, 건수 (빈 칸 포함 항상 3행)
+    menu_ymax: int
+
+def _numeric(records, field):
+    """records[field]를 float 배열로 (숫자가 아닌 값/None은 제외)"""
+    out = np.fromiter(
+        (_to_float(r.get(field)) for r in records if isinstance(r, dict)),
+        dtype=float,
+    )
+    return out[~np.isnan(out)]
+
+def _to_float(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return math.nan
+
+def discount_histogram(records):
+    """할인율 5% 구간 분포. 0~1 값이면 %로 환산하고, 최댓값이 든 구간까지 빈 구간도 채웁니다.
+
+    구간은 왼쪽 닫힌 [a, b)이고 마지막 구간이 최댓값을 포함하므로, 최댓값이 경계(예: 50%)여도
+    빠지지 않고 "50–55%"에 들어갑니다. 음수는 세지 않습니다.
+    """
+    vals = _numeric(records, "discount_rate")
+    if vals.size == 0:
+        return None
+    if vals.max() <= 1:
+        vals = np.round(vals * 100, 6)  # 0~1 → % (0.29 * 100 = 28.999… 같은 오차 제거)
+
+    n_bins = max(int(vals.max() // DISCOUNT_STEP) + 1, 1)
+    vals = vals[vals >= 0]
+    counts = np.bincount((vals // DISCOUNT_STEP).astype(np.int64), minlength=n_bins)[:n_bins]
+    # 라벨을 "00–05%" 같은 0채움으로 만들어 사전식 정렬 문제 해결
+    labels = [f"{i * DISCOUNT_STEP:02d}–{(i + 1) * DISCOUNT_STEP:02d}%" for i in range(n_bins)]
+    return pd.Series(counts, index=labels)
+
+def offset_histogram(records):
+    """잔여 시간(분) 60분 구간 분포. index는 구간 왼쪽 경계(분)입니다."""
+    idx = _numeric(records, "time_offset_idx")
+    if idx.size == 0:
+        return None
+    minutes = idx.astype(np.int64) * SLOT_MINUTES
+    minutes = minutes[(minutes >= 0) & (minutes < OFFSET_MAX_MINUTES)]
+    n_bins = OFFSET_MAX_MINUTES // OFFSET_BIN_MINUTES
+    counts = np.bincount(minutes // OFFSET_BIN_MINUTES, minlength=n_bins)[:n_bins]
+    return pd.Series(counts, index=np.arange(0, OFFSET_MAX_MINUTES, OFFSET_BIN_MINUTES))
+
+def hourly_frame(hourly_data):
+    """시간대별 예약 수를 0~23시로 채운 DataFrame과 y축 (상한, 눈금)"""
+    counts = np.zeros(24, dtype=np.int64)
+    items = hourly_data.items() if isinstance(hourly_data, dict) else enumerate(hourly_data)
+    for hour, cnt in items:
+        hour = int(hour)                               # "0"~"23" -> 0~23
+        if 0 <= hour < 24:
+            counts[hour] = int(cnt)
+
+    ymax = int(counts.max())
+    if ymax == 0:
+        ytop, yvals = 1, [0, 1]                        # 전부 0이어도 축 보이게
+    else:
+        ystep = max(1, math.ceil(ymax / 5))            # 대략 5칸
+        ytop = ((ymax + ystep - 1) // ystep) * ystep
+        yvals = list(range(0, ytop + 1, ystep))
+    return pd.DataFrame({"hour": np.arange(24), "count": counts}), ytop, yvals
+
+def top_menus(menu_data, n=TOP_MENUS):
+    """건수 기준 상위 n개 메뉴 [(이름, 건수)]. 건수 필드는 name 외 첫 번째 필드입니다. (menu_counts)"""
+    items = menu_counts(menu_data)
+    if not items:
+        return []
+    values = np.array([count for _, count in items])
+    order = np.argsort(-values, kind="stable")[:n]
+    return [(items[i][0], int(values[i])) for i in order]
+
+def menu_chart_frame(top):
+    items = list(top) + [("", 0)] * (TOP_MENUS - len(top))  # 빈 슬롯
+    chart = pd.DataFrame(items, columns=["메뉴", "건수"])
+    ymax = max(5, int(chart["건수"].max() * 1.2))            # 여백 있는 상한
+    return chart, ymax
+
+def build_stats_frames(payload):
+    records = payload.get("time_idx_and_discount_rate") or []
+    hourly_data = payload.get("hourly_statistics")
+    menu_data = payload.get("menu_statistics")
+
+    hourly, ytop, yvals = hourly_frame(hourly_data) if hourly_data else (None, 1, [0, 1])
+    top = top_menus(menu_data) if menu_data else []
+    menu_chart, menu_ymax = menu_chart_frame(top) if menu_data else (None, 5)
+    return StatsFrames(
+        discount_counts=discount_histogram(records),
+        offset_counts=offset_histogram(records),
+        hourly=hourly,
+        hourly_ytop=ytop,
+        hourly_yvals=yvals,
+        top_menus=top,
+        menu_chart=menu_chart,
+        menu_ymax=menu_ymax,
+    )
+
+KPI_FIELDS = ("total_revenue", "total_reservations_count", "total_discount_amount")
+
+def aggregate_kpis(payloads):
+    """여러 가게 통계 응답의 KPI 합계 (응답과 같은 {"value", "delta"} 형태)
+
+    delta(%)는 가게별 직전 기간 값을 value / (1 + delta/100)로 역산해 합친 뒤 다시 계산합니다.
+    delta가 없는("-") 가게는 합계에는 넣고 증감률 계산에서만 뺍니다.
+    """
+    out = {}
+    for field in KPI_FIELDS:
+        total = current = previous = 0.0
+        for payload in payloads:
+            kpi = (payload or {}).get(field) or {}
+            value = _to_float(kpi.get("value", 0))
+            if math.isnan(value):
+                continue
+            total += value
+            delta = _to_float(kpi.get("delta"))
+            if not math.isnan(delta) and delta > -100:
+                current += value
+                previous += value / (1 + delta / 100)
+        out[field] = {
+            "value": int(total) if total.is_integer() else total,
+            "delta": round((current - previous) / previous * 100, 1) if previous else "-",
+        }
+    return out
+
+def payload_hash(payload):
+    """페이로드 내용 해시. 같은 응답을 파싱한 dict는 키 순서까지 같으므로 pickle 바이트로 충분합니다."""
+    raw = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+_MEMO_SIZE = 32
+_memo = OrderedDict()  # hash -> (payload, frames)
+_memo_lock = threading.Lock()
+
+def transform_stats(payload):
+    """build_stats_frames의 메모이즈 버전 (페이로드 내용 해시 기준 LRU)
+
+    응답 캐시는 TTL 동안 같은 객체를 돌려주므로, 먼저 객체 동일성으로 찾아 해시 비용도 건너뜁니다.
+    """
+    with _memo_lock:
+        for key, (cached_payload, frames) in _memo.items():
+            if cached_payload is payload:
+                _memo.move_to_end(key)
+                return frames
+
+    key = payload_hash(payload)
+    with _memo_lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            return _memo[key][1]
+    frames = build_stats_frames(payload)
+    with _memo_lock:
+        _memo[key] = (payload, frames)
+        while len(_memo) > _MEMO_SIZE:
+            _memo.popitem(last=False)
+    return frames
@@ -0,0 +1,352 @@
+# stats_view.py
+import streamlit as st
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from api_functions import backend_degraded, fetch_stats_data, fetch_stats_range, stale_since, stats_refreshing
+from config import STATS_RANGE_MAX_DAYS
+from stats_rollup import month_to_date
+from stats_transform import transform_stats
+from stats_export import PARQUET_AVAILABLE, export_bytes
+from metrics import timed
+from ui_components import render_stale_banner, skeleton_html
+
+STATS_PERIODS = {"최근 7일": 7, "최근 30일": 30, "최근 90일": 90}
+MONTH_TO_DATE = "이번 달 (전월 대비)"
+CUSTOM_RANGE = "직접 선택"
+
+# 리팩터링용 함수
+def format_delta(value):
+    return "0%" if value == "-" else f"{value}%"
+
+def _render_kpis(stats_data):
+    """KPI 카드 3개 (원본 응답만으로 그리므로 변환을 기다리지 않음)"""
+    # KPI 섹션을 더 예쁘게
+    st.markdown("""
+    <div style="background: #f8f9fa; padding: 20px; border-radius: 15px; margin: 20px 0;">
+        <h4 style="margin: 0 0 15px 0; color: #495057; text-align: center;">🎯 핵심 성과 지표 (KPI)</h4>
+    </div>
+    """, unsafe_allow_html=True)
+
+    kpi_cols = st.columns([1.6, 1.6, 1.6])
+
+    # 매출 KPI
+    with kpi_cols[0]:
+        st.markdown("""
+        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                    padding: 15px; border-radius: 10px; color: white; text-align: center;">
+            <h5 style="margin: 0 0 10px 0; font-size: 14px;">💰 AI가 만든 총매출</h5>
+        </div>
+        """, unsafe_allow_html=True)
+        total_rev = stats_data.get('total_revenue', {}).get('value', 0)
+        st.metric(
+            label="",
+            value=f"{total_rev:,}",                                   # 숫자만
+            delta=format_delta(stats_data.get('total_revenue', {}).get('delta', 0)),
+            help=f"{total_rev:,} 원"                                   # 단위는 help로
+        )
+
+    # 예약 수 KPI
+    with kpi_cols[1]:
+        st.markdown("""
+        <div style="background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); 
+                    padding: 15px; border-radius: 10px; color: white; text-align: center;">
+            <h5 style="margin: 0 0 10px 0; font-size: 14px;">📈 AI 총 예약 수</h5>
+        </div>
+        """, unsafe_allow_html=True)
+        total_res = stats_data.get('total_reservations_count', {}).get('value', 0)
+        st.metric(
+            label="",
+            value=f"{total_res:,}",                                    # 숫자만
+            delta=format_delta(stats_data.get('total_reservations_count', {}).get('delta', 0)),
+            help=f"{total_res:,} 건"                                   # 단위는 help로
+        )
+
+    # 할인 지출액 KPI
+    with kpi_cols[2]:
+        st.markdown("""
+        <div style="background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); 
+                    padding: 15px; border-radius: 10px; color: white; text-align: center;">
+            <h5 style="margin: 0 0 10px 0; font-size: 14px;">🎁 총 할인액</h5>
+        </div>
+        """, unsafe_allow_html=True)
+        total_disc = stats_data.get('total_discount_amount', {}).get('value', 0)
+        st.metric(
+            label="",
+            value=f"{total_disc:,}",                                   # 숫자만
+            help=f"{total_disc:,} 원"                                  # 단위는 help로
+        )
+
+def _render_ai_report(stats_data, frames):
+    """AI 분석 리포트: 할인율/잔여 시간별 예약 분포"""
+    st.markdown("<br>", unsafe_allow_html=True)
+
+
+    st.markdown("---")
+    st.subheader("🤖 AI 분석 리포트")
+    ai_analysis = stats_data.get('time_idx_and_discount_rate', [])
+
+    if ai_analysis:
+        # [수정됨] 선 그래프로 시각화
+        st.write("##### 할인율에 따른 예약 분포")
+        if frames.discount_counts is not None:
+            st.line_chart(frames.discount_counts)
+
+        st.write("##### 잔여 시간에 따른 예약 분포")
+        if frames.offset_counts is not None:
+            # x축은 숫자(구간 왼쪽 경계 분)로 사용
+            st.line_chart(frames.offset_counts, width="stretch")
+        else:
+            st.write("AI 분석 리포트 데이터가 없습니다.")
+
+def _render_hourly(frames):
+    """수요 분석: 시간대별 예약 분포"""
+    # 수요 분석 섹션을 더 예쁘게
+    st.markdown("""
+    <div style="background: #f8f9fa; padding: 20px; border-radius: 15px; margin: 20px 0;">
+        <h4 style="margin: 0 0 15px 0; color: #495057; text-align: center;">📊 수요 분석 및 트렌드</h4>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # 시간대별 예약 분포
+    st.markdown("""
+    <div style="background: white; padding: 20px; border-radius: 10px; border: 1px solid #e9ecef; margin: 15px 0;">
+        <h5 style="margin: 0 0 15px 0; color: #495057;">🕐 시간대별 예약 분포</h5>
+        <p style="margin: 0 0 15px 0; color: #6c757d; font-size: 14px;">24시간 동안의 예약 패턴을 분석하여 최적의 운영 시간을 파악할 수 있습니다.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if frames.hourly is not None:
+        df, ytop, yvals = frames.hourly, frames.hourly_ytop, frames.hourly_yvals
+
+        chart_container = st.container()
+        with chart_container:
+            st.vega_lite_chart(
+                df,
+                {
+                    "mark": {"type": "bar"},
+                    "encoding": {
+                        # x축 라벨 0° (가로로)
+                        "x": {
+                            "field": "hour",
+                            "type": "ordinal",
+                            "axis": {"labelAngle": 0, "title": None}
+                        },
+                        # y축 정수 눈금만
+                        "y": {
+                            "field": "count",
+                            "type": "quantitative",
+                            "scale": {"domain": [0, ytop]},
+                            "axis": {"title": "예약 건수", "values": yvals}
+                        },
+                        "tooltip": [
+                            {"field": "hour", "title": "시간"},
+                            {"field": "count", "title": "예약 건수"}
+                        ],
+                    },
+                    "height": 260,
+                },
+                width="stretch",
+            )
+        # 시간대별 요약 정보
+        counts = df["count"]
+        max_hour = int(counts.idxmax())
+        min_hour = int(counts.idxmin())
+        st.info(f"📊 **피크 시간**: {max_hour}시 ({counts[max_hour]}건), **저조 시간**: {min_hour}시 ({counts[min_hour]}건)")
+
+def _render_menus(frames):
+    """인기 메뉴 분석"""
+    # 인기 메뉴 분석
+    st.markdown("""
+    <div style="background: white; padding: 20px; border-radius: 10px; border: 1px solid #e9ecef; margin: 15px 0;">
+        <h5 style="margin: 0 0 15px 0; color: #495057;">🍽️ 인기 메뉴 분석</h5>
+        <p style="margin: 0 0 15px 0; color: #6c757d; font-size: 14px;">고객들이 가장 선호하는 메뉴와 서비스를 파악하여 마케팅 전략을 수립할 수 있습니다.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if frames.menu_chart is not None:
+        # 차트를 더 예쁘게 표시
+        chart_col1, chart_col2 = st.columns([2, 1])
+        chart_df, ymax = frames.menu_chart, frames.menu_ymax
+
+        with chart_col1:
+            st.vega_lite_chart(
+                chart_df,
+                {
+                    "mark": {"type": "bar", "orient": "vertical", "size": 40},  # 세로 막대 + 고정 두께
+                    "encoding": {
+                        # 데이터 순서를 그대로 유지 (정렬하지 않음)
+                        "x": {"field": "메뉴", "type": "nominal", "sort": None,
+                            "axis": {"title": None, "labelAngle": 0}},
+                        "y": {"field": "건수", "type": "quantitative",
+                            "scale": {"domain": [0, ymax]},
+                            "axis": {"title": None}},
+                        "tooltip": [{"field": "메뉴"}, {"field": "건수"}],
+                    },
+                    "height": 220,
+                },
+                width="stretch",
+            )
+
+        with chart_col2:
+            st.markdown("""
+            <div style="background: #e3f2fd; padding: 15px; border-radius: 8px; border-left: 4px solid #2196f3;">
+                <h6 style="margin: 0 0 10px 0; color: #1976d2;">📈 인기 메뉴 순위 (Top 3)</h6>
+            </div>
+            """, unsafe_allow_html=True)
+
+            # 실제 데이터만 순위로 표시 (빈 슬롯 제외)
+            if frames.top_menus:
+                for i, (menu_name, cnt) in enumerate(frames.top_menus, 1):
+                    st.markdown(f"""
+                    <div style="background: white; padding: 8px; border-radius: 5px; margin: 5px 0; 
+                                border-left: 3px solid #2196f3;">
+                        <span style="font-weight: bold; color: #1976d2;">#{i}</span> 
+                        <span style="margin-left: 10px;">{menu_name}</span>
+                        <span style="float: right; color: #666;">{int(cnt):,}건</span>
+                    </div>
+                    """, unsafe_allow_html=True)
+            else:
+                st.info("표시할 메뉴 데이터가 없습니다.")
+
+def _export_name(store_id, period):
+    if period in STATS_PERIODS:
+        span = f"{STATS_PERIODS[period]}d"
+    elif period == MONTH_TO_DATE:
+        span = f"{datetime.now(ZoneInfo('Asia/Seoul')):%Y-%m}"
+    else:
+        span = "_".join(str(d) for d in st.session_state.get("stats_range") or ())
+    return f"stats_{store_id}_{span}"
+
+def _render_export(store_id, period, stats_data, frames):
+    """통계 내보내기: 화면에 그린 응답/변환 결과로 누를 때만 파일을 만듦 (다시 요청하지 않음)"""
+    st.markdown("---")
+    st.write("##### 📥 통계 내보내기")
+    st.caption("KPI, 분포, 시간대별·메뉴별 집계와 원본 예약 레코드를 한 파일로 받습니다.")
+    name = _export_name(store_id, period)
+    csv_col, parquet_col, _ = st.columns([1, 1, 2])
+    with csv_col:
+        st.download_button(
+            "CSV", lambda: export_bytes(stats_data, frames, "csv"), file_name=f"{name}.csv",
+            mime="text/csv", key="stats_export_csv", on_click="ignore", width="stretch",
+        )
+    with parquet_col:
+        st.download_button(
+            "Parquet", lambda: export_bytes(stats_data, frames, "parquet"), file_name=f"{name}.parquet",
+            mime="application/vnd.apache.parquet", key="stats_export_parquet", on_click="ignore",
+            disabled=not PARQUET_AVAILABLE, width="stretch",
+            help=None if PARQUET_AVAILABLE else "pyarrow가 설치되어 있어야 합니다.",
+        )
+
+@st.fragment(run_every=1)
+def _rerun_when_refreshed(store_id, day):
+    # 백그라운드 갱신이 끝나면 전체를 다시 그려 스냅샷을 최신 통계로 바꿈
+    if not stats_refreshing(store_id, day):
+        st.session_state.pop("stats_warm", None)
+        st.rerun()
+
+@st.fragment(run_every=2)
+def _rerun_when_recovered():
+    # 통계 서킷이 다시 닫히면 전체를 다시 그려 저장본을 최신 통계로 바꿈
+    if not backend_degraded("stats"):
+        st.rerun()
+
+def _show_if_stale(key):
+    since = stale_since(key)
+    if since:
+        render_stale_banner(since, "통계는")
+        if backend_degraded("stats"):
+            _rerun_when_recovered()
+
+def _fetch_period(store_id, period, control_col):
+    """선택한 기간의 통계. 임의 기간은 '최근 N일' 응답들의 차이로 계산합니다. (stats_rollup 참고)"""
+    if period in STATS_PERIODS:
+        with control_col:
+            st.markdown("<br>", unsafe_allow_html=True)
+        stats_data = fetch_stats_data(store_id, STATS_PERIODS[period], warm_start=True)
+        warm = st.session_state.get("stats_warm")
+        if stats_data and warm and warm[:2] == (store_id, STATS_PERIODS[period]):
+            saved_at = datetime.fromtimestamp(warm[2], ZoneInfo("Asia/Seoul"))
+            st.caption(f"💾 {saved_at:%m-%d %H:%M}에 저장된 통계를 먼저 보여줍니다. 최신 통계를 받는 중…")
+            _rerun_when_refreshed(store_id, STATS_PERIODS[period])
+        _show_if_stale(("stats", store_id, STATS_PERIODS[period]))
+        return stats_data
+
+    today = datetime.now(ZoneInfo("Asia/Seoul")).date()
+    if period == MONTH_TO_DATE:
+        (start, end), compare = month_to_date(today)
+    else:
+        with control_col:
+            picked = st.date_input(
+                "기간", value=(today - timedelta(days=13), today),
+                min_value=today - timedelta(days=STATS_RANGE_MAX_DAYS), max_value=today,
+                key="stats_range",
+            )
+        if len(picked) != 2:
+            st.info("📝 시작일과 종료일을 모두 선택하세요.")
+            return None
+        (start, end), compare = picked, None
+    stats_data = fetch_stats_range(store_id, start, end, today, compare)
+    _show_if_stale(("stats_range", store_id, start, end))
+    if stats_data:
+        compare_label = f"{compare[0]} ~ {compare[1]}" if compare else "직전 같은 기간"
+        st.caption(f"📆 {start} ~ {end} · 증감률은 {compare_label} 대비")
+    return stats_data
+
+@timed("stats_section")
+def render_stats_section():
+    """성과 분석 및 통계 화면. 처음 열 때 받아오고, 이후에는 응답 캐시를 씁니다."""
+    # 헤더 섹션
+    st.markdown("""
+    <div style="background: linear-gradient(90deg, #ff6b6b 0%, #ee5a24 100%); 
+                padding: 20px; border-radius: 15px; color: white;">
+        <h3 style="margin: 0; color: white;">📊 성과 분석 및 통계</h3>
+        <p style="margin: 5px 0 0 0; opacity: 0.9;">AI 기반 예약 시스템의 성과를 분석하고 인사이트를 제공합니다.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # 기간 선택을 더 예쁘게
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        st.selectbox(
+            "📅 분석 기간을 선택하세요",
+            list(STATS_PERIODS) + [MONTH_TO_DATE, CUSTOM_RANGE],
+            key="stats_period",
+            help="분석할 기간을 선택하면 해당 기간의 데이터를 시각화합니다."
+        )
+
+    store_id = st.session_state.get('store_id')
+    period = st.session_state["stats_period"]
+
+    # 응답을 기다리는 동안 안내 문구 자리와 섹션(KPI/AI 리포트/시간대/메뉴) 스켈레톤을 먼저 그림
+    notice = st.container()
+    sections = [st.empty() for _ in range(4)]
+    for section, skeleton in zip(sections, (
+        skeleton_html(60, 110, columns=3),
+        skeleton_html(40, 240, 240),
+        skeleton_html(90, 260),
+        skeleton_html(90, 220),
+    )):
+        section.markdown(skeleton, unsafe_allow_html=True)
+
+    with notice:
+        stats_data = _fetch_period(store_id, period, col2)
+
+    if not stats_data:
+        for section in sections:
+            section.empty()
+        return
+
+    # 응답이 오면 KPI부터 채우고, 변환이 끝나는 대로 차트 섹션을 채움
+    with sections[0].container():
+        _render_kpis(stats_data)
+    with timed("stats_transform"):
+        frames = transform_stats(stats_data)
+    with sections[1].container():
+        _render_ai_report(stats_data, frames)
+    with sections[2].container():
+        _render_hourly(frames)
+    with sections[3].container():
+        _render_menus(frames)
+    _render_export(store_id, period, stats_data, frames)
@@ -0,0 +1,94 @@
+# stores_view.py
+import streamlit as st
+import pandas as pd
+import timeline_model
+from api_functions import iter_stores_overview
+from metrics import timed
+from stats_transform import aggregate_kpis
+from stats_view import STATS_PERIODS, format_delta
+from ui_components import select_store, skeleton_html
+
+def _open_store(store_id, view):
+    # 버튼 콜백: 가게를 바꾸고 실시간 예약 화면으로 이동
+    if select_store(store_id):
+        st.session_state["dashboard_view"] = view
+
+def _render_totals(overview):
+    totals = aggregate_kpis([stats for _, stats in overview.values()])
+    kpi_cols = st.columns(3)
+    for col, (field, label, unit, show_delta) in zip(kpi_cols, (
+        ("total_revenue", "💰 전체 AI 매출", "원", True),
+        ("total_reservations_count", "📈 전체 AI 예약 수", "건", True),
+        ("total_discount_amount", "🎁 전체 할인액", "원", False),   # 가게별 화면과 같이 증감률 없음
+    )):
+        value = totals[field]["value"]
+        delta = format_delta(totals[field]["delta"]) if show_delta else None
+        col.metric(label, f"{value:,}", delta=delta, help=f"{value:,} {unit}")
+
+def _overview_frame(overview, names):
+    rows = []
+    for sid in names:
+        if sid not in overview:
+            continue
+        timeline, stats = overview[sid]
+        counts = timeline_model.count_states(timeline) if timeline else {}
+        stats = stats or {}
+        rows.append({
+            "가게": names[sid],
+            "매출(원)": (stats.get("total_revenue") or {}).get("value"),
+            "예약 수": (stats.get("total_reservations_count") or {}).get("value"),
+            "할인액(원)": (stats.get("total_discount_amount") or {}).get("value"),
+            "오늘 예약됨": counts.get("reserved"),
+            "오늘 마감": counts.get("closed"),
+            "오늘 예약 가능": counts.get("available"),
+        })
+    return pd.DataFrame(rows)
+
+@timed("stores_overview")
+def render_stores_overview(detail_view):
+    """여러 가게 요약: 가게별 타임라인/통계를 병렬로 받아 KPI를 합산하고, 가게를 골라 들어갈 수 있습니다."""
+    stores = st.session_state.get("stores") or []
+    names = {s["store_id"]: s["store_name"] for s in stores}
+
+    st.markdown("""
+    <div style="background: linear-gradient(90deg, #11998e 0%, #38ef7d 100%);
+                padding: 20px; border-radius: 15px; color: white;">
+        <h3 style="margin: 0; color: white;">🏬 전체 가게 요약</h3>
+        <p style="margin: 5px 0 0 0; opacity: 0.9;">운영 중인 모든 가게의 성과와 오늘 예약 현황을 한눈에 봅니다.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    period = st.selectbox("📅 분석 기간을 선택하세요", list(STATS_PERIODS), key="stores_period")
+
+    # 가게별 응답이 도착하는 대로 합계와 표를 갱신 (그 전에는 스켈레톤)
+    progress = st.empty()
+    kpi_slot = st.empty()
+    kpi_slot.markdown(skeleton_html(110, columns=3), unsafe_allow_html=True)
+    table_slot = st.empty()
+    table_slot.markdown(skeleton_html(*[32] * (len(names) + 1)), unsafe_allow_html=True)
+
+    overview = {}
+    for sid, timeline, stats in iter_stores_overview(list(names), STATS_PERIODS[period]):
+        overview[sid] = (timeline, stats)
+        progress.caption(f"⏳ {len(overview)}/{len(names)}개 가게 집계 중…")
+        with kpi_slot.container():
+            _render_totals(overview)
+        table_slot.dataframe(_overview_frame(overview, names), hide_index=True, width="stretch")
+    progress.empty()
+    if not overview:
+        kpi_slot.empty()
+        table_slot.empty()
+
+    failed = [names[sid] for sid, (timeline, stats) in overview.items() if timeline is None or stats is None]
+    if failed:
+        st.warning(f"⚠️ 일부 가게 데이터를 불러오지 못했습니다: {', '.join(failed)}")
+
+    st.write("##### 가게별 실시간 예약 관리")
+    cols = st.columns(min(len(stores), 4) or 1)
+    for i, store in enumerate(stores):
+        cols[i % len(cols)].button(
+            f"🔎 {store['store_name']}", key=f"open_store_{store['store_id']}",
+            on_click=_open_store, args=(store["store_id"], detail_view),
+            width="stretch",
+        )
@@ -0,0 +1,51 @@
+# tests/conftest.py
+"""로컬 목 백엔드(benchmarks/mock_backend.py)를 상대로 도는 테스트의 공용 픽스처
+
+    cd provider && python -m pytest -q tests
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+import streamlit as st
+
+PROVIDER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROVIDER_DIR)
+sys.path.insert(0, os.path.join(PROVIDER_DIR, "benchmarks"))
+
+import config  # noqa: E402
+from auth import AuthTokens  # noqa: E402
+from mock_backend import MockBackend  # noqa: E402
+
+@pytest.fixture
+def backend(monkeypatch, tmp_path):
+    """테스트마다 새 목 백엔드. 프로세스 전역 자원(캐시/브레이커/대기열)과 세션 상태도 비우고 시작합니다."""
+    st.cache_resource.clear()
+    st.session_state.clear()
+    monkeypatch.chdir(tmp_path)   # 스냅샷 파일(.cache/)은 임시 디렉터리에
+    server = MockBackend(spaces=2, slots=6).start()
+    monkeypatch.setattr(config, "_api_base_url", server.base_url)
+    yield server
+    server.stop()
+    st.cache_resource.clear()
+
+def login(backend, on_refresh=None):
+    """목 백엔드에 로그인해서 AuthTokens를 돌려줍니다."""
+    import requests
+    data = requests.post(f"{backend.base_url}/accounts/login/owner/", json={}, timeout=5).json()
+    return AuthTokens(data["access_token"], data["refresh_token"], on_refresh=on_refresh)
+
+def wait_for(predicate, timeout=5.0, interval=0.02):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("조건이 제한 시간 안에 만족되지 않았습니다.")
+        time.sleep(interval)
+
+def threads_named(prefix):
+    return {t for t in threading.enumerate() if t.name.startswith(prefix)}
+
+def wait_for_threads(threads, timeout=5.0):
+    wait_for(lambda: not any(t.is_alive() for t in threads), timeout)
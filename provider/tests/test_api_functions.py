@@ -0,0 +1,76 @@
+# tests/test_api_functions.py
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import streamlit as st
+
+import api_functions
+from response_cache import get_response_cache
+from conftest import login
+from mock_backend import STORE_ID
+
+PROXY_ERROR_PAGE = b"<html><body><h1>502 Bad Gateway</h1></body></html>"
+
+@pytest.mark.parametrize("status", [502, 200])
+def test_login_survives_a_non_json_body(backend, status):
+    backend.fail_status, backend.fail_body = status, PROXY_ERROR_PAGE
+    assert api_functions.api_login("owner@example.com", "password") is False
+
+@pytest.mark.parametrize("status", [502, 200])
+def test_stats_fetch_survives_a_non_json_body(backend, status):
+    auth = login(backend)
+    backend.fail_status, backend.fail_body = status, PROXY_ERROR_PAGE
+    assert api_functions._fetch_stats(STORE_ID, 7, auth) is None
+
+def test_stats_requests_are_shared_only_by_the_same_principal(backend):
+    backend.latency_ms = 300   # 세 호출이 모두 진행 중일 때 겹치도록
+    owner, other = login(backend), login(backend)
+    with ThreadPoolExecutor(3) as pool:
+        results = list(pool.map(lambda auth: api_functions._get_stats(STORE_ID, 7, auth), [owner, owner, other]))
+    assert all(results)
+    assert backend.requests["stats"] == 2
+
+def test_stats_snapshot_is_served_on_5xx_but_not_on_4xx(backend):
+    st.session_state["_auth"] = login(backend)
+    key = ("stats", STORE_ID, 7)
+    fresh = api_functions.fetch_stats_data(STORE_ID, 7)
+    assert fresh is not None   # 스냅샷도 이때 저장됨
+
+    get_response_cache().invalidate(STORE_ID)
+    backend.fail_status = 503
+    assert api_functions.fetch_stats_data(STORE_ID, 7) == fresh
+    assert api_functions.stale_since(key) is not None
+
+    get_response_cache().invalidate(STORE_ID)
+    backend.fail_status = 403
+    assert api_functions.fetch_stats_data(STORE_ID, 7) is None
+    assert api_functions.stale_since(key) is None
+
+def test_cached_store_data_is_not_served_to_another_token(backend):
+    owner, revoked = login(backend), login(backend)
+    backend.denied_tokens.add(revoked.access_token)
+    assert api_functions._get_timeline(STORE_ID, owner) is not None
+    assert api_functions._get_stats(STORE_ID, 7, owner) is not None
+
+    # 캐시와 저장본이 모두 차 있어도 다른 토큰은 직접 요청해서 거절을 받음
+    with pytest.raises(api_functions.AccessDenied):
+        api_functions._get_timeline(STORE_ID, revoked)
+    st.session_state["_auth"] = revoked
+    assert api_functions.fetch_stats_data(STORE_ID, 7, warm_start=True) is None
+    assert api_functions.load_snapshot(STORE_ID, "timeline") is None
+    assert backend.requests["forbidden"] == 2
+
+    # 가게 단위 무효화는 모든 토큰의 항목을 지움
+    get_response_cache().invalidate(STORE_ID)
+    assert get_response_cache().get(STORE_ID, owner.principal, "timeline") is None
+
+def test_store_overview_is_timed_until_every_store_arrives(backend):
+    from metrics import get_registry
+    backend.latency_ms = 100
+    st.session_state["_auth"] = login(backend)
+    rows = list(api_functions.iter_stores_overview([STORE_ID], 7))
+    assert len(rows) == 1
+    hist = get_registry()._histograms[
+        ("provider_api_call_duration_ms", (("call", "iter_stores_overview"), ("ok", True)))
+    ]
+    assert hist.count == 1 and hist.sum >= 100
@@ -0,0 +1,22 @@
+# tests/test_auth.py
+import http_client
+import state
+from api_functions import _get_stats
+from conftest import login
+from mock_backend import STORE_ID
+
+def test_refresh_in_a_background_job_is_written_to_the_session_store(backend):
+    store = state.get_session_store()
+    backend.token_ttl = 0   # 요청 전에 반드시 재발급하게 만듦
+    auth = login(backend, on_refresh=state.token_writer("sid-1"))
+    store.set("sid-1", {"logged_in": True, "access_token": auth.access_token, "refresh_token": auth.refresh_token})
+    stale_refresh = auth.refresh_token
+
+    # 통계 예열처럼 렌더가 끝난 뒤에도 도는 작업
+    http_client.submit_once(("stats", STORE_ID, 7), _get_stats, STORE_ID, 7, auth).result(timeout=10)
+
+    saved = store.get("sid-1")
+    assert backend.requests["refresh"] >= 1
+    assert saved["refresh_token"] == auth.refresh_token != stale_refresh
+    assert saved["access_token"] == auth.access_token
+    assert saved["refresh_token"] in backend.refresh_tokens   # 아직 쓸 수 있는 토큰이 남아 있음
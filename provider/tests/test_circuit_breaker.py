@@ -0,0 +1,55 @@
+# tests/test_circuit_breaker.py
+import time
+
+import pytest
+
+import circuit_breaker
+import http_client
+from circuit_breaker import CircuitOpenError, get_breaker
+from config import CIRCUIT_MIN_CALLS
+from conftest import login, wait_for
+from mock_backend import STORE_ID
+
+OPEN_SEC = 0.2
+
+@pytest.fixture
+def breaker(monkeypatch, backend):
+    monkeypatch.setattr(circuit_breaker, "CIRCUIT_OPEN_SEC", OPEN_SEC)
+    return get_breaker("reservations")
+
+def _get(url, auth):
+    return http_client.request("GET", url, "reservations", headers=auth.headers)
+
+def _open_with_failures(backend, url, auth):
+    backend.fail_status = 500   # 재시도하지 않는 5xx
+    for _ in range(CIRCUIT_MIN_CALLS):
+        _get(url, auth)
+
+def test_circuit_opens_and_the_next_real_request_is_the_trial(backend, breaker):
+    auth = login(backend)
+    url = f"{backend.base_url}/reservations/me/owner/{STORE_ID}"
+    _open_with_failures(backend, url, auth)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        _get(url, auth)
+
+    # 아직 장애 중: 시험 요청이 실패하면 다시 open
+    wait_for(lambda: breaker.state == "half_open", interval=0.01)
+    assert _get(url, auth).status_code == 500
+    assert breaker.state == "open"
+
+    # 복구 뒤: 인증된 실제 요청이 시험 요청이 되어 서킷을 닫음
+    backend.fail_status = None
+    wait_for(lambda: breaker.state == "half_open", interval=0.01)
+    assert _get(url, auth).status_code == 200
+    assert breaker.state == "closed"
+
+def test_open_circuit_sends_nothing_in_the_background(backend, breaker):
+    auth = login(backend)
+    url = f"{backend.base_url}/reservations/me/owner/{STORE_ID}"
+    _open_with_failures(backend, url, auth)
+    sent = sum(backend.requests.values())
+    time.sleep(OPEN_SEC * 3)
+    assert sum(backend.requests.values()) == sent
+    assert backend.requests["unauthorized"] == 0
+    assert breaker.state == "half_open"   # 실제 요청이 올 때까지 시험 자리를 비워 둠
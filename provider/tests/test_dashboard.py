@@ -0,0 +1,93 @@
+# tests/test_dashboard.py
+"""app.py를 Streamlit AppTest로 실행하는 화면 단위 테스트"""
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from conftest import PROVIDER_DIR, wait_for
+from mock_backend import STORE_ID
+
+@pytest.fixture
+def app(backend, monkeypatch):
+    import live_updates
+    # 테스트 도중 감시 스레드가 끼어들지 않도록. (다음 주기에 깨어나면 구독이 끊긴 것을 보고 끝남)
+    monkeypatch.setattr(live_updates, "LIVE_POLL_SEC", 60)
+    at = AppTest.from_file(os.path.join(PROVIDER_DIR, "app.py"), default_timeout=60)
+    at.secrets["api"] = {"BASE_URL": backend.base_url}
+    at.run()
+    at.text_input[0].input("owner@example.com")
+    at.text_input[1].input("password")
+    at.button[0].click().run()
+    at.run()
+    assert not at.exception
+    return at
+
+def _timeline_requests(backend):
+    return backend.requests["timeline"] + backend.requests["timeline_304"]
+
+def test_refresh_button_refetches_even_when_the_watcher_just_synced(backend, app):
+    before = _timeline_requests(backend)
+    app.run()   # 감시 스레드가 방금 맞췄으므로 다시 받지 않음
+    assert _timeline_requests(backend) == before
+    next(b for b in app.button if b.label == "🔄 새로고침").click().run()
+    assert not app.exception
+    assert _timeline_requests(backend) == before + 1
+
+def test_debug_panel_needs_the_config_flag(backend, app, monkeypatch):
+    app.query_params["debug"] = "1"
+    app.run()
+    assert not [e for e in app.expander if "성능 지표" in e.label]
+
+    import ui_components
+    monkeypatch.setattr(ui_components, "METRICS_DEBUG", True)
+    app.run()
+    assert [e for e in app.expander if "성능 지표" in e.label]
+
+def test_revoked_token_stops_receiving_live_updates(backend, app):
+    assert app.session_state["timeline"] is not None
+    backend.denied_tokens.add(app.session_state["access_token"])
+    import live_updates
+    watcher = live_updates.get_watcher(STORE_ID, app.session_state["_auth"].principal)
+    watcher._poll(app.session_state["_auth"])   # 다음 감시 주기를 기다리지 않고 바로 한 번
+    app.run()
+    assert not app.exception
+    assert [e for e in app.error if "예약 현황을 볼 수 없습니다" in e.value]
+    assert "timeline" not in app.session_state
+
+def _slot_state(app, slot_id):
+    return next(
+        slot.state for spaces in app.session_state["timeline"].values()
+        for space in spaces for slot in space.slots if slot.slot_id == slot_id
+    )
+
+def test_failed_slot_action_rolls_back_the_optimistic_patch(backend, app):
+    app.segmented_control(key="grid_window").set_value("하루 전체").run()
+    slot = next(s for s in backend.timeline["today"]["spaces"][0]["slots"] if not s["is_reserved"])
+    app.multiselect(key="today_0_selected").set_value([slot["slot_id"]]).run()
+
+    backend.fail_status = 500
+    app.button(key=f"today_0_slot_close_{slot['slot_id']}").click().run()
+    assert not app.exception
+    assert _slot_state(app, slot["slot_id"]) == "available"
+    assert [e for e in app.error if "처리 실패" in e.value]
+
+    backend.fail_status = None
+    app.multiselect(key="today_0_selected").set_value([slot["slot_id"]]).run()
+    app.button(key=f"today_0_slot_close_{slot['slot_id']}").click().run()
+    assert _slot_state(app, slot["slot_id"]) == "closed"
+
+def test_slow_slot_action_is_shown_at_once_and_rolled_back_if_it_fails(backend, app, monkeypatch):
+    import api_functions
+    monkeypatch.setattr(api_functions, "MUTATION_WAIT_SEC", 0.05)
+    app.segmented_control(key="grid_window").set_value("하루 전체").run()
+    slot = next(s for s in backend.timeline["today"]["spaces"][0]["slots"] if not s["is_reserved"])
+    app.multiselect(key="today_0_selected").set_value([slot["slot_id"]]).run()
+
+    backend.latency_ms, backend.fail_status = 500, 500
+    app.button(key=f"today_0_slot_close_{slot['slot_id']}").click().run()
+    assert _slot_state(app, slot["slot_id"]) == "closed"   # 응답을 기다리지 않고 바로 반영
+
+    wait_for(lambda: not api_functions.pending_mutations(STORE_ID))
+    app.run()
+    assert _slot_state(app, slot["slot_id"]) == "available"
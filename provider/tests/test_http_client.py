@@ -0,0 +1,28 @@
+# tests/test_http_client.py
+import pytest
+import requests
+
+import http_client
+from circuit_breaker import CircuitOpenError
+from config import CIRCUIT_MIN_CALLS
+from metrics import get_registry
+
+def _requests_with_status(status):
+    text = get_registry().to_prometheus()
+    return sum(
+        float(line.rsplit(" ", 1)[1]) for line in text.splitlines()
+        if line.startswith("provider_http_requests_total{") and f'status="{status}"' in line
+    )
+
+def test_failed_requests_are_counted(backend):
+    url = f"{backend.base_url}/accounts/login/owner/"
+    backend.stop()
+    for _ in range(CIRCUIT_MIN_CALLS):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            http_client.request("POST", url, "auth", json={})
+    assert _requests_with_status("ConnectionError") == CIRCUIT_MIN_CALLS
+
+    # 실패가 쌓여 서킷이 열린 뒤에는 보내지 않은 요청도 셈
+    with pytest.raises(CircuitOpenError):
+        http_client.request("POST", url, "auth", json={})
+    assert _requests_with_status("circuit_open") == 1
@@ -0,0 +1,85 @@
+# tests/test_live_updates.py
+import pytest
+
+import live_updates
+from conftest import login, threads_named, wait_for, wait_for_threads
+from mock_backend import STORE_ID
+
+@pytest.fixture
+def watcher(backend, monkeypatch):
+    monkeypatch.setattr(live_updates, "LIVE_POLL_SEC", 0.05)
+    before = threads_named("timeline-watch-")
+    watcher = live_updates.TimelineWatcher(STORE_ID)
+    yield watcher
+    # 구독이 끊긴 것으로 보고 감시 스레드를 끝냄
+    monkeypatch.setattr(live_updates, "LIVE_IDLE_SEC", -1)
+    wait_for_threads(threads_named("timeline-watch-") - before)
+
+def _first_sync(watcher, auth):
+    watcher.subscribe(auth)
+    wait_for(lambda: watcher.changes_since(None)[2] is not None)
+    return watcher.changes_since(None)
+
+def test_first_sync_hands_over_the_full_tree(backend, watcher):
+    version, deltas, tree = _first_sync(watcher, login(backend))
+    assert deltas is None
+    assert tree == backend.timeline
+    assert backend.requests["timeline"] == 1
+
+def test_unchanged_timeline_is_revalidated_with_304(backend, watcher):
+    version, _, tree = _first_sync(watcher, login(backend))
+    wait_for(lambda: backend.requests["timeline_304"] >= 3)
+    assert watcher.changes_since(version) == (version, {}, tree)
+    assert backend.requests["timeline"] == 1
+
+def test_slot_change_arrives_as_a_single_delta(backend, watcher):
+    version, _, _ = _first_sync(watcher, login(backend))
+    with backend._lock:
+        slot = backend.timeline["today"]["spaces"][1]["slots"][2]
+        slot["is_reserved"] = not slot["is_reserved"]
+    wait_for(lambda: watcher.changes_since(version)[0] != version)
+    new_version, deltas, tree = watcher.changes_since(version)
+    assert new_version == version + 1
+    assert deltas == {slot["slot_id"]: slot}
+    assert tree == backend.timeline
+
+def test_token_refreshed_on_the_watcher_thread_reaches_the_session(backend, watcher):
+    backend.token_ttl = 0   # 매 요청 전에 재발급하게 만듦 (리프레시 토큰은 쓸 때마다 바뀜)
+    auth = login(backend)
+    _first_sync(watcher, auth)
+    for _ in range(5):
+        # 세션이 다시 그릴 때마다 같은 토큰 묶음으로 구독
+        watcher.subscribe(auth)
+        polled = backend.requests["timeline_304"]
+        wait_for(lambda: backend.requests["timeline_304"] > polled)
+    assert backend.requests["refresh"] >= 5
+    assert backend.requests["refresh_rejected"] == 0
+    assert auth.pop_refreshed() == (auth.access_token, auth.refresh_token)
+
+def test_new_etag_without_slot_changes_is_adopted(backend, watcher, monkeypatch):
+    version, _, _ = _first_sync(watcher, login(backend))
+    with backend._lock:
+        backend.timeline["generated_at"] = "2026-10-18T12:00:00"   # 본문(ETag)만 바뀌고 슬롯은 그대로
+    wait_for(lambda: backend.requests["timeline"] == 2)
+    wait_for(lambda: "generated_at" in watcher.changes_since(version)[2])
+    assert watcher.changes_since(version)[:2] == (version, {})
+
+    flattened = []
+    real_flatten = live_updates.flatten_slots
+    monkeypatch.setattr(live_updates, "flatten_slots", lambda tree: flattened.append(tree) or real_flatten(tree))
+    polled = backend.requests["timeline_304"]
+    wait_for(lambda: backend.requests["timeline_304"] >= polled + 3)
+    assert flattened == []   # 이후 304는 같은 트리 객체라 다시 펼치지 않음
+
+def test_watchers_are_per_token(backend):
+    owner, other = login(backend), login(backend)
+    assert live_updates.get_watcher(STORE_ID, owner.principal) is live_updates.get_watcher(STORE_ID, owner.principal)
+    assert live_updates.get_watcher(STORE_ID, owner.principal) is not live_updates.get_watcher(STORE_ID, other.principal)
+
+def test_denied_token_drops_the_tree(backend, watcher):
+    auth = login(backend)
+    _first_sync(watcher, auth)
+    backend.denied_tokens.add(auth.access_token)
+    wait_for(lambda: watcher.denied)
+    assert watcher.changes_since(None) == (None, {}, None)
+    assert not watcher.synced_within(60)
@@ -0,0 +1,79 @@
+# tests/test_mutation_queue.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import streamlit as st
+
+import api_functions
+from conftest import login, wait_for
+from mock_backend import STORE_ID
+from mutation_queue import MutationQueue
+
+@pytest.fixture
+def blocked_queue():
+    """동시 요청 1개, 가게별 대기 2개까지 받는 대기열. release가 set되기 전까지 보내기가 끝나지 않습니다."""
+    release = threading.Event()
+    sent = []
+
+    def send(job):
+        sent.append((job.slot_id, job.action))
+        return release.wait(5)
+
+    with ThreadPoolExecutor(2) as pool:
+        queue = MutationQueue(rate=100, burst=100, max_in_flight=1, max_queued=2, executor=pool)
+        yield queue, send, release, sent
+        release.set()
+
+def test_same_action_on_a_slot_is_deduplicated(blocked_queue):
+    queue, send, release, sent = blocked_queue
+    first = queue.submit(STORE_ID, 1, "close", send)
+    assert queue.submit(STORE_ID, 1, "close", send) is first
+    release.set()
+    queue.wait([first], 5)
+    assert first.status == "done"
+    assert sent == [(1, "close")]
+
+def test_conflicting_action_on_a_slot_is_rejected(blocked_queue):
+    queue, send, release, sent = blocked_queue
+    close = queue.submit(STORE_ID, 1, "close", send)
+    reopen = queue.submit(STORE_ID, 1, "open", send)
+    assert reopen is not close
+    assert reopen.finished and reopen.status == "conflict"
+    release.set()
+    queue.wait([close], 5)
+    assert sent == [(1, "close")]
+
+def test_full_store_queue_reports_busy(blocked_queue):
+    queue, send, release, sent = blocked_queue
+    running = queue.submit(STORE_ID, 1, "close", send)
+    wait_for(lambda: running.status == "running")   # 동시 요청 자리를 차지하고 멈춰 있음
+    queued = [queue.submit(STORE_ID, slot_id, "close", send) for slot_id in (2, 3)]
+    assert [job.status for job in queued] == ["queued", "queued"]
+    assert queue.submit(STORE_ID, 4, "close", send).status == "busy"
+    assert queue.submit(STORE_ID + 1, 4, "close", send).status == "queued"   # 다른 가게는 따로 셈
+    release.set()
+    queue.wait([running, *queued], 5)
+    assert all(job.status == "done" for job in queued)
+
+def test_bulk_action_sends_idempotency_keys(backend):
+    st.session_state["_auth"] = login(backend)
+    st.session_state["store_id"] = STORE_ID
+    slots = backend.timeline["today"]["spaces"][0]["slots"]
+    targets = [(slot["slot_id"], None) for slot in slots if not slot["is_reserved"]]
+    assert targets
+
+    results = api_functions.api_bulk_slot_action("close", targets)
+    assert set(results.values()) == {"done"}
+    assert backend.requests["sold_out"] == len(targets)
+    assert all(slot["is_reserved"] for slot in slots)
+
+    # 같은 작업(같은 Idempotency-Key)을 다시 보내도 백엔드는 한 번만 적용
+    job = api_functions.get_mutation_queue().submit(
+        STORE_ID, targets[0][0], "open", api_functions._mutation_sender("open", None, st.session_state["_auth"]),
+    )
+    api_functions.get_mutation_queue().wait([job], 5)
+    assert job.status == "done"
+    assert job.send(job) is True
+    assert backend.requests["restock"] == 1
+    assert backend.requests["replayed"] == 1
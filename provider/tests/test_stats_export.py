@@ -0,0 +1,67 @@
+# tests/test_stats_export.py
+import csv
+import io
+
+import pytest
+import streamlit as st
+
+import api_functions
+from conftest import login
+from mock_backend import STORE_ID
+from stats_export import CHUNK_ROWS, export_bytes, iter_csv, iter_rows
+from stats_transform import KPI_FIELDS, transform_stats
+
+def _csv_rows(data):
+    text = data.decode("utf-8-sig")
+    header, *rows = list(csv.reader(io.StringIO(text)))
+    assert header == ["section", "key", "value", "detail"]
+    return rows
+
+def _section(rows, name):
+    return [row for row in rows if row[0] == name]
+
+@pytest.fixture
+def payload(backend):
+    backend.stats_records = CHUNK_ROWS + 500   # 조각 경계를 넘도록
+    st.session_state["_auth"] = login(backend)
+    return api_functions.fetch_stats_data(STORE_ID, 7)
+
+def test_csv_matches_the_fetched_stats(payload):
+    rows = _csv_rows(export_bytes(payload, transform_stats(payload), "csv"))
+
+    kpis = {key: value for _, key, value, _ in _section(rows, "kpi")}
+    assert list(kpis) == list(KPI_FIELDS)
+    assert float(kpis["total_revenue"]) == payload["total_revenue"]["value"]
+
+    menus = _section(rows, "menu")
+    expected = sorted(payload["menu_statistics"], key=lambda item: -item["count"])
+    assert [(name, int(count)) for _, name, count, _ in menus] == [(m["name"], m["count"]) for m in expected]
+    assert menus[0][3] == "1위"
+
+    records = payload["time_idx_and_discount_rate"]
+    assert len(_section(rows, "reservation")) == len(records)
+    assert sum(int(value) for _, _, value, _ in _section(rows, "discount")) == len(records)
+    assert sum(int(value) for _, _, value, _ in _section(rows, "hourly")) == sum(
+        payload["hourly_statistics"].values()
+    )
+
+def test_parquet_has_the_same_rows_as_csv(payload):
+    pq = pytest.importorskip("pyarrow.parquet")
+    frames = transform_stats(payload)
+    table = pq.read_table(io.BytesIO(export_bytes(payload, frames, "parquet")))
+    csv_rows = _csv_rows(export_bytes(payload, frames, "csv"))
+    assert table.num_rows == len(csv_rows)
+    parquet_rows = zip(*(table.column(name).to_pylist() for name in ("section", "key", "value", "detail")))
+    for (section, key, value, detail), row in zip(parquet_rows, csv_rows):
+        assert [section, key, detail] == [row[0], row[1], row[3]]
+        assert (value is None and row[2] == "") or value == float(row[2])
+
+def test_menu_counts_use_the_same_field_as_the_chart():
+    payload = {"menu_statistics": [{"name": "A", "reservations": 2}, {"name": "B", "reservations": 5}]}
+    rows = list(iter_rows(payload, transform_stats(payload)))
+    assert [row for row in rows if row[0] == "menu"] == [("menu", "B", 5, "1위"), ("menu", "A", 2, "2위")]
+    assert transform_stats(payload).top_menus == [("B", 5), ("A", 2)]
+
+def test_csv_is_streamed_in_chunks():
+    rows = [("reservation", str(i), i, "") for i in range(CHUNK_ROWS * 2 + 1)]
+    assert len(list(iter_csv(iter(rows)))) == 1 + 3   # 헤더 + 조각 3개
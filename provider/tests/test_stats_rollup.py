@@ -0,0 +1,71 @@
+# tests/test_stats_rollup.py
+from datetime import date
+
+import pytest
+
+import stats_rollup
+from stats_transform import top_menus
+
+TODAY = date(2026, 3, 31)
+
+def _stats(revenue, hourly, menus, records, menu_field="count"):
+    return {
+        "total_revenue": {"value": revenue, "delta": 3},
+        "total_reservations_count": {"value": len(records)},
+        "total_discount_amount": {"value": 0},
+        "hourly_statistics": hourly,
+        "menu_statistics": [{"name": name, menu_field: count} for name, count in menus],
+        "time_idx_and_discount_rate": [{"time_offset_idx": i, "discount_rate": r} for i, r in records],
+    }
+
+@pytest.mark.parametrize("start, end, expected", [
+    (date(2026, 3, 31), date(2026, 3, 31), (1, 0)),    # 오늘 하루 = 최근 1일
+    (date(2026, 3, 25), date(2026, 3, 31), (7, 0)),
+    (date(2026, 3, 1), date(2026, 3, 10), (31, 21)),    # 최근 31일 − 최근 21일
+    (date(2026, 3, 10), date(2026, 3, 1), (31, 21)),    # 거꾸로 줘도 같음
+    (date(2026, 3, 30), date(2026, 4, 5), (2, 0)),      # 오늘 이후는 잘라냄
+])
+def test_range_windows(start, end, expected):
+    assert stats_rollup.range_windows(start, end, TODAY) == expected
+
+def test_previous_range_has_the_same_length():
+    assert stats_rollup.previous_range(date(2026, 3, 1), date(2026, 3, 10)) == (date(2026, 2, 19), date(2026, 2, 28))
+
+@pytest.mark.parametrize("today, this_month, last_month", [
+    (date(2026, 3, 31), (date(2026, 3, 1), date(2026, 3, 31)), (date(2026, 2, 1), date(2026, 2, 28))),
+    (date(2024, 3, 30), (date(2024, 3, 1), date(2024, 3, 30)), (date(2024, 2, 1), date(2024, 2, 29))),
+    (date(2026, 1, 15), (date(2026, 1, 1), date(2026, 1, 15)), (date(2025, 12, 1), date(2025, 12, 15))),
+    (date(2026, 5, 1), (date(2026, 5, 1), date(2026, 5, 1)), (date(2026, 4, 1), date(2026, 4, 1))),
+])
+def test_month_to_date_clamps_to_the_shorter_month(today, this_month, last_month):
+    assert stats_rollup.month_to_date(today) == (this_month, last_month)
+
+def test_subtract_stats_keeps_only_the_inner_difference():
+    outer = _stats(300, {"9": 5, "10": 2}, [("A", 4), ("B", 1)], [(1, 0.1), (1, 0.1), (2, 0.5)])
+    inner = _stats(100, {"9": 3, "10": 4}, [("A", 1), ("B", 1)], [(1, 0.1)])
+    result = stats_rollup.subtract_stats(outer, inner)
+    assert result["total_revenue"] == {"value": 200, "delta": "-"}
+    assert result["hourly_statistics"] == {"9": 2, "10": 0}   # 음수는 0으로
+    assert result["menu_statistics"] == [{"name": "A", "count": 3}]
+    assert sorted((r["time_offset_idx"], r["discount_rate"]) for r in result["time_idx_and_discount_rate"]) == [
+        (1, 0.1), (2, 0.5),
+    ]
+
+def test_subtract_stats_reads_menu_counts_like_top_menus():
+    outer = _stats(0, {}, [("A", 5), ("B", 7)], [], menu_field="reservation_count")
+    inner = _stats(0, {}, [("A", 1)], [], menu_field="reservation_count")
+    result = stats_rollup.subtract_stats(outer, inner)
+    assert top_menus(result["menu_statistics"]) == [("B", 7), ("A", 4)]
+
+def test_subtract_stats_without_inner_uses_outer():
+    outer = _stats(300, {"9": 5}, [("A", 4)], [(1, 0.1)])
+    result = stats_rollup.subtract_stats(outer, None)
+    assert result["total_revenue"] == {"value": 300, "delta": "-"}
+    assert result["menu_statistics"] == outer["menu_statistics"]
+
+def test_with_deltas_compares_against_the_previous_range():
+    current = stats_rollup.subtract_stats(_stats(150, {}, [], [(1, 0)]), None)
+    previous = stats_rollup.subtract_stats(_stats(100, {}, [], []), None)
+    result = stats_rollup.with_deltas(current, previous)
+    assert result["total_revenue"]["delta"] == 50.0
+    assert result["total_reservations_count"]["delta"] == "-"   # 비교 값이 0
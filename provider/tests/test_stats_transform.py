@@ -0,0 +1,51 @@
+# tests/test_stats_transform.py
+import numpy as np
+
+import stats_transform
+from mock_backend import make_stats
+
+def _rates(*rates):
+    return [{"discount_rate": r, "time_offset_idx": 0} for r in rates]
+
+def test_discount_histogram_keeps_the_maximum_on_a_bin_edge():
+    counts = stats_transform.discount_histogram(_rates(10, 50, 50, 50))
+    assert counts.sum() == 4
+    assert counts.index[-1] == "50–55%"
+    assert counts["50–55%"] == 3
+    assert counts["10–15%"] == 1
+    assert counts["45–50%"] == 0   # 최댓값까지의 빈 구간도 채움
+
+def test_discount_histogram_converts_fractions_to_percent():
+    counts = stats_transform.discount_histogram(_rates(0, 0.29, 0.3, 0.5, None, "x"))
+    assert counts.sum() == 4
+    assert counts["25–30%"] == 1
+    assert counts["30–35%"] == 1
+    assert counts["50–55%"] == 1
+
+def test_discount_histogram_is_none_without_numeric_rates():
+    assert stats_transform.discount_histogram(_rates(None, "x")) is None
+
+def test_offset_histogram_bins_by_the_hour():
+    records = [{"time_offset_idx": i} for i in (0, 5, 6, 71, 72)]   # 72칸 = 720분은 범위 밖
+    counts = stats_transform.offset_histogram(records)
+    assert list(counts.index[:2]) == [0, 60]
+    assert counts[0] == 2 and counts[60] == 1 and counts[660] == 1
+    assert counts.sum() == 4
+
+def test_hourly_frame_fills_all_hours():
+    hourly, ytop, yvals = stats_transform.hourly_frame({"9": 3, "21": 12, "24": 99})
+    assert list(hourly["hour"]) == list(range(24))
+    assert hourly["count"].sum() == 15
+    assert ytop >= 12 and yvals[0] == 0 and yvals[-1] == ytop
+
+def test_top_menus_reads_the_first_field_after_name():
+    menus = [{"name": "A", "reservations": 3}, {"name": "B", "reservations": 9}, {"name": "C", "reservations": "x"}]
+    assert stats_transform.top_menus(menus) == [("B", 9), ("A", 3), ("C", 0)]
+
+def test_transform_matches_a_large_synthetic_payload():
+    payload = make_stats("30", 100_000)
+    frames = stats_transform.transform_stats(payload)
+    rates = np.array([r["discount_rate"] for r in payload["time_idx_and_discount_rate"]])
+    assert frames.discount_counts.sum() == rates.size
+    assert frames.discount_counts["50–55%"] == np.count_nonzero(rates == 0.5)
+    assert stats_transform.transform_stats(dict(payload)) is frames   # 내용이 같으면 메모이즈된 결과
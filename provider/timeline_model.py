@@ -0,0 +1,219 @@
+# timeline_model.py
+import copy
+import time
+from bisect import bisect_left
+from operator import attrgetter
+import streamlit as st
+from config import TIMELINE_RECONCILE_SEC
+
+TIMELINE_KEYS = (
+    "timeline", "timeline_fetched_at", "timeline_version", "timeline_synced_at", "timeline_stale_since",
+    "timeline_invalidated", "timeline_watch_id",
+)
+DAYS = ("today", "tomorrow")
+
+class Slot:
+    """타임라인 슬롯 한 칸. dict 대신 __slots__로 들고 있어 렌더 중 조회/할당 비용이 작습니다."""
+
+    __slots__ = ("slot_id", "time", "is_reserved", "has_reservation", "reservation_id", "user_email", "menu_name")
+
+    def __init__(self, slot_id, time, is_reserved, has_reservation=False,
+                 reservation_id=None, user_email="", menu_name=None):
+        self.slot_id = slot_id
+        self.time = time
+        self.is_reserved = is_reserved
+        self.has_reservation = has_reservation
+        self.reservation_id = reservation_id
+        self.user_email = user_email
+        self.menu_name = menu_name
+
+    @classmethod
+    def from_dict(cls, data):
+        """백엔드 slot dict를 검증해서 Slot으로. 형식이 맞지 않으면 ValueError"""
+        if not isinstance(data, dict) or data.get("slot_id") is None:
+            raise ValueError(f"slot_id가 없는 슬롯입니다: {data!r}")
+        info = data.get("reservation_info") or {}
+        if not isinstance(info, dict):
+            raise ValueError(f"reservation_info 형식이 올바르지 않습니다: {info!r}")
+        return cls(
+            slot_id=data["slot_id"],
+            time=str(data.get("time", "-")),
+            is_reserved=bool(data.get("is_reserved")),
+            has_reservation=bool(info),
+            reservation_id=info.get("reservation_id"),
+            user_email=info.get("user_email") or "",
+            menu_name=info.get("menu_name"),
+        )
+
+    @property
+    def state(self):
+        """reserved(예약됨) / closed(수동 마감) / available(예약 가능)"""
+        if not self.is_reserved:
+            return "available"
+        return "reserved" if self.has_reservation else "closed"
+
+class Space:
+    __slots__ = ("space_name", "slots")
+
+    def __init__(self, space_name, slots):
+        self.space_name = space_name
+        self.slots = slots
+
+def parse_slots(items):
+    """검증을 통과한 슬롯만 시간순 Slot 목록으로 (형식이 깨진 슬롯은 건너뜀)
+
+    시간순으로 두어야 그리드가 시간 창을 이진 탐색으로 잘라낼 수 있습니다. (upcoming_slots)
+    """
+    slots = []
+    for item in items or []:
+        try:
+            slots.append(Slot.from_dict(item))
+        except ValueError:
+            continue
+    slots.sort(key=attrgetter("time"))
+    return slots
+
+def upcoming_slots(slots, start, hours):
+    """시간순 slots에서 start("HH:MM") 이후 첫 슬롯부터 hours시간 분량만 (창 밖의 슬롯은 보지 않음)
+
+    영업 전이면 첫 영업 시간부터 보여주도록 창의 시작을 start가 아니라 그 이후 첫 슬롯에 맞춥니다.
+    """
+    lo = bisect_left(slots, start, key=attrgetter("time"))
+    if lo == len(slots):
+        return []
+    try:
+        hh, mm = map(int, slots[lo].time.split(":")[:2])
+    except ValueError:
+        return slots[lo:]
+    end_hour = hh + hours
+    end = f"{end_hour:02d}:{mm:02d}" if end_hour < 24 else "24:00"
+    hi = bisect_left(slots, end, lo=lo, key=attrgetter("time"))
+    return slots[lo:hi]
+
+def parse_timeline(tree):
+    """백엔드 타임라인 dict → {"today": [Space], "tomorrow": [Space]}"""
+    return {
+        day: [
+            Space(space.get("space_name"), parse_slots(space.get("slots")))
+            for space in ((tree or {}).get(day) or {}).get("spaces") or []
+            if isinstance(space, dict)
+        ]
+        for day in DAYS
+    }
+
+def count_states(tree, day="today"):
+    """백엔드 타임라인 dict에서 해당 날짜 슬롯을 상태별로 셉니다. (세션 모델은 건드리지 않음)"""
+    counts = dict.fromkeys(("reserved", "closed", "available"), 0)
+    for space in ((tree or {}).get(day) or {}).get("spaces") or []:
+        if isinstance(space, dict):
+            for slot in parse_slots(space.get("slots")):
+                counts[slot.state] += 1
+    return counts
+
+def get_timeline():
+    return st.session_state.get("timeline")
+
+def set_timeline(data, fetched=False):
+    """백엔드에서 받은 타임라인으로 세션 모델을 교체합니다.
+
+    Slot/Space로 새로 만들기 때문에 다른 세션과 공유하는 응답 캐시 객체는 건드리지 않습니다.
+    fetched=True(이 렌더에서 직접 받아 온 값)일 때만 invalidate 표시를 지웁니다.
+    """
+    st.session_state["timeline"] = parse_timeline(data)
+    mark_synced()
+    if fetched:
+        st.session_state.pop("timeline_invalidated", None)
+
+def mark_synced():
+    """실시간 감시로 백엔드와 맞춰져 있음을 표시 (재조회 타이머 초기화)"""
+    st.session_state["timeline_fetched_at"] = time.monotonic()
+    st.session_state["timeline_synced_at"] = time.time()
+    st.session_state.pop("timeline_stale_since", None)
+
+def mark_unreachable(since=None):
+    """백엔드에 닿지 않아 들고 있는 모델을 그대로 보여주는 중임을 표시
+
+    since(time.time())를 주지 않으면 마지막으로 맞춘 시각을 씁니다. 이미 표시돼 있으면 그대로 둡니다.
+    """
+    if since is not None:
+        st.session_state["timeline_stale_since"] = since
+    else:
+        st.session_state.setdefault("timeline_stale_since", st.session_state.get("timeline_synced_at"))
+
+def stale_since():
+    """모델이 백엔드와 마지막으로 맞았던 시각(time.time()). 최신이면 None"""
+    return st.session_state.get("timeline_stale_since")
+
+def invalidate():
+    """다음 렌더에서 백엔드와 다시 맞추도록 표시
+
+    새로고침 버튼/뮤테이션 실패처럼 명시적으로 요청한 것이므로, 감시 스레드가 최근에 맞췄다는
+    mark_synced로는 지워지지 않고 set_timeline(..., fetched=True)로만 풀립니다.
+    """
+    st.session_state["timeline_fetched_at"] = None
+    st.session_state["timeline_invalidated"] = True
+
+def clear():
+    for k in TIMELINE_KEYS:
+        st.session_state.pop(k, None)
+
+def is_stale():
+    fetched_at = st.session_state.get("timeline_fetched_at")
+    if get_timeline() is None or fetched_at is None or st.session_state.get("timeline_invalidated"):
+        return True
+    return time.monotonic() - fetched_at >= TIMELINE_RECONCILE_SEC
+
+def iter_slots():
+    for spaces in (get_timeline() or {}).values():
+        for space in spaces:
+            yield from space.slots
+
+def patch_slot(slot_id, action):
+    """뮤테이션을 보내기 전에 해당 슬롯만 낙관적으로 고치고, 고치기 전 슬롯을 돌려줍니다. (없으면 None)
+
+    close → 수동 마감, open/cancel → 예약 가능. 실패하면 restore_slot으로 되돌리고,
+    실제 값은 다음 재동기화 때 맞춰집니다.
+    """
+    for slot in iter_slots():
+        if slot.slot_id == slot_id:
+            previous = copy.copy(slot)
+            slot.is_reserved = action == "close"
+            slot.has_reservation = False
+            slot.reservation_id = None
+            slot.user_email = ""
+            slot.menu_name = None
+            return previous
+    return None
+
+def restore_slot(previous):
+    """patch_slot이 돌려준 슬롯으로 되돌립니다. (실패한 뮤테이션 롤백)"""
+    for spaces in (get_timeline() or {}).values():
+        for space in spaces:
+            for i, slot in enumerate(space.slots):
+                if slot.slot_id == previous.slot_id:
+                    space.slots[i] = previous
+                    return True
+    return False
+
+def apply_slot_deltas(deltas):
+    """감시 스레드가 넘긴 {slot_id: slot dict} 변경분을 세션 타임라인에 병합합니다."""
+    for spaces in (get_timeline() or {}).values():
+        for space in spaces:
+            for i, slot in enumerate(space.slots):
+                new = deltas.get(slot.slot_id)
+                if new is not None:
+                    try:
+                        space.slots[i] = Slot.from_dict(new)
+                    except ValueError:
+                        continue
+
+def merge_slots(tree, deltas):
+    """타임라인 dict의 복사본에 {slot_id: slot} 변경분을 반영해서 돌려줍니다. (원본은 그대로)"""
+    merged = copy.deepcopy(tree)
+    for day in DAYS:
+        for space in ((merged or {}).get(day) or {}).get("spaces") or []:
+            space["slots"] = [
+                copy.deepcopy(deltas.get(slot.get("slot_id"), slot))
+                for slot in space.get("slots") or []
+            ]
+    return merged
@@ -1,18 +1,22 @@
 import streamlit as st
-import pandas as pd
-import math
+from collections import Counter
 from datetime import datetime, timedelta
+from functools import lru_cache
+from html import escape
 from zoneinfo import ZoneInfo
 from api_functions import (
-    api_login, fetch_user_info, fetch_timeline_data, 
-    fetch_stats_data, api_update_slot_status, api_cancel_reservation
+    api_login, fetch_user_info, fetch_timeline_data, api_bulk_slot_action, get_auth, load_snapshot,
+    pending_mutations, pop_finished_mutations, AccessDenied,
 )
+import timeline_model
+from config import (
+    GRID_SPACES_PER_PAGE, GRID_WINDOW_HOURS, LIVE_POLL_SEC, METRICS_DEBUG, METRICS_DEBUG_PARAM, TIMELINE_RECONCILE_SEC,
+)
+from live_updates import get_watcher
 from state import sync_cache_from_session
-from state import get_cache
-
-# 리팩터링용 함수
-def format_delta(value):
-    return "0%" if value == "-" else f"{value}%"
+from state import CACHE_KEYS, clear_cache, rotate_session_id
+from response_cache import invalidate_store
+from metrics import timed, render_debug_panel
 
 def render_login_page():
     st.title("🔐 공급자 대시보드 로그인")
@@ -29,6 +33,8 @@ def render_login_page():
 
         with st.spinner("로그인 중..."):
             if api_login(email, password):
+                # 세션 ID를 새로 받고 나서 토큰 묶음을 만들도록 가게 정보 조회보다 먼저
+                rotate_session_id()
                 st.session_state['logged_in'] = True
                 ok = fetch_user_info()  # store_id, store_name 채우기
                 if not ok:
@@ -50,156 +56,549 @@ def render_login_page():
         # rerun 직후 그 외 요소가 그려지는 걸 차단
         st.stop()
 
-def render_slot_grid(slots):
+# 일괄 작업: (버튼 라벨, 적용 가능한 슬롯 상태)
+BULK_ACTIONS = {
+    "close": ("🔒 선택 마감", "available"),
+    "open": ("🔓 선택 열기", "closed"),
+    "cancel": ("❌ 선택 취소", "reserved"),
+}
+SLOT_STATE_LABELS = {"available": "예약 가능", "closed": "수동 마감", "reserved": "예약됨"}
+
+# 선택한 슬롯 바로 처리: 슬롯 상태 → (작업, 버튼 라벨)
+SLOT_ACTIONS = {"available": ("close", "🔒 마감"), "closed": ("open", "🔓 열기"), "reserved": ("cancel", "❌ 취소")}
+SLOT_ACTION_ROWS = 5   # 선택한 슬롯 중 개별 버튼을 보여줄 최대 개수
+
+def _submit_slot_actions(action, grid_key, targets, skipped):
+    """targets [(slot_id, reservation_id)]를 모델에 먼저 반영하고 대기열에 넣은 뒤 결과를 세션에 남김
+
+    슬롯은 보내기 전에 낙관적으로 고치고, 실패하거나 접수되지 않은 슬롯은 원래대로 되돌립니다.
+    MUTATION_WAIT_SEC 안에 끝나지 않은 슬롯은 대기열이 백그라운드에서 계속 보내고,
+    결과(실패 시 롤백 포함)는 collect_mutation_results가 다음 렌더에서 거둡니다.
+    """
+    previous = {slot_id: timeline_model.patch_slot(slot_id, action) for slot_id, _ in targets}
+    results = api_bulk_slot_action(action, targets)
+    owners = st.session_state.setdefault("mutation_owners", {})
+    rollback = st.session_state.setdefault("mutation_rollback", {})
+    counts = Counter(results.values())
+    for slot_id, status in results.items():
+        if status in ("queued", "running"):
+            owners[slot_id] = grid_key
+            if previous[slot_id] is not None:
+                # 같은 작업이 이미 대기 중이면 그 작업을 넣기 전 슬롯을 그대로 둠
+                rollback.setdefault(slot_id, previous[slot_id])
+        elif status != "done" and previous[slot_id] is not None:
+            timeline_model.restore_slot(previous[slot_id])
+    st.session_state[f"{grid_key}_result"] = (
+        BULK_ACTIONS[action][0],
+        counts["done"],
+        [slot_id for slot_id, status in results.items() if status == "failed"],
+        skipped,
+        counts["queued"] + counts["running"],
+        counts["busy"],
+        counts["conflict"],
+    )
+
+def _run_bulk_action(action, grid_key, slots):
+    """툴바 버튼 콜백: 선택된 슬롯 중 작업 대상만 골라 처리하고 선택을 비움"""
+    selected = set(st.session_state.get(f"{grid_key}_selected", []))
+    applicable = BULK_ACTIONS[action][1]
+    targets = [
+        (slot.slot_id, slot.reservation_id)
+        for slot in slots
+        if slot.slot_id in selected and slot.state == applicable
+    ]
+    _submit_slot_actions(action, grid_key, targets, len(selected) - len(targets))
+    st.session_state[f"{grid_key}_selected"] = []
+
+def _run_slot_action(action, grid_key, slot):
+    """슬롯별 버튼 콜백: 그 슬롯 하나만 처리하고 선택에서 뺌"""
+    _submit_slot_actions(action, grid_key, [(slot.slot_id, slot.reservation_id)], 0)
+    selected = st.session_state.get(f"{grid_key}_selected", [])
+    st.session_state[f"{grid_key}_selected"] = [sid for sid in selected if sid != slot.slot_id]
+
+def collect_mutation_results():
+    """대기열에서 끝난 작업을 모델에 반영하고, 작업을 넣은 그리드마다 결과 메시지를 남김"""
+    owners = st.session_state.get("mutation_owners", {})
+    by_grid = {}
+    failed_any = False
+    rollback = st.session_state.get("mutation_rollback", {})
+    for job in pop_finished_mutations():
+        ok = job.status == "done"
+        previous = rollback.pop(job.slot_id, None)
+        if ok:
+            # 기다리는 동안 재동기화로 덮였을 수 있으므로 한 번 더 반영
+            timeline_model.patch_slot(job.slot_id, job.action)
+        elif previous is not None:
+            timeline_model.restore_slot(previous)
+        failed_any = failed_any or not ok
+        grid_key = owners.pop(job.slot_id, None)
+        if grid_key:
+            label, ok_count, failed = by_grid.get(grid_key, (BULK_ACTIONS[job.action][0], 0, []))
+            by_grid[grid_key] = (label, ok_count + ok, failed if ok else failed + [job.slot_id])
+    for grid_key, (label, ok_count, failed) in by_grid.items():
+        st.session_state[f"{grid_key}_result"] = (label, ok_count, failed, 0, 0, 0, 0)
+    if failed_any:
+        # 실패한 슬롯은 화면과 백엔드 상태가 다를 수 있으므로 다음 렌더에서 다시 맞춤
+        timeline_model.invalidate()
+
+def render_bulk_actions(slots, grid_key):
+    """슬롯 다중 선택 + 선택 마감/열기/취소 툴바 + 선택한 슬롯별 작업 버튼"""
+    by_id = {slot.slot_id: slot for slot in slots}
+    st.multiselect(
+        "일괄 처리할 시간을 선택하세요",
+        list(by_id),
+        format_func=lambda sid: f"{by_id[sid].time} · {SLOT_STATE_LABELS[by_id[sid].state]}",
+        key=f"{grid_key}_selected",
+        placeholder="시간 선택",
+    )
+    cols = st.columns(len(BULK_ACTIONS))
+    for col, (action, (label, _)) in zip(cols, BULK_ACTIONS.items()):
+        with col:
+            st.button(
+                label, key=f"{grid_key}_bulk_{action}", width="stretch",
+                disabled=not st.session_state.get(f"{grid_key}_selected"),
+                on_click=_run_bulk_action, args=(action, grid_key, slots),
+            )
+    render_selected_slot_actions(by_id, grid_key)
+
+    result = st.session_state.pop(f"{grid_key}_result", None)
+    if result:
+        label, ok_count, failed, skipped, pending, busy, conflict = result
+        if ok_count:
+            st.success(f"✅ {label}: {ok_count}건 처리 완료")
+        if failed:
+            failed_times = ", ".join(by_id[sid].time for sid in failed if sid in by_id)
+            st.error(f"❌ {len(failed)}건 처리 실패 ({failed_times})")
+        if pending:
+            st.info(f"⏳ {pending}건은 대기열에서 순서대로 처리 중입니다.")
+        if busy:
+            st.warning(f"🚦 대기열이 가득 차 {busy}건은 접수하지 못했습니다. 잠시 후 다시 시도해 주세요.")
+        if conflict:
+            st.warning(f"⚠️ 다른 작업이 처리 중인 {conflict}건은 건너뛰었습니다.")
+        if skipped:
+            st.info(f"ℹ️ 해당 작업을 적용할 수 없는 {skipped}건은 건너뛰었습니다.")
+
+def render_selected_slot_actions(by_id, grid_key):
+    """선택한 슬롯마다 그 상태에 맞는 작업 버튼 하나 (예전 슬롯별 취소/열기/마감 버튼 자리)
+
+    선택한 슬롯만 그리므로 요소 수는 공간 슬롯 수가 아니라 선택 수(최대 SLOT_ACTION_ROWS)에 비례합니다.
+    """
+    selected = [by_id[sid] for sid in st.session_state.get(f"{grid_key}_selected", []) if sid in by_id]
+    for slot in selected[:SLOT_ACTION_ROWS]:
+        action, label = SLOT_ACTIONS[slot.state]
+        time_col, button_col = st.columns([3, 1], vertical_alignment="center")
+        time_col.markdown(f"**{slot.time}** · {SLOT_STATE_LABELS[slot.state]}")
+        button_col.button(
+            label, key=f"{grid_key}_slot_{action}_{slot.slot_id}", width="stretch",
+            type="primary" if action == "open" else "secondary",
+            on_click=_run_slot_action, args=(action, grid_key, slot),
+        )
+    if len(selected) > SLOT_ACTION_ROWS:
+        st.caption(f"외 {len(selected) - SLOT_ACTION_ROWS}건은 위 일괄 처리 버튼을 사용하세요.")
+
+# 슬롯 그리드 CSS — 렌더마다 한 번만 주입 (inject_grid_css)
+GRID_CSS = """
+<style>
+.slot-grid {
+    display: grid;
+    grid-template-columns: repeat(6, minmax(0, 1fr));
+    gap: 8px;
+    margin-bottom: 10px;
+}
+.slot-cell {
+    border: 2px solid #e0e0e0;
+    border-radius: 10px;
+    padding: 8px;
+    background: white;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+}
+.slot-time {
+    font-weight: bold;
+    font-size: 16px;
+    text-align: center;
+    margin-bottom: 8px;
+    color: #1f77b4;
+}
+.reserved-info {
+    background: #e3f2fd;
+    border-radius: 8px;
+    padding: 8px;
+}
+.user-email {
+    font-size: 12px;
+    color: #666;
+    word-break: break-all;
+    margin-bottom: 5px;
+}
+.menu-name {
+    font-size: 14px;
+    font-weight: 500;
+    color: #333;
+}
+.status-available {
+    background: #e8f5e8;
+    border-radius: 8px;
+    padding: 8px;
+    text-align: center;
+    color: #2e7d32;
+    font-weight: 500;
+}
+.status-manual {
+    background: #fff3e0;
+    border-radius: 8px;
+    padding: 8px;
+    text-align: center;
+    color: #f57c00;
+    font-weight: 500;
+}
+.slot-pending {
+    margin-top: 6px;
+    text-align: center;
+    font-size: 12px;
+    color: #6c757d;
+}
+</style>
+"""
+
+def inject_grid_css():
+    st.markdown(GRID_CSS, unsafe_allow_html=True)
+
+SKELETON_CSS = """
+<style>
+.skeleton {
+    background: linear-gradient(90deg, #eceff1 25%, #f6f7f8 37%, #eceff1 63%);
+    background-size: 400% 100%;
+    animation: skeleton-shimmer 1.4s ease infinite;
+    border-radius: 10px;
+    margin: 10px 0;
+}
+.skeleton-row { display: flex; gap: 12px; }
+.skeleton-row .skeleton { flex: 1; }
+@keyframes skeleton-shimmer {
+    0% { background-position: 100% 50%; }
+    100% { background-position: 0 50%; }
+}
+</style>
+"""
+
+def skeleton_html(*heights, columns=1):
+    """데이터가 오기 전 자리 표시용 회색 블록 (st.empty 자리에 먼저 그렸다가 실제 내용으로 교체)"""
+    rows = []
+    for height in heights:
+        block = f'<div class="skeleton" style="height: {height}px"></div>'
+        rows.append(f'<div class="skeleton-row">{block * columns}</div>' if columns > 1 else block)
+    return SKELETON_CSS + "".join(rows)
+
+def render_stale_banner(since, subject):
+    """백엔드 장애 중 마지막으로 받은 데이터를 보여줄 때의 안내 (since는 time.time())"""
+    KST = ZoneInfo("Asia/Seoul")
+    since = datetime.fromtimestamp(since, KST)
+    label = f"{since:%H:%M}" if since.date() == datetime.now(KST).date() else f"{since:%m-%d %H:%M}"
+    st.warning(f"⚠️ 서버 응답이 원활하지 않습니다. {subject} {label} 이후 갱신되지 않았으며, 복구되면 자동으로 다시 불러옵니다.")
+
+def mask_email(email):
+    """이메일을 도메인 부분만 표시"""
+    if email and '@' in email:
+        username, domain = email.split('@', 1)
+        return f"{username[:3]}***@{domain}"
+    return email or '예약'
+
+# 대기열에서 처리 중인 슬롯에 붙이는 표시
+PENDING_BADGES = {"close": "⏳ 마감 중", "open": "⏳ 여는 중", "cancel": "⏳ 취소 중"}
+
+@lru_cache(maxsize=4096)
+def _slot_cell_html(time_label, state, email, menu_name, pending=None):
+    """슬롯 한 칸의 HTML. 상태가 같으면 캐시된 문자열을 그대로 재사용합니다.
+
+    아끼는 것은 문자열 조립뿐이고, 공간 그리드는 markdown 하나라 rerun마다 통째로 다시 보냅니다.
+    """
+    if state == "reserved":
+        body = (
+            '<div class="reserved-info">'
+            f'<div class="user-email">👤 {escape(mask_email(email))}</div>'
+            f'<div class="menu-name">🏷️ {escape(menu_name or "-")}</div>'
+            '</div>'
+        )
+    elif state == "closed":
+        body = '<div class="status-manual">🔒 수동 마감</div>'
+    else:
+        body = '<div class="status-available">✅ 예약 가능</div>'
+    if pending:
+        body += f'<div class="slot-pending">{PENDING_BADGES[pending]}</div>'
+    return f'<div class="slot-cell"><div class="slot-time">{escape(time_label)}</div>{body}</div>'
+
+def slot_grid_html(slots, pending=None):
+    pending = pending or {}
+    cells = [
+        _slot_cell_html(slot.time, slot.state, slot.user_email, slot.menu_name, pending.get(slot.slot_id))
+        for slot in slots
+    ]
+    return f'<div class="slot-grid">{"".join(cells)}</div>'
+
+@timed("slot_grid")
+def render_slot_grid(slots, grid_key, pending=None):
+    """공간 하나의 슬롯 그리드
+
+    슬롯마다 columns/markdown/button을 만들지 않고 공간당 HTML 하나로 그립니다.
+    마감/열기/취소는 그리드 위에서 슬롯을 골라 일괄 처리 툴바나 선택한 슬롯별 버튼으로 실행합니다.
+    pending은 대기열에서 처리 중인 {slot_id: action}으로, 해당 칸에 진행 표시를 붙입니다.
+    """
     if not slots: 
         return
-    
-    # CSS 스타일 추가
-    st.markdown("""
-    <style>
-    .slot-container {
-        border: 2px solid #e0e0e0;
-        border-radius: 10px;
-        padding: 10px;
-        margin: 5px;
-        background: white;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    .slot-time {
-        font-weight: bold;
-        font-size: 16px;
-        text-align: center;
-        margin-bottom: 8px;
-        color: #1f77b4;
-    }
-    .reserved-info {
-        background: #e3f2fd;
-        border-radius: 8px;
-        padding: 8px;
-        margin: 5px 0;
-    }
-    .user-email {
-        font-size: 12px;
-        color: #666;
-        word-break: break-all;
-        margin-bottom: 5px;
-    }
-    .menu-name {
-        font-size: 14px;
-        font-weight: 500;
-        color: #333;
-        margin-bottom: 8px;
-    }
-    .status-available {
-        background: #e8f5e8;
-        border-radius: 8px;
-        padding: 8px;
-        text-align: center;
-        color: #2e7d32;
-        font-weight: 500;
-    }
-    .status-manual {
-        background: #fff3e0;
-        border-radius: 8px;
-        padding: 8px;
-        text-align: center;
-        color: #f57c00;
-        font-weight: 500;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    for i in range(0, len(slots), 6):
-        part_of_slots = slots[i:i+6]
-        cols = st.columns(6)
-        for j, slot in enumerate(part_of_slots):
-            with cols[j]:
-                # 시간 표시
-                st.markdown(f'<div class="slot-time">{slot.get("time", "-")}</div>', unsafe_allow_html=True)
-                
-                if slot.get('is_reserved'):
-                    if slot.get('reservation_info'):
-                        info = slot.get('reservation_info', {})
-                        
-                        # 이메일을 도메인 부분만 표시
-                        email = info.get('user_email', '')
-                        if email and '@' in email:
-                            username, domain = email.split('@')
-                            display_email = f"{username[:3]}***@{domain}"
-                        else:
-                            display_email = email or '예약'
-                        
-                        # 예약 정보를 카드 형태로 표시
-                        with st.container():
-                            st.markdown(f'''
-                            <div class="reserved-info">
-                                <div class="user-email">👤 {display_email}</div>
-                                <div class="menu-name">🏷️ {info.get('menu_name', '-')}</div>
-                            </div>
-                            ''', unsafe_allow_html=True)
-                        
-                        # 취소 버튼
-                        if st.button("❌ 취소", key=f"cancel_{slot.get('slot_id')}", 
-                                   use_container_width=True, type="secondary"):
-                            if api_cancel_reservation(slot.get('slot_id'), info.get('reservation_id')):
-                                st.success("✅ 취소 완료!")
-                                st.rerun()
-                            else: 
-                                st.error("❌ 취소 실패")
-                    else:
-                        # 수동 마감 상태
-                        st.markdown('<div class="status-manual">🔒 수동 마감</div>', unsafe_allow_html=True)
-                        
-                        if st.button("🔓 열기", key=f"open_{slot.get('slot_id')}", 
-                                   use_container_width=True, type="primary"):
-                            if api_update_slot_status(slot.get('slot_id'), "open"): 
-                                st.success("✅ 다시 열림!")
-                                st.rerun()
-                            else: 
-                                st.error("❌ 처리 실패")
-                else:
-                    # 예약 가능 상태
-                    st.markdown('<div class="status-available">✅ 예약 가능</div>', unsafe_allow_html=True)
-                    
-                    if st.button("🔒 마감", key=f"close_{slot.get('slot_id')}", 
-                               use_container_width=True, type="secondary"):
-                        if api_update_slot_status(slot.get('slot_id'), "close"): 
-                            st.success("✅ 마감 처리!")
-                            st.rerun()
-                        else: 
-                            st.error("❌ 처리 실패")
 
+    render_bulk_actions(slots, grid_key)
+    st.markdown(slot_grid_html(slots, pending), unsafe_allow_html=True)
+
+GRID_WINDOWS = ["지금부터", "하루 전체"]
+GRID_STATE_FILTERS = {"전체": None, "예약됨": "reserved", "마감": "closed", "예약 가능": "available"}
+ALL_SPACES = -1
+
+GRID_DAYS = ("today", "tomorrow")
+
+def _clear_grid_selection():
+    """그리드 다중 선택을 비움 (가게/페이지/필터가 바뀌면 화면에 없는 슬롯이 선택된 채 남지 않도록)"""
+    for key in [k for k in st.session_state if k.startswith(GRID_DAYS) and k.endswith("_selected")]:
+        del st.session_state[key]
+
+def _reset_grid_page():
+    st.session_state["grid_page"] = 0
+    _clear_grid_selection()
+
+def _move_grid_page(step):
+    st.session_state["grid_page"] = st.session_state.get("grid_page", 0) + step
+    _clear_grid_selection()
+
+def render_windowed_spaces(day, spaces, accent):
+    """선택한 시간 창/공간/상태에 맞는 슬롯만, 공간 GRID_SPACES_PER_PAGE개씩 페이지로 그림
+
+    현재 페이지의 공간만 들여다보고, 시간 창은 시간순 슬롯을 이진 탐색으로 잘라내므로
+    rerun 비용이 가게 전체 슬롯 수가 아니라 화면에 보이는 슬롯 수에 비례합니다.
+    """
+    col_window, col_space, col_state = st.columns([1.3, 1.5, 2.2])
+    window = None
+    if day == "today":
+        with col_window:
+            if st.segmented_control(
+                "시간대", GRID_WINDOWS, key="grid_window", default=GRID_WINDOWS[0],
+                on_change=_reset_grid_page, label_visibility="collapsed",
+            ) != GRID_WINDOWS[1]:
+                window = f"{datetime.now(ZoneInfo('Asia/Seoul')).hour:02d}:00"   # 현재 정시부터
+    with col_space:
+        space_choice = st.selectbox(
+            "공간", [ALL_SPACES] + list(range(len(spaces))),
+            format_func=lambda i: "🏠 모든 공간" if i == ALL_SPACES else spaces[i].space_name,
+            key="grid_space", on_change=_reset_grid_page, label_visibility="collapsed",
+        )
+    with col_state:
+        state = GRID_STATE_FILTERS[st.segmented_control(
+            "상태", list(GRID_STATE_FILTERS), key="grid_state", default="전체",
+            on_change=_reset_grid_page, label_visibility="collapsed",
+        ) or "전체"]
+
+    candidates = list(enumerate(spaces)) if space_choice == ALL_SPACES else [(space_choice, spaces[space_choice])]
+    pages = max((len(candidates) - 1) // GRID_SPACES_PER_PAGE + 1, 1)
+    page = min(max(st.session_state.get("grid_page", 0), 0), pages - 1)
+    st.session_state["grid_page"] = page
+    first = page * GRID_SPACES_PER_PAGE
+    visible = candidates[first:first + GRID_SPACES_PER_PAGE]
+
+    pending = pending_mutations(st.session_state.get("store_id"))
+    if window:
+        st.caption(f"🕐 {window} 이후 첫 슬롯부터 {GRID_WINDOW_HOURS}시간 분량만 표시합니다.")
+    for space_idx, space in visible:
+        slots = timeline_model.upcoming_slots(space.slots, window, GRID_WINDOW_HOURS) if window else space.slots
+        if state:
+            slots = [slot for slot in slots if slot.state == state]
+        # Space 정보를 카드 형태로 표시
+        st.markdown(f"""
+        <div style="background: #f8f9fa; padding: 15px; border-radius: 10px; 
+                    border-left: 5px solid {accent}; margin: 15px 0;">
+            <h4 style="margin: 0; color: {accent};"> {space.space_name}</h4>
+        </div>
+        """, unsafe_allow_html=True)
+        if slots:
+            render_slot_grid(slots, f"{day}_{space_idx}", pending)
+        else:
+            st.caption("조건에 맞는 슬롯이 없습니다.")
+
+    if pages > 1:
+        prev_col, info_col, next_col = st.columns([1, 2, 1])
+        prev_col.button("◀ 이전", key="grid_prev", disabled=page == 0,
+                        on_click=_move_grid_page, args=(-1,), width="stretch")
+        info_col.caption(
+            f"공간 {first + 1}–{first + len(visible)} / {len(candidates)} · {page + 1}/{pages} 페이지"
+        )
+        next_col.button("다음 ▶", key="grid_next", disabled=page == pages - 1,
+                        on_click=_move_grid_page, args=(1,), width="stretch")
+
+def pull_live_changes(store_id):
+    """가게 감시 스레드에서 이 세션이 아직 못 받은 슬롯 변경분을 가져와 병합합니다."""
+    auth = get_auth()
+    if not auth or not store_id:
+        return
+    watcher = get_watcher(store_id, auth.principal)
+    watcher.subscribe(auth)
+    if watcher.denied:
+        # 이 세션의 토큰이 거절됨: 받아 둔 모델을 더 보여주지 않고 직접 요청해서 거절을 처리하게 함
+        timeline_model.invalidate()
+        return
+    cursor = st.session_state.get("timeline_version")
+    if st.session_state.get("timeline_watch_id") != watcher.watch_id:
+        cursor = None   # 감시자가 바뀌면(재발급/가게 전환) 전체 트리로 다시 맞춤
+    version, deltas, tree = watcher.changes_since(cursor)
+    if tree is None:
+        return
+    if deltas is None:
+        timeline_model.set_timeline(tree)
+    elif deltas:
+        timeline_model.apply_slot_deltas(deltas)
+    st.session_state["timeline_version"] = version
+    st.session_state["timeline_watch_id"] = watcher.watch_id
+    if watcher.synced_within(TIMELINE_RECONCILE_SEC):
+        timeline_model.mark_synced()
+
+@st.fragment(run_every=LIVE_POLL_SEC)
+@timed("timeline_section")
+def render_timeline_section():
+    """실시간 예약 현황 (세션 타임라인 모델에서 그림)
+
+    뮤테이션은 모델의 슬롯만 고치고 이 프래그먼트만 다시 그립니다.
+    대기열에서 늦게 끝난 뮤테이션은 다음 갱신 때 거둬서 반영합니다.
+    새 예약/취소는 가게 감시 스레드가 받은 슬롯 변경분만 병합해서 반영하고,
+    감시가 멈춰 있을 때만 전체 타임라인을 다시 받습니다.
+    """
+    loading = None
+    if timeline_model.get_timeline() is None:
+        # 첫 로드: 예약 현황을 받는 동안 날짜 선택/공간 그리드 자리를 먼저 그림
+        loading = st.empty()
+        loading.markdown(skeleton_html(38, 52, 200, 52, 200), unsafe_allow_html=True)
+    pull_live_changes(st.session_state.get('store_id'))
+    if timeline_model.is_stale():
+        try:
+            fresh = fetch_timeline_data(st.session_state.get('store_id'))
+        except AccessDenied as e:
+            # 권한/인증 거절: 들고 있던 모델이나 저장본을 보여주지 않음
+            if loading is not None:
+                loading.empty()
+            timeline_model.clear()
+            st.error(f"⚠️ 예약 현황을 볼 수 없습니다. ({e}) 다시 로그인해 주세요.")
+            return
+        if fresh:
+            timeline_model.set_timeline(fresh, fetched=True)
+        elif timeline_model.get_timeline() is None:
+            # 백엔드에 닿지 않으면 디스크에 남은 마지막 예약 현황이라도 보여줌 (다음 렌더에서 다시 시도)
+            snapshot = load_snapshot(st.session_state.get('store_id'), "timeline")
+            if snapshot is not None:
+                timeline_model.set_timeline(snapshot[0])
+                timeline_model.invalidate()
+                timeline_model.mark_unreachable(snapshot[1])
+        else:
+            # 들고 있던 모델을 그대로 보여주고, 다음 갱신 때 다시 시도 (서킷이 열려 있으면 바로 실패)
+            timeline_model.mark_unreachable()
+    if loading is not None:
+        loading.empty()
+    collect_mutation_results()
+    if timeline_model.stale_since():
+        render_stale_banner(timeline_model.stale_since(), "예약 현황은")
+    timeline_data = timeline_model.get_timeline()
+
+    if timeline_data:
+        inject_grid_css()
+        KST = ZoneInfo("Asia/Seoul")
+        _today = datetime.now(KST).date()
+        _tomorrow = _today + timedelta(days=1)
+
+        day_labels = {
+            "today": f"📅 오늘 ({_today:%Y-%m-%d})",
+            "tomorrow": f"📅 내일 ({_tomorrow:%Y-%m-%d})",
+        }
+        # 선택된 날짜의 그리드만 그림 (탭과 달리 숨은 날짜는 렌더하지 않음)
+        day = st.segmented_control(
+            "날짜", list(day_labels), format_func=day_labels.get,
+            key="timeline_day", default="today", label_visibility="collapsed",
+        ) or "today"
+        accent = "#007bff" if day == "today" else "#28a745"
+        day_name = "오늘" if day == "today" else "내일"
+
+        if timeline_data.get(day):
+            render_windowed_spaces(day, timeline_data[day], accent)
+        else: 
+            st.info(f"📝 {day_name}의 해당 시간대에 표시할 예약 현황이 없습니다.")
+    else: 
+        st.error("⚠️ 타임라인 데이터를 불러오는 데 실패했습니다.")
+
+DASHBOARD_VIEWS = ["실시간 예약 관리", "성과 분석 및 통계"]
+STORES_VIEW = "전체 가게 요약"   # 가게가 2개 이상일 때만 노출
+
+def select_store(store_id):
+    """다른 가게로 들어갑니다. 세션 타임라인만 비우고, 응답 캐시에 있는 다른 가게 데이터는 그대로 둡니다."""
+    for store in st.session_state.get("stores") or []:
+        if store["store_id"] == store_id:
+            st.session_state["store_id"] = store["store_id"]
+            st.session_state["store_name"] = store["store_name"]
+            st.session_state["active_store"] = store["store_id"]
+            sync_cache_from_session()
+            timeline_model.clear()
+            _clear_grid_selection()
+            for key in [k for k in st.session_state if k.startswith(GRID_DAYS) and k.endswith("_result")]:
+                del st.session_state[key]
+            return True
+    return False
+
+def render_store_selector(stores):
+    """사이드바 가게 선택 (여러 가게를 가진 점주만)"""
+    names = {s["store_id"]: s["store_name"] for s in stores}
+    if st.session_state.get("active_store") not in names:
+        st.session_state["active_store"] = st.session_state.get("store_id")
+    st.sidebar.selectbox(
+        "🏬 가게 선택", list(names), format_func=names.get, key="active_store",
+        on_change=lambda: select_store(st.session_state["active_store"]),
+    )
+
+@timed("dashboard")
 def render_dashboard():
     st.set_page_config(layout="wide")
     st.sidebar.success(f"**{st.session_state.get('store_name', '가게')}**(으)로 로그인 됨")
+    stores = st.session_state.get("stores") or []
+    if len(stores) > 1:
+        render_store_selector(stores)
     
     # 새로고침 버튼을 사이드바에 추가
     st.sidebar.markdown("---")
     if st.sidebar.button("🔄 새로고침", use_container_width=True, type="primary"):
+        # 새로고침은 캐시를 건너뛰고 최신 예약 현황을 다시 받아옴
+        invalidate_store(st.session_state.get('store_id'), "timeline")
+        timeline_model.invalidate()
         st.rerun()
     
     if st.sidebar.button("로그아웃"):
-        # 1) 캐시를 먼저 비활성화
-        cache = get_cache()
-        cache["logged_in"] = False
-        cache["access_token"] = None
-        cache["refresh_token"] = None
-        cache["store_id"] = None
-        cache["store_name"] = None
-        cache["headers"] = None
+        # 1) 이 브라우저 세션의 저장값을 먼저 삭제
+        clear_cache()
 
         # 2) 세션도 정리
-        for k in ("logged_in", "access_token", "refresh_token", "store_id", "store_name", "headers"):
+        for k in CACHE_KEYS + ("_auth",):
             if k in st.session_state:
                 del st.session_state[k]
+        timeline_model.clear()
 
         # 3) 새로고침 → 메인 진입 시 캐시 값(False/None)로 복원 → 로그인 페이지 노출
         st.rerun()
-            
+
+    # 진단 모드(METRICS_DEBUG)에서 ?debug=1 일 때만 성능 지표 패널 노출
+    if METRICS_DEBUG and st.query_params.get(METRICS_DEBUG_PARAM) == "1":
+        render_debug_panel()
+
     st.title("📊 공급자 대시보드")
-    tab1, tab2 = st.tabs(["실시간 예약 관리", "성과 분석 및 통계"])
 
-    with tab1:
+    # 선택된 화면만 데이터를 받고 계산함 (st.tabs는 숨은 탭 본문도 매번 실행됨)
+    views = DASHBOARD_VIEWS + [STORES_VIEW] if len(stores) > 1 else DASHBOARD_VIEWS
+    # 기본값은 세션 상태로 (가게 요약에서 가게로 들어갈 때 콜백이 이 값을 바꿈)
+    st.session_state.setdefault("dashboard_view", DASHBOARD_VIEWS[0])
+    view = st.segmented_control(
+        "화면", views, key="dashboard_view", label_visibility="collapsed",
+    ) or DASHBOARD_VIEWS[0]
+
+    if view == DASHBOARD_VIEWS[0]:
         # 헤더 섹션
         st.markdown("""
         <div style="background: linear-gradient(90deg, #667eea 0%, #764ba2 100%); 
@@ -211,315 +610,11 @@ def render_dashboard():
 
         st.markdown("<br>", unsafe_allow_html=True)
 
-        timeline_data = fetch_timeline_data(st.session_state.get('store_id'))
-
-        if timeline_data:
-            KST = ZoneInfo("Asia/Seoul")
-            _today = datetime.now(KST).date()
-            _tomorrow = _today + timedelta(days=1)
-
-            today_tab, tomorrow_tab = st.tabs([f"📅 오늘 ({_today:%Y-%m-%d})", f"📅 내일 ({_tomorrow:%Y-%m-%d})"])
-            
-            with today_tab:
-                if timeline_data.get('today') and timeline_data['today'].get('spaces'):
-                    for space_info in timeline_data['today']['spaces']:
-                        # Space 정보를 카드 형태로 표시
-                        st.markdown(f"""
-                        <div style="background: #f8f9fa; padding: 15px; border-radius: 10px; 
-                                    border-left: 5px solid #007bff; margin: 15px 0;">
-                            <h4 style="margin: 0; color: #007bff;"> {space_info.get('space_name')}</h4>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        render_slot_grid(space_info.get('slots', []))
-                else: 
-                    st.info("📝 오늘의 해당 시간대에 표시할 예약 현황이 없습니다.")
-            
-            with tomorrow_tab:
-                if timeline_data.get('tomorrow') and timeline_data['tomorrow'].get('spaces'):
-                    for space_info in timeline_data['tomorrow']['spaces']:
-                        # Space 정보를 카드 형태로 표시
-                        st.markdown(f"""
-                        <div style="background: #f8f9fa; padding: 15px; border-radius: 10px; 
-                                    border-left: 5px solid #28a745; margin: 15px 0;">
-                            <h4 style="margin: 0; color: #28a745;"> {space_info.get('space_name')}</h4>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        render_slot_grid(space_info.get('slots', []))
-                else: 
-                    st.info("📝 내일의 해당 시간대에 표시할 예약 현황이 없습니다.")
-        else: 
-            st.error("⚠️ 타임라인 데이터를 불러오는 데 실패했습니다.")
-
-    with tab2:
-        # 헤더 섹션
-        st.markdown("""
-        <div style="background: linear-gradient(90deg, #ff6b6b 0%, #ee5a24 100%); 
-                    padding: 20px; border-radius: 15px; color: white;">
-            <h3 style="margin: 0; color: white;">📊 성과 분석 및 통계</h3>
-            <p style="margin: 5px 0 0 0; opacity: 0.9;">AI 기반 예약 시스템의 성과를 분석하고 인사이트를 제공합니다.</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-        st.markdown("<br>", unsafe_allow_html=True)
-
-        # 기간 선택을 더 예쁘게
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            period_option = st.selectbox(
-                "📅 분석 기간을 선택하세요",
-                ["최근 7일", "최근 30일"],
-                help="분석할 기간을 선택하면 해당 기간의 데이터를 시각화합니다."
-            )
-        with col2:
-            st.markdown("<br>", unsafe_allow_html=True)
-
-        selected_period = 7 if period_option == "최근 7일" else 30
-        stats_data = fetch_stats_data(st.session_state.get('store_id'), selected_period)
-
-        if stats_data:
-            # KPI 섹션을 더 예쁘게
-            st.markdown("""
-            <div style="background: #f8f9fa; padding: 20px; border-radius: 15px; margin: 20px 0;">
-                <h4 style="margin: 0 0 15px 0; color: #495057; text-align: center;">🎯 핵심 성과 지표 (KPI)</h4>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            kpi_cols = st.columns([1.6, 1.6, 1.6])
-            
-            # 매출 KPI
-            with kpi_cols[0]:
-                st.markdown("""
-                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                            padding: 15px; border-radius: 10px; color: white; text-align: center;">
-                    <h5 style="margin: 0 0 10px 0; font-size: 14px;">💰 AI가 만든 총매출</h5>
-                </div>
-                """, unsafe_allow_html=True)
-                total_rev = stats_data.get('total_revenue', {}).get('value', 0)
-                st.metric(
-                    label="",
-                    value=f"{total_rev:,}",                                   # 숫자만
-                    delta=format_delta(stats_data.get('total_revenue', {}).get('delta', 0)),
-                    help=f"{total_rev:,} 원"                                   # 단위는 help로
-                )
-
-            # 예약 수 KPI
-            with kpi_cols[1]:
-                st.markdown("""
-                <div style="background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); 
-                            padding: 15px; border-radius: 10px; color: white; text-align: center;">
-                    <h5 style="margin: 0 0 10px 0; font-size: 14px;">📈 AI 총 예약 수</h5>
-                </div>
-                """, unsafe_allow_html=True)
-                total_res = stats_data.get('total_reservations_count', {}).get('value', 0)
-                st.metric(
-                    label="",
-                    value=f"{total_res:,}",                                    # 숫자만
-                    delta=format_delta(stats_data.get('total_reservations_count', {}).get('delta', 0)),
-                    help=f"{total_res:,} 건"                                   # 단위는 help로
-                )
-
-            # 할인 지출액 KPI
-            with kpi_cols[2]:
-                st.markdown("""
-                <div style="background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); 
-                            padding: 15px; border-radius: 10px; color: white; text-align: center;">
-                    <h5 style="margin: 0 0 10px 0; font-size: 14px;">🎁 총 할인액</h5>
-                </div>
-                """, unsafe_allow_html=True)
-                total_disc = stats_data.get('total_discount_amount', {}).get('value', 0)
-                st.metric(
-                    label="",
-                    value=f"{total_disc:,}",                                   # 숫자만
-                    help=f"{total_disc:,} 원"                                  # 단위는 help로
-                )
-
-            st.markdown("<br>", unsafe_allow_html=True)
-
-
-            st.markdown("---")
-            st.subheader("🤖 AI 분석 리포트")
-            ai_analysis = stats_data.get('time_idx_and_discount_rate', [])
-            
-            if ai_analysis:
-                df = pd.DataFrame(ai_analysis)
-                
-                # [수정됨] 선 그래프로 시각화
-                st.write("##### 할인율에 따른 예약 분포")
-                if not df.empty and 'discount_rate' in df.columns:
-                    df_filtered = df.dropna(subset=['discount_rate'])
-                    if not df_filtered.empty:
-                        vals = pd.to_numeric(df_filtered['discount_rate'], errors='coerce').dropna()
-                        if not vals.empty and vals.max() <= 1:
-                            vals = vals * 100  # 0~1 → %
-
-                        step = 5
-                        max_val = float(vals.max()) if not vals.empty else 0.0
-                        end = int(math.ceil(max_val / step) * step)            # 최댓값 경계까지
-                        end = max(end, step)                                   # 최소 0~5는 보장
-                        bins = list(range(0, end + step, step))                # 0,5,10,...,end
-
-                        # 빈 구간 포함해 전 구간을 만들고, 그 순서를 보존
-                        categories = pd.IntervalIndex.from_breaks(bins, closed='left')
-                        groups = pd.cut(vals, bins=categories, right=False, include_lowest=True)
-                        discount_counts = groups.value_counts().reindex(categories, fill_value=0)
-
-                        # 라벨을 "00–05%" 같은 0채움으로 만들어 사전식 정렬 문제 해결
-                        labels = [f"{int(iv.left):02d}–{int(iv.right):02d}%" for iv in discount_counts.index]
-                        discount_counts.index = labels  # 이 순서 그대로 사용됨
-
-                        st.line_chart(discount_counts)
-                                                
-                st.write("##### 잔여 시간에 따른 예약 분포")
-                if not df.empty and 'time_offset_idx' in df.columns:
-                    df_filtered = df.dropna(subset=['time_offset_idx'])
-                    if not df_filtered.empty:
-                        # 1칸 = 10분 → 분 단위로 변환
-                        minutes = (
-                            pd.to_numeric(df_filtered['time_offset_idx'], errors='coerce')
-                            .dropna()
-                            .astype(int) * 10
-                        )
-                    # 0~720분, 60분 간격으로 구간화
-                    bins = list(range(0, 721, 60))
-                    groups = pd.cut(minutes, bins=bins, right=False, include_lowest=True)
-
-                    # 구간별 개수 집계 (IntervalIndex 그대로 정렬)
-                    time_counts = groups.value_counts().sort_index()
-
-                    # ❗️문자 라벨로 바꾸지 말고, x축은 숫자(구간 왼쪽 경계 분)로 사용
-                    left_edges = [int(iv.left) for iv in time_counts.index]
-                    series_numeric_x = pd.Series(time_counts.values, index=left_edges).sort_index()
-
-                    st.line_chart(series_numeric_x, use_container_width=True)
-                else:
-                    st.write("AI 분석 리포트 데이터가 없습니다.")
-            # 수요 분석 섹션을 더 예쁘게
-            st.markdown("""
-            <div style="background: #f8f9fa; padding: 20px; border-radius: 15px; margin: 20px 0;">
-                <h4 style="margin: 0 0 15px 0; color: #495057; text-align: center;">📊 수요 분석 및 트렌드</h4>
-            </div>
-            """, unsafe_allow_html=True)
-
-            # 시간대별 예약 분포
-            st.markdown("""
-            <div style="background: white; padding: 20px; border-radius: 10px; border: 1px solid #e9ecef; margin: 15px 0;">
-                <h5 style="margin: 0 0 15px 0; color: #495057;">🕐 시간대별 예약 분포</h5>
-                <p style="margin: 0 0 15px 0; color: #6c757d; font-size: 14px;">24시간 동안의 예약 패턴을 분석하여 최적의 운영 시간을 파악할 수 있습니다.</p>
-            </div>
-            """, unsafe_allow_html=True)
-
-            hourly_data = stats_data.get('hourly_statistics')
-            if hourly_data:
-                s = pd.Series(hourly_data, dtype='int64')
-                s.index = s.index.astype(int)                  # "0"~"23" -> 0~23
-                s = s.reindex(range(24), fill_value=0).sort_index()
-
-                df = s.reset_index()
-                df.columns = ["hour", "count"]
-
-                ymax = int(df["count"].max())
-                if ymax == 0:
-                    ytop, yvals = 1, [0, 1]                    # 전부 0이어도 축 보이게
-                else:
-                    ystep = max(1, math.ceil(ymax / 5))        # 대략 5칸
-                    ytop = ((ymax + ystep - 1) // ystep) * ystep
-                    yvals = list(range(0, ytop + 1, ystep))
-
-                chart_container = st.container()
-                with chart_container:
-                    st.vega_lite_chart(
-                        df,
-                        {
-                            "mark": {"type": "bar"},
-                            "encoding": {
-                                # x축 라벨 0° (가로로)
-                                "x": {
-                                    "field": "hour",
-                                    "type": "ordinal",
-                                    "axis": {"labelAngle": 0, "title": None}
-                                },
-                                # y축 정수 눈금만
-                                "y": {
-                                    "field": "count",
-                                    "type": "quantitative",
-                                    "scale": {"domain": [0, ytop]},
-                                    "axis": {"title": "예약 건수", "values": yvals}
-                                },
-                                "tooltip": [
-                                    {"field": "hour", "title": "시간"},
-                                    {"field": "count", "title": "예약 건수"}
-                                ],
-                            },
-                            "height": 260,
-                        },
-                        use_container_width=True,
-                    )
-                # 시간대별 요약 정보
-                max_hour = s.idxmax()
-                min_hour = s.idxmin()
-                st.info(f"📊 **피크 시간**: {max_hour}시 ({s[max_hour]}건), **저조 시간**: {min_hour}시 ({s[min_hour]}건)")
-            
-            # 인기 메뉴 분석
-            st.markdown("""
-            <div style="background: white; padding: 20px; border-radius: 10px; border: 1px solid #e9ecef; margin: 15px 0;">
-                <h5 style="margin: 0 0 15px 0; color: #495057;">🍽️ 인기 메뉴 분석</h5>
-                <p style="margin: 0 0 15px 0; color: #6c757d; font-size: 14px;">고객들이 가장 선호하는 메뉴와 서비스를 파악하여 마케팅 전략을 수립할 수 있습니다.</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            demand_data = stats_data.get('menu_statistics')
-            if demand_data:
-                space_df = pd.DataFrame(demand_data).set_index("name")
-                # 차트를 더 예쁘게 표시
-                chart_col1, chart_col2 = st.columns([2, 1])
-
-                first_col = space_df.columns[0]
-                series_all = pd.to_numeric(space_df[first_col], errors="coerce").fillna(0)
-                top_series = series_all.sort_values(ascending=False).head(3)
-
-                items = [(name, int(val)) for name, val in top_series.items()]
-                while len(items) < 3:
-                    items.append(("", 0))  # 빈 슬롯
-
-                chart_df = pd.DataFrame(items, columns=["메뉴", "건수"])
-                ymax = max(5, int(chart_df["건수"].max() * 1.2))  # 여백 있는 상한
-
-                with chart_col1:
-                    st.vega_lite_chart(
-                        chart_df,
-                        {
-                            "mark": {"type": "bar", "orient": "vertical", "size": 40},  # 세로 막대 + 고정 두께
-                            "encoding": {
-                                # 데이터 순서를 그대로 유지 (정렬하지 않음)
-                                "x": {"field": "메뉴", "type": "nominal", "sort": None,
-                                    "axis": {"title": None, "labelAngle": 0}},
-                                "y": {"field": "건수", "type": "quantitative",
-                                    "scale": {"domain": [0, ymax]},
-                                    "axis": {"title": None}},
-                                "tooltip": [{"field": "메뉴"}, {"field": "건수"}],
-                            },
-                            "height": 220,
-                        },
-                        use_container_width=True,
-                    )
-
-                with chart_col2:
-                    st.markdown("""
-                    <div style="background: #e3f2fd; padding: 15px; border-radius: 8px; border-left: 4px solid #2196f3;">
-                        <h6 style="margin: 0 0 10px 0; color: #1976d2;">📈 인기 메뉴 순위 (Top 3)</h6>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-                    # 실제 데이터만 순위로 표시 (빈 슬롯 제외)
-                    if not top_series.empty:
-                        for i, (menu_name, cnt) in enumerate(top_series.items(), 1):
-                            st.markdown(f"""
-                            <div style="background: white; padding: 8px; border-radius: 5px; margin: 5px 0; 
-                                        border-left: 3px solid #2196f3;">
-                                <span style="font-weight: bold; color: #1976d2;">#{i}</span> 
-                                <span style="margin-left: 10px;">{menu_name}</span>
-                                <span style="float: right; color: #666;">{int(cnt):,}건</span>
-                            </div>
-                            """, unsafe_allow_html=True)
-                    else:
-                        st.info("표시할 메뉴 데이터가 없습니다.")
\ No newline at end of file
+        render_timeline_section()
+    elif view == STORES_VIEW:
+        from stores_view import render_stores_overview
+        render_stores_overview(DASHBOARD_VIEWS[0])
+    else:
+        # pandas/numpy가 필요한 통계 화면은 처음 열 때 import (로그인/예약 화면 콜드 스타트 단축)
+        from stats_view import render_stats_section
+        render_stats_section()